@@ -1,12 +1,9 @@
 #!/usr/bin/env python3
-import json
 import random
 
-# Carregar questions.json existente
-with open('Scam/src/data/questions.json', 'r', encoding='utf-8') as f:
-    existing_questions = json.load(f)
+from question_bank.store import QuestionStore
 
-print(f"Questões existentes: {len(existing_questions)}")
+store = QuestionStore()
 
 # Criar novas questões
 new_questions = []
@@ -52,11 +49,9 @@ for q in psicologia_q:
         "interests": q["interests"]
     })
 
-# Mesclar e salvar
-all_questions = existing_questions + new_questions
-
-with open('Scam/src/data/questions.json', 'w', encoding='utf-8') as f:
-    json.dump(all_questions, f, ensure_ascii=False, indent=2)
+# Gravar no log de segmentos (questions.json é atualizado na compactação)
+store.append(new_questions)
 
 print(f"Adicionadas {len(new_questions)} questões")
-print(f"Total agora: {len(all_questions)} questões")
+print(f"Pendentes de compactação: {store.pending_count()} questões")
+print("Execute `python3 -m question_bank.store compact` para atualizar o questions.json")
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Memória por questão: lista de dicts (json.load) × QuestionBank em colunas.
+
+Uso (a partir da raiz do repositório):
+    python3 benchmarks/bench_bank.py [--size 200000]
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from question_bank.bank import QuestionBank  # noqa: E402
+from question_bank.store import QUESTIONS_PATH  # noqa: E402
+
+
+def traced(fn):
+    gc.collect()
+    tracemalloc.start()
+    result = fn()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--size', type=int, default=200000)
+    args = parser.parse_args()
+
+    with open(QUESTIONS_PATH, 'r', encoding='utf-8') as f:
+        base = json.load(f)
+    # Variantes com pergunta única e opções/dicas/interesses repetidos, como na geração em massa
+    bank_json = json.dumps([
+        dict(base[i % len(base)], question=f"{base[i % len(base)]['question']} [variante {i}]")
+        for i in range(args.size)
+    ], ensure_ascii=False)
+
+    dicts, dict_bytes = traced(lambda: json.loads(bank_json))
+    del dicts
+    bank, bank_bytes = traced(lambda: QuestionBank.from_questions(json.loads(bank_json)))
+    assert json.loads(bank_json) == list(bank)
+
+    print(f"{args.size} questões")
+    print(f"  lista de dicts : {dict_bytes / args.size:8.0f} bytes/questão")
+    print(f"  QuestionBank   : {bank_bytes / args.size:8.0f} bytes/questão "
+          f"({dict_bytes / bank_bytes:.1f}x menos)")
+
+
+if __name__ == '__main__':
+    main()
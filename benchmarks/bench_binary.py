@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Tamanho e tempo de carga: questions.json (json.load) × .qbank (mmap).
+
+Uso (a partir da raiz do repositório):
+    python3 benchmarks/bench_binary.py [--size 200000]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from question_bank.bank import QuestionBank  # noqa: E402
+from question_bank.binary import BinaryBank, write_binary  # noqa: E402
+from question_bank.store import QUESTIONS_PATH  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--size', type=int, default=200000)
+    parser.add_argument('--reads', type=int, default=1000, help='questões lidas após abrir')
+    args = parser.parse_args()
+
+    with open(QUESTIONS_PATH, 'r', encoding='utf-8') as f:
+        base = json.load(f)
+    questions = [dict(base[i % len(base)], question=f"{base[i % len(base)]['question']} [variante {i}]")
+                 for i in range(args.size)]
+    picks = [random.randrange(args.size) for _ in range(args.reads)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, 'questions.json')
+        binary_path = os.path.join(tmp, 'questions.qbank')
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(questions, f, ensure_ascii=False, indent=2)
+        write_binary(QuestionBank.from_questions(questions), binary_path)
+        del questions
+
+        start = time.perf_counter()
+        with open(json_path, 'r', encoding='utf-8') as f:
+            loaded = json.load(f)
+        json_open = time.perf_counter() - start
+        start = time.perf_counter()
+        for i in picks:
+            loaded[i]['question']
+        json_reads = time.perf_counter() - start
+        del loaded
+
+        start = time.perf_counter()
+        bank = BinaryBank(binary_path)
+        binary_open = time.perf_counter() - start
+        start = time.perf_counter()
+        for i in picks:
+            bank[i]
+        binary_reads = time.perf_counter() - start
+        bank.close()
+
+        json_size = os.path.getsize(json_path) / 2**20
+        binary_size = os.path.getsize(binary_path) / 2**20
+        print(f"{args.size} questões")
+        print(f"  JSON   : {json_size:7.1f} MB  carga {json_open * 1e3:9.2f} ms  "
+              f"{args.reads} leituras {json_reads * 1e3:7.2f} ms")
+        print(f"  .qbank : {binary_size:7.1f} MB  carga {binary_open * 1e3:9.2f} ms  "
+              f"{args.reads} leituras {binary_reads * 1e3:7.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
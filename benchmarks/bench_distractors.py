@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Benchmark da análise de distratores sobre um banco sintético grande.
+
+Grava o banco em streaming (mesmo formato do questions.json), mede a leitura
+das opções, a matriz TF-IDF e as métricas, e mostra quantas questões cada
+critério marcou e o pico de memória.
+
+Uso (a partir da raiz do repositório):
+    python3 benchmarks/bench_distractors.py [--size 1000000]
+"""
+import argparse
+import os
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from question_bank.distractors import analyze, load_options, weak_items  # noqa: E402
+from question_bank.store import format_item  # noqa: E402
+from synthetic import synthetic_questions  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--size', type=int, default=1000000)
+    parser.add_argument('--seed', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'questions.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('[')
+            for k, q in enumerate(synthetic_questions(args.size, args.seed)):
+                f.write((',\n' if k else '\n') + format_item(q))
+            f.write('\n]')
+        print(f"{args.size} questões ({os.path.getsize(path) / 1e6:.0f} MB de JSON)")
+
+        start = time.perf_counter()
+        options = load_options(path)
+        loaded = time.perf_counter() - start
+    print(f"  leitura + tokens : {loaded:7.2f}s  ({args.size / loaded:,.0f} questões/s, "
+          f"{len(options.vocabulary)} termos)")
+
+    start = time.perf_counter()
+    result = analyze(options)
+    weak = weak_items(result)
+    elapsed = time.perf_counter() - start
+    print(f"  TF-IDF + métricas: {elapsed:7.2f}s")
+    flags = result['flags']
+    print(f"  marcadas         : {len(weak)} ({', '.join(f'{name} {int(mask.sum())}' for name, mask in flags.items())})")
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"  memória máxima   : {maxrss / 1024:7.0f} MB (RSS)")
+
+
+if __name__ == '__main__':
+    main()
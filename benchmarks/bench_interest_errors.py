@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark da taxa de erro por interesse com dezenas de milhões de respostas.
+
+Monta um banco sintético (benchmarks/synthetic.py), sorteia respostas em
+colunas (questão, acertou, timestamp ao longo de um ano) e mede as reduções
+agrupadas de question_bank.interest_errors. Também mede a leitura de um log
+JSONL, que é a parte que roda em Python puro.
+
+Uso (a partir da raiz do repositório):
+    python3 benchmarks/bench_interest_errors.py [--questions 10000] [--events 20000000] [--log-events 500000]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from question_bank.interest_errors import DAY_MS, Events, QuestionMeta, aggregate, load_events  # noqa: E402
+from question_bank.store import format_item  # noqa: E402
+from synthetic import synthetic_questions  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--questions', type=int, default=10000)
+    parser.add_argument('--events', type=int, default=20000000)
+    parser.add_argument('--log-events', type=int, default=500000, help='respostas no log JSONL')
+    parser.add_argument('--seed', type=int, default=13)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        questions_path = os.path.join(tmp, 'questions.json')
+        texts = []
+        with open(questions_path, 'w', encoding='utf-8') as f:
+            f.write('[')
+            for k, q in enumerate(synthetic_questions(args.questions, args.seed)):
+                f.write((',\n' if k else '\n') + format_item(q))
+                texts.append(q['question'])
+            f.write('\n]')
+        meta = QuestionMeta(questions_path)
+
+        start = 1_700_000_000_000
+        questions = rng.integers(0, len(meta), args.events)
+        events = Events(questions, rng.random(args.events) < 0.7,
+                        start + rng.integers(0, 365 * DAY_MS, args.events))
+        print(f"{args.events} respostas, {len(meta)} questões, {len(meta.names)} interesses")
+        elapsed = time.perf_counter()
+        result = aggregate(events, meta)
+        elapsed = time.perf_counter() - elapsed
+        print(f"  reduções agrupadas: {elapsed:7.2f}s  ({args.events / elapsed:,.0f} respostas/s, "
+              f"{result['windows']} janelas)")
+
+        n = min(args.log_events, args.events)
+        path = os.path.join(tmp, 'answers.jsonl')
+        with open(path, 'w', encoding='utf-8') as f:
+            for k in range(n):
+                f.write(json.dumps({'questionText': texts[questions[k] % len(texts)], 'selectedOption': 'A',
+                                    'isCorrect': bool(events.correct[k]),
+                                    'timestamp': int(events.timestamps[k])}, ensure_ascii=False) + '\n')
+        elapsed = time.perf_counter()
+        load_events([path], meta)
+        elapsed = time.perf_counter() - elapsed
+    print(f"  leitura JSONL     : {elapsed:7.2f}s  ({n / elapsed:,.0f} respostas/s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark do ajuste TRI: respostas simuladas com parâmetros conhecidos.
+
+Sorteia habilidades, dificuldades e discriminações, gera as respostas pelo
+próprio modelo 2PL e mede o tempo do ajuste e quanto os parâmetros
+recuperados se correlacionam com os verdadeiros. Também mede a leitura de um
+log JSONL (question_bank.irt.load_responses), que costuma ser a etapa mais lenta.
+
+Uso (a partir da raiz do repositório):
+    python3 benchmarks/bench_irt.py [--users 100000] [--items 10000] [--answers 5000000] [--log-answers 500000]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+from scipy.special import expit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from question_bank.irt import Responses, fit, load_responses  # noqa: E402
+
+
+def simulate(users, items, answers, seed):
+    rng = np.random.default_rng(seed)
+    theta = rng.normal(0, 1, users)
+    b = rng.normal(0, 1, items)
+    a = np.exp(rng.normal(0, 0.3, items))
+    u = rng.integers(0, users, answers)
+    i = rng.integers(0, items, answers)
+    correct = rng.random(answers) < expit(a[i] * (theta[u] - b[i]))
+    return u, i, correct, b, a
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--users', type=int, default=100000)
+    parser.add_argument('--items', type=int, default=10000)
+    parser.add_argument('--answers', type=int, default=5000000)
+    parser.add_argument('--log-answers', type=int, default=500000, help='respostas no log JSONL')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    u, i, correct, b, a = simulate(args.users, args.items, args.answers, args.seed)
+    start = time.perf_counter()
+    responses = Responses(u, i, correct, args.users, args.items)
+    built = time.perf_counter() - start
+    print(f"{args.answers} respostas, {args.users} usuários × {args.items} questões "
+          f"({len(responses.n)} células)")
+    print(f"  células           : {built:7.2f}s")
+
+    for model in ('rasch', '2pl'):
+        start = time.perf_counter()
+        result = fit(responses, model)
+        elapsed = time.perf_counter() - start
+        line = (f"  ajuste {model:<5}      : {elapsed:7.2f}s  {result['iterations']} iterações  "
+                f"corr(b) {np.corrcoef(b, result['b'])[0, 1]:.3f}")
+        if model == '2pl':
+            line += f"  corr(a) {np.corrcoef(a, result['a'])[0, 1]:.3f}"
+        print(line)
+
+    n = min(args.log_answers, args.answers)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'answers.jsonl')
+        with open(path, 'w', encoding='utf-8') as f:
+            for k in range(n):
+                f.write(json.dumps({'userId': int(u[k]), 'questionId': f'q{i[k]}', 'selectedOption': 'A',
+                                    'isCorrect': bool(correct[k]), 'timestamp': k}) + '\n')
+        start = time.perf_counter()
+        load_responses([path], lambda answer: answer['questionId'])
+        elapsed = time.perf_counter() - start
+    print(f"  leitura JSONL     : {elapsed:7.2f}s  ({n / elapsed:,.0f} respostas/s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Benchmark do pipeline do banco de questões em vários tamanhos de banco.
+
+Para cada tamanho, gera um banco sintético (benchmarks/synthetic.py) e mede
+tempo e pico de memória (tracemalloc, em uma segunda execução) de cada etapa:
+
+    create    create_question para todas as questões
+    dump      json.dumps(indent=2) + gravação, como o questions.json
+    load      json.load do arquivo
+    validate  validação em streaming (validate_file)
+    dedupe    MinHash + LSH sobre o banco inteiro
+    index     índice invertido de interesses
+    shard     bundles por interesse
+    merge     append de 1% de questões novas + compactação do QuestionStore
+
+O resultado é gravado em JSON. Com --baseline, cada etapa é comparada com uma
+execução anterior e o script sai com código 1 se alguma ficou mais lenta que
+--max-ratio vezes (etapas abaixo de --min-seconds são ignoradas, por ruído).
+
+Uso (a partir da raiz do repositório):
+    python3 benchmarks/bench_pipeline.py [--sizes 1000,100000,1000000] \
+        [--out benchmarks/results/pipeline.json] [--baseline antigo.json --max-ratio 1.5]
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from question_bank.bundles import build_bundles  # noqa: E402
+from question_bank.dedupe import find_duplicates  # noqa: E402
+from question_bank.interests import load_interest_names  # noqa: E402
+from question_bank.inverted_index import build_index  # noqa: E402
+from question_bank.store import QuestionStore  # noqa: E402
+from question_bank.validate import compile_schema, validate_file  # noqa: E402
+from synthetic import synthetic_questions  # noqa: E402
+
+DEFAULT_SIZES = '1000,100000'
+RESULTS_PATH = 'benchmarks/results/pipeline.json'
+
+
+def measure(fn, memory=True):
+    """(resultado, segundos, pico em bytes) — o pico vem de uma segunda execução com tracemalloc"""
+    gc.collect()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    peak = None
+    if memory:
+        del result
+        gc.collect()
+        tracemalloc.start()
+        result = fn()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def run_size(size, work_dir, seed, memory):
+    path = os.path.join(work_dir, 'questions.json')
+    check = compile_schema(load_interest_names())
+    stages = {}
+
+    def record(name, fn):
+        result, elapsed, peak = measure(fn, memory)
+        stages[name] = {'seconds': round(elapsed, 6), 'peak_bytes': peak,
+                        'items_per_second': round(size / elapsed) if elapsed else None}
+        peak_text = f'  pico {peak / 2**20:8.1f} MB' if peak is not None else ''
+        print(f"  {name:<9} {elapsed:8.3f}s{peak_text}", flush=True)
+        return result
+
+    questions = record('create', lambda: list(synthetic_questions(size, seed)))
+
+    def dump():
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(questions, ensure_ascii=False, indent=2))
+
+    record('dump', dump)
+
+    def load():
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    questions = record('load', load)
+    record('validate', lambda: validate_file(path, check))
+    record('dedupe', lambda: find_duplicates(questions))
+    record('index', lambda: build_index(questions))
+
+    bundles_dir = os.path.join(work_dir, 'bundles')
+
+    def shard():
+        shutil.rmtree(bundles_dir, ignore_errors=True)
+        return build_bundles(questions, bundles_dir)
+
+    record('shard', shard)
+
+    new = list(synthetic_questions(max(size // 100, 1), seed + 1))
+    original = path + '.orig'
+    shutil.copyfile(path, original)
+
+    def merge():
+        # Cada execução parte do mesmo arquivo, para a segunda medição ser igual à primeira
+        shutil.copyfile(original, path)
+        store = QuestionStore(path, os.path.join(work_dir, 'segments'))
+        store.append(new)
+        return store.compact()
+
+    record('merge', merge)
+    return stages
+
+
+def compare(results, baseline, max_ratio, min_seconds):
+    """Lista de (tamanho, etapa, antes, agora, razão) das etapas que ficaram mais lentas que max_ratio"""
+    regressions = []
+    for size, stages in results.items():
+        for stage, current in stages.items():
+            previous = baseline.get(size, {}).get(stage)
+            if previous is None or previous['seconds'] < min_seconds:
+                continue
+            ratio = current['seconds'] / previous['seconds']
+            if ratio > max_ratio:
+                regressions.append((size, stage, previous['seconds'], current['seconds'], ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help='tamanhos separados por vírgula')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--out', default=RESULTS_PATH)
+    parser.add_argument('--no-memory', action='store_true', help='não mede o pico de memória (mais rápido)')
+    parser.add_argument('--baseline', help='resultado anterior para comparar')
+    parser.add_argument('--max-ratio', type=float, default=1.5,
+                        help='falha se uma etapa ficar mais lenta que isso em relação ao baseline')
+    parser.add_argument('--min-seconds', type=float, default=0.05,
+                        help='etapas mais rápidas que isso no baseline não são comparadas')
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(',')]
+    results = {}
+    for size in sizes:
+        print(f"\n{size} questões", flush=True)
+        with tempfile.TemporaryDirectory() as tmp:
+            results[str(size)] = run_size(size, tmp, args.seed, not args.no_memory)
+
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'results': results,
+    }
+    os.makedirs(os.path.dirname(args.out) or '.', exist_ok=True)
+    with open(args.out, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✅ Resultados gravados em {args.out}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.max_ratio, args.min_seconds)
+        for size, stage, before, after, ratio in regressions:
+            print(f"❌ {stage} com {size} questões: {before:.3f}s → {after:.3f}s ({ratio:.2f}x)")
+        if regressions:
+            return 1
+        print(f"✅ Nenhuma etapa ficou mais de {args.max_ratio}x mais lenta que {args.baseline}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
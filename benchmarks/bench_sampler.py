@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Compara o sorteio por tabela alias com o embaralhamento atual de questions.ts
+(`[...filtered].sort(() => 0.5 - Math.random()).slice(0, count)`), em tempo e
+em distribuição.
+
+Uso (a partir da raiz do repositório):
+    python3 benchmarks/bench_sampler.py [--sizes 1000 100000 1000000] [--count 10]
+"""
+import argparse
+import functools
+import os
+import random
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from question_bank.interests import load_interest_names  # noqa: E402
+from question_bank.sampler import AliasTable, QuizSampler  # noqa: E402
+
+SELECTED = ['Games', 'Tecnologia', 'Investimentos']
+
+
+def shuffle_and_slice(questions, count, selected, rng):
+    """Equivalente em Python ao getRandomQuestions atual (comparador aleatório)"""
+    filtered = [q for q in questions if any(i in selected for i in q['interests'])]
+    shuffled = sorted(filtered, key=functools.cmp_to_key(lambda a, b: 0.5 - rng.random()))
+    return shuffled[:count]
+
+
+def synthetic_bank(size, names, rng):
+    combos = [tuple(rng.sample(names, 3)) for _ in range(1024)]
+    return [{'question': f'q{i}', 'interests': combos[rng.randrange(len(combos))]} for i in range(size)]
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def chi_square(observed, expected):
+    return sum((observed.get(k, 0) - e) ** 2 / e for k, e in expected.items())
+
+
+def distribution_check(trials, rng):
+    """
+    Probabilidade de cada posição original sair em primeiro lugar, com 8 itens.
+    O embaralhamento por sort deveria ser uniforme; o alias deveria seguir os pesos.
+    Valor crítico do qui-quadrado com 7 graus de liberdade (p=0,05): 14,07.
+    """
+    items = list(range(8))
+    weights = [1, 1, 2, 2, 1, 3, 1, 2]
+
+    first = Counter()
+    cmp = functools.cmp_to_key(lambda a, b: 0.5 - rng.random())
+    for _ in range(trials):
+        first[sorted(items, key=cmp)[0]] += 1
+    uniform = {i: trials / len(items) for i in items}
+    print(f"sort aleatório vs uniforme : qui² = {chi_square(first, uniform):10.1f}")
+
+    table = AliasTable(items, weights)
+    first = Counter(table.draw(rng) for _ in range(trials))
+    weighted = {i: trials * w / sum(weights) for i, w in zip(items, weights)}
+    print(f"alias vs pesos de relevância: qui² = {chi_square(first, weighted):10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 100000, 1000000])
+    parser.add_argument('--count', type=int, default=10)
+    parser.add_argument('--trials', type=int, default=100000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    names = load_interest_names()
+
+    print("Distribuição (8 itens, primeira posição):")
+    distribution_check(args.trials, rng)
+
+    print(f"\nTempo por quiz ({args.count} questões, interesses {SELECTED}):")
+    for size in args.sizes:
+        bank = synthetic_bank(size, names, rng)
+        sampler = QuizSampler(bank)
+
+        start = time.perf_counter()
+        sampler.table(SELECTED)
+        build = time.perf_counter() - start
+
+        alias = timed(lambda: sampler.sample(args.count, SELECTED, rng), 1000)
+        shuffle = timed(lambda: shuffle_and_slice(bank, args.count, SELECTED, rng), 1 if size >= 100000 else 20)
+        print(f"  {size:>9} questões: alias {alias * 1e6:9.1f} µs (tabela {build * 1e3:8.1f} ms, uma vez)"
+              f" | sort+slice {shuffle * 1e3:10.1f} ms  ({shuffle / alias:,.0f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Benchmark do agendador SM-2 com muitos usuários e questões.
+
+Simula um histórico de respostas (por padrão 100k usuários × 10k questões,
+20 respostas por usuário ao longo de 60 dias), mede a reprodução em lote,
+o custo de pedir as próximas 10 questões de cada usuário e o de registrar
+respostas novas uma a uma.
+
+Uso (a partir da raiz do repositório):
+    python3 benchmarks/bench_scheduler.py [--users 100000] [--questions 10000] [--answers-per-user 20]
+"""
+import argparse
+import os
+import random
+import resource
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from question_bank.scheduler import DAY, Scheduler  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--users', type=int, default=100000)
+    parser.add_argument('--questions', type=int, default=10000)
+    parser.add_argument('--answers-per-user', type=int, default=20)
+    parser.add_argument('--count', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    days = 60
+    answers = [(user, rng.randrange(args.questions), rng.random() < 0.7, rng.random() * days * DAY)
+               for user in range(args.users) for _ in range(args.answers_per_user)]
+    print(f"{len(answers)} respostas, {args.users} usuários × {args.questions} questões")
+
+    scheduler = Scheduler(args.questions, seed=args.seed)
+    start = time.perf_counter()
+    scheduler.replay(answers)
+    elapsed = time.perf_counter() - start
+    print(f"  replay em lote   : {elapsed:7.2f}s  ({len(answers) / elapsed:,.0f} respostas/s)")
+    del answers
+
+    now = days * DAY
+    start = time.perf_counter()
+    due_total = 0
+    for user in range(args.users):
+        chosen = scheduler.next_questions(user, args.count, now)
+        due_total += len(chosen)
+    elapsed = time.perf_counter() - start
+    print(f"  next({args.count}) por usuário: {elapsed / args.users * 1e6:7.1f} µs  "
+          f"({due_total} questões entregues)")
+
+    reviews = [(rng.randrange(args.users), rng.randrange(args.questions), rng.random() < 0.7)
+               for _ in range(200000)]
+    start = time.perf_counter()
+    for user, question, correct in reviews:
+        scheduler.review(user, question, correct, now)
+    elapsed = time.perf_counter() - start
+    print(f"  review online    : {elapsed / len(reviews) * 1e6:7.1f} µs por resposta")
+
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"  memória máxima   : {maxrss / 1024:7.0f} MB (RSS, inclui o histórico simulado)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark da busca BM25: indexação, atualização incremental e latência das consultas.
+
+Gera um banco sintético (benchmarks/synthetic.py), monta o índice do zero,
+acrescenta 1% de questões pela compactação do QuestionStore e mede a
+atualização incremental; depois roda consultas de 1 a 3 palavras sorteadas
+dos próprios textos e mostra a latência (p50, p95, p99).
+
+Uso (a partir da raiz do repositório):
+    python3 benchmarks/bench_search.py [--size 200000] [--queries 500] [--limit 10]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from question_bank.search import SearchIndex, update_index  # noqa: E402
+from question_bank.store import QuestionStore, format_item  # noqa: E402
+from synthetic import synthetic_questions  # noqa: E402
+
+
+def dir_size(path):
+    return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--size', type=int, default=200000)
+    parser.add_argument('--queries', type=int, default=500)
+    parser.add_argument('--limit', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=11)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    appended = list(synthetic_questions(max(args.size // 100, 1), args.seed + 1))
+    words = sorted({w.strip('?,.').lower() for q in appended for w in q['question'].split() if len(w) > 3})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        questions_path = os.path.join(tmp, 'questions.json')
+        index_dir = os.path.join(tmp, 'search')
+        # Gravado em streaming, no mesmo formato do json.dump(indent=2), para caber 1M de questões
+        with open(questions_path, 'w', encoding='utf-8') as f:
+            f.write('[')
+            for k, q in enumerate(synthetic_questions(args.size, args.seed)):
+                f.write((',\n' if k else '\n') + format_item(q))
+            f.write('\n]')
+        json_size = os.path.getsize(questions_path)
+        print(f"{args.size} questões ({json_size / 1e6:.0f} MB de JSON)")
+
+        start = time.perf_counter()
+        stats = update_index(questions_path, index_dir)
+        elapsed = time.perf_counter() - start
+        print(f"  índice do zero     : {elapsed:7.2f}s  ({args.size / elapsed:,.0f} questões/s, "
+              f"{dir_size(index_dir) / 1e6:.1f} MB em {stats['segments']} segmentos)")
+
+        store = QuestionStore(questions_path, os.path.join(tmp, 'segments'))
+        store.append(appended)
+        store.compact()
+        start = time.perf_counter()
+        stats = update_index(questions_path, index_dir)
+        elapsed = time.perf_counter() - start
+        print(f"  incremental        : {elapsed:7.2f}s  (+{stats['added']} questões, rebuild: {stats['rebuilt']})")
+
+        queries = [' '.join(rng.sample(words, rng.randint(1, 3))) for _ in range(args.queries)]
+        with SearchIndex(index_dir, questions_path) as index:
+            start = time.perf_counter()
+            index.search(queries[0], args.limit)
+            print(f"  primeira consulta  : {(time.perf_counter() - start) * 1000:7.2f} ms")
+            latencies = []
+            empty = 0
+            for query in queries:
+                start = time.perf_counter()
+                results = index.search(query, args.limit)
+                latencies.append(time.perf_counter() - start)
+                empty += not results
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000
+        print(f"  consultas          : p50 {p50:.2f} ms  p95 {p95:.2f} ms  p99 {p99:.2f} ms  "
+              f"({args.queries} consultas, {empty} sem resultado)")
+
+
+if __name__ == '__main__':
+    main()
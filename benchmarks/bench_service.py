@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Teste de carga do serviço de questões (question_bank.server).
+
+Sobe o servidor em um subprocesso (ou usa um já em execução com --url) e abre
+--connections conexões keep-alive que fazem requisições em sequência durante
+--duration segundos, misturando sorteios por interesse, busca por ID e
+revalidação de shards com If-None-Match. Mostra requisições por segundo e
+latências p50/p99 por rota.
+
+Uso (a partir da raiz do repositório):
+    python3 benchmarks/bench_service.py [--connections 50] [--duration 10] [--url http://127.0.0.1:8765]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from urllib.parse import quote, urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from question_bank.interests import load_interest_names  # noqa: E402
+
+
+async def request(reader, writer, host, path, headers=()):
+    lines = [f'GET {path} HTTP/1.1', f'Host: {host}', *headers]
+    writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+    raw = await reader.readuntil(b'\r\n\r\n')
+    head = raw.decode('latin-1').split('\r\n')
+    status = int(head[0].split(' ', 2)[1])
+    length = 0
+    for line in head[1:]:
+        name, _, value = line.partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+    body = await reader.readexactly(length) if length else b''
+    return status, body
+
+
+async def client(host, port, deadline, routes, latencies, errors, seed):
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            name, path, headers = rng.choice(routes)(rng)
+            start = time.perf_counter()
+            status, _ = await request(reader, writer, host, path, headers)
+            latencies.setdefault(name, []).append(time.perf_counter() - start)
+            if status not in (200, 304):
+                errors.append((name, status))
+    finally:
+        writer.close()
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p / 100 * len(values)))]
+
+
+async def run(host, port, connections, duration):
+    # Dados para as rotas: IDs e ETags de shards vêm do próprio serviço
+    reader, writer = await asyncio.open_connection(host, port)
+    _, body = await request(reader, writer, host, '/questions?count=100')
+    ids = [q['id'] for q in json.loads(body)]
+    _, body = await request(reader, writer, host, '/bundles/manifest.json')
+    shards = [s['file'] for s in json.loads(body)['shards']]
+    etags = {}
+    for shard in shards:
+        # A ETag depende da codificação; a revalidação abaixo pede gzip
+        writer.write(f'GET /bundles/{shard} HTTP/1.1\r\nHost: {host}\r\nAccept-Encoding: gzip\r\n\r\n'
+                     .encode('latin-1'))
+        raw = await reader.readuntil(b'\r\n\r\n')
+        headers = dict(line.split(': ', 1) for line in raw.decode('latin-1').split('\r\n')[1:] if ': ' in line)
+        etags[shard] = headers['ETag']
+        await reader.readexactly(int(headers['Content-Length']))
+    writer.close()
+    interests = load_interest_names()
+
+    def sample(rng):
+        chosen = ','.join(quote(i) for i in rng.sample(interests, rng.randint(1, 4)))
+        return 'sorteio', f'/questions?interests={chosen}&count=10', ()
+
+    def by_id(rng):
+        return 'id', f'/questions/{rng.choice(ids)}', ()
+
+    def shard(rng):
+        name = rng.choice(shards)
+        return 'shard 304', f'/bundles/{name}', (f'If-None-Match: {etags[name]}', 'Accept-Encoding: gzip')
+
+    routes = [sample, sample, by_id, shard]
+    latencies = {}
+    errors = []
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*(client(host, port, deadline, routes, latencies, errors, seed)
+                           for seed in range(connections)))
+    elapsed = time.perf_counter() - start
+    return latencies, errors, elapsed
+
+
+def wait_for_port(host, port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f'servidor não respondeu em {host}:{port}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--connections', type=int, default=50)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--url', help='servidor já em execução (senão um é iniciado)')
+    parser.add_argument('--port', type=int, default=8799, help='porta do servidor iniciado pelo benchmark')
+    args = parser.parse_args()
+
+    server = None
+    if args.url:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port or 80
+    else:
+        host, port = '127.0.0.1', args.port
+        server = subprocess.Popen([sys.executable, '-m', 'question_bank.server', '--port', str(port)],
+                                  cwd=ROOT, stdout=subprocess.DEVNULL)
+    try:
+        wait_for_port(host, port)
+        latencies, errors, elapsed = asyncio.run(run(host, port, args.connections, args.duration))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    total = sum(len(v) for v in latencies.values())
+    print(f"{total} requisições em {elapsed:.1f}s com {args.connections} conexões: {total / elapsed:,.0f} req/s")
+    for name, values in sorted(latencies.items()):
+        print(f"  {name:<10} {len(values):8} req  p50 {percentile(values, 50) * 1000:6.2f} ms  "
+              f"p99 {percentile(values, 99) * 1000:6.2f} ms")
+    if errors:
+        print(f"⚠️  {len(errors)} respostas com erro (ex.: {errors[0]})")
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark do validador em streaming: throughput (MB/s) e pico de memória
+comparados com json.load + validação do banco inteiro.
+
+Uso (a partir da raiz do repositório):
+    python3 benchmarks/bench_validate.py [--mb 200]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from question_bank.interests import load_interest_names  # noqa: E402
+from question_bank.store import QUESTIONS_PATH, format_item  # noqa: E402
+from question_bank.validate import compile_schema, validate_file  # noqa: E402
+
+
+def build_bank(path, target_mb):
+    """Repete as questões reais até o arquivo atingir `target_mb`"""
+    with open(QUESTIONS_PATH, 'r', encoding='utf-8') as f:
+        base = [format_item(q).encode('utf-8') for q in json.load(f)]
+    target = target_mb * 1024 * 1024
+    written = 0
+    with open(path, 'wb') as out:
+        out.write(b'[')
+        i = 0
+        while written < target:
+            out.write((b'\n' if i == 0 else b',\n') + base[i % len(base)])
+            written += len(base[i % len(base)])
+            i += 1
+        out.write(b'\n]')
+    return i
+
+
+def measure(fn):
+    """Tempo sem tracemalloc (que deixa tudo mais lento) e pico de memória em outra execução"""
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--mb', type=int, default=200, help='tamanho do banco sintético')
+    args = parser.parse_args()
+
+    check = compile_schema(load_interest_names())
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bank.json')
+        count = build_bank(path, args.mb)
+        size_mb = os.path.getsize(path) / (1024 * 1024)
+        print(f"Banco sintético: {count} questões, {size_mb:.1f} MB\n")
+
+        (total, errors), elapsed, peak = measure(lambda: validate_file(path, check))
+        print(f"streaming : {elapsed:6.2f}s  {size_mb / elapsed:7.1f} MB/s  pico {peak / 2**20:7.1f} MB  ({len(errors)} erros)")
+
+        def full_load():
+            with open(path, 'r', encoding='utf-8') as f:
+                return sum(len(check(q)) for q in json.load(f))
+
+        errors, elapsed, peak = measure(full_load)
+        print(f"json.load : {elapsed:6.2f}s  {size_mb / elapsed:7.1f} MB/s  pico {peak / 2**20:7.1f} MB  ({errors} erros)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark das versões do banco: build com histórico e tamanho dos deltas.
+
+Gera um banco sintético (benchmarks/synthetic.py) e registra uma sequência
+de versões típicas — acrescentar algumas questões, corrigir dicas, remover
+questões — medindo o build de cada uma (snapshot + deltas de todas as
+versões mantidas), o tamanho dos deltas contra o snapshot completo e o
+tempo para aplicar a cadeia de deltas e conferir o hash.
+
+Uso (a partir da raiz do repositório):
+    python3 benchmarks/bench_versions.py [--size 100000] [--steps 5] [--keep 20]
+"""
+import argparse
+import gzip
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from question_bank.store import format_item  # noqa: E402
+from question_bank.versions import Version, apply_delta, build_versions, load_delta  # noqa: E402
+from synthetic import synthetic_questions  # noqa: E402
+
+
+def write_bank(path, questions):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('[')
+        for k, q in enumerate(questions):
+            f.write((',\n' if k else '\n') + format_item(q))
+        f.write('\n]')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--size', type=int, default=100000)
+    parser.add_argument('--steps', type=int, default=5, help='versões depois da inicial')
+    parser.add_argument('--keep', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=17)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    questions = list(synthetic_questions(args.size, args.seed))
+    extra = synthetic_questions(args.steps * 50, args.seed + 1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        questions_path = os.path.join(tmp, 'questions.json')
+        out_dir = os.path.join(tmp, 'versions')
+        chain = os.path.join(tmp, 'chain')
+        os.makedirs(chain)
+        write_bank(questions_path, questions)
+        print(f"{args.size} questões ({os.path.getsize(questions_path) / 1e6:.0f} MB de JSON)")
+        start = time.perf_counter()
+        manifest, _ = build_versions(questions_path, out_dir, args.keep)
+        print(f"  versão inicial : {time.perf_counter() - start:7.2f}s  "
+              f"(snapshot {manifest['history'][0]['bytes'] / 1e6:.1f} MB gzip)")
+        first = os.path.join(out_dir, manifest['snapshot'])
+        shutil.copy(first, chain)
+        deltas = []
+
+        for step in range(1, args.steps + 1):
+            # Uma edição típica: algumas questões novas, dicas corrigidas e uma ou outra removida
+            questions.extend(next(extra) for _ in range(rng.randint(1, 50)))
+            for i in rng.sample(range(len(questions)), 20):
+                questions[i] = dict(questions[i], tip=questions[i]['tip'] + ' (revisada)')
+            for i in sorted(rng.sample(range(len(questions)), 3), reverse=True):
+                del questions[i]
+            write_bank(questions_path, questions)
+            previous = manifest['latest']
+            start = time.perf_counter()
+            manifest, _ = build_versions(questions_path, out_dir, args.keep)
+            elapsed = time.perf_counter() - start
+            delta = manifest['deltas'][previous]
+            path = os.path.join(out_dir, delta['file'])
+            with open(path, 'rb') as f:
+                gzipped = len(gzip.compress(f.read()))
+            shutil.copy(path, chain)
+            deltas.append(os.path.join(chain, delta['file']))
+            print(f"  versão {step:<8}: {elapsed:7.2f}s  ({len(manifest['deltas'])} deltas; último "
+                  f"+{delta['added']} ~{delta['changed']} -{delta['removed']}: "
+                  f"{delta['bytes'] / 1024:.1f} KB, {gzipped / 1024:.1f} KB gzip)")
+
+        start = time.perf_counter()
+        version = Version.load(os.path.join(chain, os.path.basename(first)))
+        loaded = time.perf_counter() - start
+        for path in deltas:
+            version = apply_delta(version, load_delta(path))
+        applied = time.perf_counter() - start - loaded
+        assert version.hash == manifest['latest']
+        print(f"  cadeia         : snapshot lido em {loaded:.2f}s, {len(deltas)} deltas aplicados e "
+              f"conferidos em {applied:.2f}s")
+        oldest = manifest['deltas'][manifest['history'][-1]['hash']]
+        print(f"  delta direto   : {oldest['bytes'] / 1024:.1f} KB da primeira versão para a atual")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Banco sintético para benchmarks: questões realistas em português montadas a
+partir de padrões no estilo de `questions_templates` (pergunta, opção correta,
+distratores, dica e interesses), em qualquer quantidade e reprodutível pela semente.
+
+As partes variáveis (canal, produto, tática, público) são sorteadas de forma
+independente, então poucas questões saem quase iguais (o bastante para o dedupe
+ter trabalho); os distratores vêm de um conjunto pequeno, como nos scripts
+geradores reais.
+"""
+import random
+
+from question_bank.generate import create_question
+from question_bank.interests import load_interest_names
+
+PATTERNS = (
+    "Qual golpe é comum em {canal} que oferecem {produto} para {publico}?",
+    "Como golpistas usam {canal} para enganar {publico} interessados em {produto}?",
+    "O que indica uma fraude ao comprar {produto} por {canal}?",
+    "Qual é o principal risco de negociar {produto} com desconhecidos em {canal}?",
+    "Que cuidado {publico} devem ter ao receber ofertas de {produto} por {canal}?",
+    "Qual sinal de alerta aparece em anúncios de {produto} divulgados em {canal}?",
+)
+CANAIS = (
+    "grupos de WhatsApp", "anúncios no Instagram", "sites de classificados", "lojas virtuais recém-criadas",
+    "perfis falsos no Facebook", "mensagens SMS", "e-mails promocionais", "ligações telefônicas",
+    "vídeos patrocinados no YouTube", "canais do Telegram", "marketplaces", "aplicativos de namoro",
+    "fóruns de discussão", "links encurtados", "QR codes em panfletos", "páginas de leilão",
+)
+PRODUTOS = (
+    "ingressos de shows", "cursos online", "equipamentos de fotografia", "pacotes de viagem",
+    "celulares usados", "criptomoedas", "vagas de emprego", "consórcios de imóveis",
+    "peças de carro", "instrumentos musicais", "moedas de jogos", "planos de saúde",
+    "consultas veterinárias", "materiais de artesanato", "livros raros", "suplementos alimentares",
+    "serviços de reforma", "assinaturas de streaming", "bolsas de estudo", "empréstimos consignados",
+)
+PUBLICOS = (
+    "estudantes", "aposentados", "pequenos empreendedores", "jogadores", "músicos", "viajantes",
+    "fotógrafos", "pais de primeira viagem", "investidores iniciantes", "artesãos", "motoristas",
+    "profissionais de saúde", "colecionadores", "atletas amadores",
+)
+TATICAS = (
+    "cobram um sinal via Pix e desaparecem antes da entrega",
+    "enviam um boleto adulterado com os dados de outra conta",
+    "pedem o código de verificação recebido por SMS",
+    "anunciam preços muito abaixo do mercado para atrair vítimas",
+    "clonam o perfil de uma loja conhecida e copiam suas avaliações",
+    "exigem pagamento antecipado de taxas que não existem",
+    "instalam aplicativos de acesso remoto no celular da vítima",
+    "criam urgência falsa com prazos de poucas horas",
+    "usam depoimentos inventados e prints editados de lucros",
+    "solicitam dados bancários para um suposto reembolso",
+)
+DISTRATORES = (
+    "Garantia do fabricante", "Suporte técnico disponível", "Entrega rápida e rastreada",
+    "Preços compatíveis com o mercado", "Nota fiscal emitida na compra", "Atendimento em horário comercial",
+    "Política de troca clara", "Avaliações verificadas de clientes", "Pagamento por meios oficiais",
+    "Contrato assinado pelas duas partes", "Certificado reconhecido", "Loja com endereço físico",
+)
+DICAS = (
+    "Desconfie quando {publico} recebem ofertas de {produto} por {canal}: golpistas {tatica}.",
+    "Golpistas que vendem {produto} em {canal} {tatica}; confirme a reputação antes de pagar.",
+    "Em {canal}, quem oferece {produto} e {tatica} está aplicando um golpe conhecido.",
+)
+
+
+def synthetic_questions(count, seed=0, interest_names=None):
+    """Gera `count` questões com create_question (mesma semente → mesmas questões)"""
+    rng = random.Random(seed)
+    interests = list(interest_names or load_interest_names())
+    choice = rng.choice
+    for _ in range(count):
+        slots = {'canal': choice(CANAIS), 'produto': choice(PRODUTOS),
+                 'publico': choice(PUBLICOS), 'tatica': choice(TATICAS)}
+        question = choice(PATTERNS).format(**slots)
+        correct = f"Vendedores que {slots['tatica']}"
+        tip = choice(DICAS).format(**slots)
+        tags = rng.sample(interests, rng.randint(1, 3))
+        if 'Tecnologia' not in tags and rng.random() < 0.6:
+            tags.append('Tecnologia')
+        yield create_question(question, correct, rng.sample(DISTRATORES, 3), tip, tags, rng)
+
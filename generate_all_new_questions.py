@@ -3,34 +3,14 @@
 Script para gerar todas as questões necessárias para que cada interesse tenha pelo menos 10 questões.
 Total necessário: ~157 questões novas
 """
-import json
-import random
+from question_bank.build_cache import BuildCache
+from question_bank.store import QuestionStore
 
-# Carregar questions.json existente
-with open('Scam/src/data/questions.json', 'r', encoding='utf-8') as f:
-    existing_questions = json.load(f)
+store = QuestionStore()
 
-print(f"Questões existentes: {len(existing_questions)}")
-
-# Função auxiliar para criar questões com opções embaralhadas
-def create_question(question_text, correct_text, wrong_texts, tip, interests):
-    """Cria uma questão com opções embaralhadas"""
-    letters = ['A', 'B', 'C', 'D']
-    all_texts = [correct_text] + wrong_texts[:3]  # Garantir 4 opções
-    random.shuffle(all_texts)
-    
-    correct_idx = all_texts.index(correct_text)
-    options = []
-    for i, letter in enumerate(letters):
-        options.append({"label": letter, "text": all_texts[i]})
-    
-    return {
-        "question": question_text,
-        "options": options,
-        "correct": letters[correct_idx],
-        "tip": tip,
-        "interests": interests
-    }
+# Questões já geradas vêm do cache (mesma ordem de opções); só as novas são gravadas
+cache = BuildCache()
+create_question = cache.create_question
 
 new_questions = []
 
@@ -357,14 +337,16 @@ print(f"Adicionadas {len(artesanato)} questões de Artesanato")
 print(f"\nTotal de questões novas criadas até agora: {len(new_questions)}")
 print("Continuando com mais interesses...")
 
-# Mesclar e salvar
-all_questions = existing_questions + new_questions
-
-with open('Scam/src/data/questions.json', 'w', encoding='utf-8') as f:
-    json.dump(all_questions, f, ensure_ascii=False, indent=2)
+# Gravar no log de segmentos (questions.json é atualizado na compactação)
+added = store.append(cache.take_new())
+cache.save(prune=True)
 
-print(f"\n✅ Adicionadas {len(new_questions)} questões novas")
-print(f"✅ Total de questões agora: {len(all_questions)}")
+for text, errors in cache.errors():
+    print(f"⚠️  {text}: {'; '.join(errors)}")
+print(f"\nCache: {cache.hits} reaproveitadas, {cache.misses} geradas")
+print(f"✅ Adicionadas {added} questões novas")
+print(f"✅ Pendentes de compactação: {store.pending_count()}")
+print("Execute `python3 -m question_bank.store compact` para atualizar o questions.json")
 print(f"\n⚠️  Ainda faltam questões para outros interesses.")
 print("Execute este script novamente após adicionar mais questões ao código.")
 
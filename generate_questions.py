@@ -2,18 +2,14 @@
 import json
 import random
 
+from question_bank.coverage import interest_counts
+
 # Carregar questions.json existente
 with open('Scam/src/data/questions.json', 'r', encoding='utf-8') as f:
     existing_questions = json.load(f)
 
-# Contar questões por interesse
-questions_by_interest = {}
-for q in existing_questions:
-    if 'interests' in q and isinstance(q['interests'], list):
-        for interest in q['interests']:
-            if interest not in questions_by_interest:
-                questions_by_interest[interest] = 0
-            questions_by_interest[interest] += 1
+# Contar questões por interesse (veja também `python3 -m question_bank.coverage`)
+questions_by_interest = interest_counts(existing_questions)
 
 # Definir novas questões necessárias
 # Formato: {interesse: [lista de questões]}
@@ -0,0 +1,4 @@
+"""
+Ferramentas compartilhadas pelos scripts de geração do banco de questões.
+Os caminhos são relativos à raiz do repositório, como nos scripts generate_*.py.
+"""
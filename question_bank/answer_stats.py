@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Agregador de estatísticas de respostas.
+
+Lê logs exportados de respostas (registros QuestionAnswer de questionStats.ts:
+questionText, selectedOption, isCorrect, timestamp) em uma única passada — em
+JSONL ou no formato de lista JSON do localStorage — e gera, para todas as
+questões de uma vez, os mesmos campos de QuestionStats: totalAnswers,
+answersByOption, correctAnswers e incorrectAnswers. A memória usada depende do
+número de questões, não do tamanho do log.
+
+Com --by-id a saída é indexada pelo ID estável da questão (question_bank.ids)
+em vez do texto; registros com `questionId` já usam esse ID diretamente.
+
+Uso:
+    python3 -m question_bank.answer_stats respostas.jsonl [mais.jsonl ...] \
+        [--out Scam/public/question-stats.json] [--by-id]
+"""
+import argparse
+import json
+
+from question_bank import instrument
+from question_bank.ids import question_id
+from question_bank.store import QUESTIONS_PATH, write_atomic
+from question_bank.validate import iter_items
+
+STATS_PATH = 'Scam/public/question-stats.json'
+
+
+def question_key(text):
+    """Mesma chave de getQuestionId em questionStats.ts"""
+    return text.strip().lower()
+
+
+def iter_answers(path):
+    """Registros de resposta de um arquivo JSONL ou de uma lista JSON, em streaming"""
+    with open(path, 'rb') as f:
+        head = f.read(1)
+        while head and head in b' \t\r\n':
+            head = f.read(1)
+        f.seek(0)
+        if head == b'[':
+            for item, _, _ in iter_items(f):
+                yield item
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def id_key(questions_path=QUESTIONS_PATH):
+    """Função de chave que traduz o texto da pergunta para o ID estável (busca em dicionário)"""
+    with open(questions_path, 'rb') as f:
+        by_text = {question_key(item.get('question', '')): question_id(item)
+                   for item, _, _ in iter_items(f)}
+
+    def key(answer):
+        return answer.get('questionId') or by_text[question_key(answer['questionText'])]
+
+    return key
+
+
+class AnswerStats:
+    """Acumuladores por questão; `add` é O(1)"""
+
+    def __init__(self, key=None):
+        self.key = key or (lambda answer: question_key(answer['questionText']))
+        self.stats = {}
+        self.skipped = 0
+
+    def add(self, answer):
+        try:
+            key = self.key(answer)
+            option = answer['selectedOption']
+        except (KeyError, TypeError, AttributeError):
+            self.skipped += 1
+            return
+        entry = self.stats.get(key)
+        if entry is None:
+            entry = self.stats[key] = {
+                'questionText': answer.get('questionText', ''),
+                'totalAnswers': 0,
+                'answersByOption': {},
+                'correctAnswers': 0,
+                'incorrectAnswers': 0,
+            }
+        entry['totalAnswers'] += 1
+        by_option = entry['answersByOption']
+        by_option[option] = by_option.get(option, 0) + 1
+        if answer.get('isCorrect'):
+            entry['correctAnswers'] += 1
+        else:
+            entry['incorrectAnswers'] += 1
+
+    def add_all(self, answers):
+        for answer in answers:
+            self.add(answer)
+        return self
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Agrega estatísticas de respostas por questão')
+    parser.add_argument('logs', nargs='+', help='arquivos JSONL ou lista JSON de respostas')
+    parser.add_argument('--out', default=STATS_PATH)
+    parser.add_argument('--by-id', action='store_true', help='indexa pelo ID estável da questão')
+    parser.add_argument('--questions', default=QUESTIONS_PATH)
+    args = parser.parse_args(argv)
+
+    aggregator = AnswerStats(id_key(args.questions) if args.by_id else None)
+    total = 0
+    with instrument.span('answer_stats'):
+        for path in args.logs:
+            for answer in iter_answers(path):
+                aggregator.add(answer)
+                total += 1
+    instrument.count('answers.read', total)
+    instrument.count('answers.skipped', aggregator.skipped)
+
+    write_atomic(args.out, json.dumps(aggregator.stats, ensure_ascii=False, indent=2).encode('utf-8'))
+    print(f"✅ {total} respostas de {len(aggregator.stats)} questões agregadas em {args.out}")
+    if aggregator.skipped:
+        print(f"⚠️  {aggregator.skipped} registros ignorados (incompletos ou de questões desconhecidas)")
+
+
+if __name__ == '__main__':
+    main()
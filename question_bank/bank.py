@@ -0,0 +1,184 @@
+"""
+Representação compacta do banco de questões em memória.
+
+Em vez de uma lista de dicts (cada um com sua lista de opções {"label","text"}
+e sua cópia de "Tecnologia"), o QuestionBank guarda colunas: textos internados
+com sys.intern, labels implícitos pela posição (A–D), a resposta certa como
+índice em um bytearray e os interesses codificados como ids pequenos em um
+array. A conversão de/para JSON preserva o conteúdo exatamente.
+"""
+import json
+import sys
+from array import array
+
+from question_bank import instrument
+from question_bank.store import QUESTIONS_PATH
+from question_bank.validate import iter_items
+
+LABELS = ('A', 'B', 'C', 'D')
+_KEY_ORDER = ('question', 'options', 'correct', 'tip', 'interests')
+
+
+class QuestionRecord:
+    """Visão leve de uma questão do banco (sem copiar as colunas)"""
+
+    __slots__ = ('bank', 'ordinal')
+
+    def __init__(self, bank, ordinal):
+        self.bank = bank
+        self.ordinal = ordinal
+
+    @property
+    def question(self):
+        return self.bank.question_texts[self.ordinal]
+
+    @property
+    def option_texts(self):
+        start = self.ordinal * 4
+        return tuple(self.bank.option_texts[start:start + 4])
+
+    @property
+    def correct_index(self):
+        return self.bank.correct[self.ordinal]
+
+    @property
+    def tip(self):
+        return self.bank.tips[self.ordinal]
+
+    @property
+    def interests(self):
+        return self.bank.interests_of(self.ordinal)
+
+    def to_dict(self):
+        return self.bank[self.ordinal]
+
+
+class QuestionBank:
+    """Banco de questões em colunas"""
+
+    __slots__ = ('question_texts', 'option_texts', 'correct', 'tips',
+                 'interest_names', 'interest_ids', 'interest_offsets',
+                 '_interest_lookup', 'irregular')
+
+    def __init__(self):
+        self.question_texts = []
+        self.option_texts = []          # 4 por questão, na ordem A–D
+        self.correct = bytearray()      # índice 0–3 da opção correta
+        self.tips = []
+        self.interest_names = []        # dicionário id → nome
+        self._interest_lookup = {}
+        self.interest_ids = array('H')  # ids de todas as questões, concatenados
+        self.interest_offsets = array('I', [0])
+        # Questões fora do formato padrão ficam inteiras aqui (ordinal → dict)
+        self.irregular = {}
+
+    @classmethod
+    def from_questions(cls, questions):
+        bank = cls()
+        for q in questions:
+            bank.append(q)
+        return bank
+
+    def __len__(self):
+        return len(self.correct)
+
+    def interest_id(self, name):
+        i = self._interest_lookup.get(name)
+        if i is None:
+            i = len(self.interest_names)
+            self.interest_names.append(sys.intern(name))
+            self._interest_lookup[name] = i
+        return i
+
+    @staticmethod
+    def _is_regular(q):
+        if type(q) is not dict or tuple(q) != _KEY_ORDER[:len(q)] or len(q) < 4:
+            return False
+        options = q['options']
+        if type(options) is not list or len(options) != 4 or q['correct'] not in LABELS:
+            return False
+        for label, option in zip(LABELS, options):
+            if type(option) is not dict or tuple(option) != ('label', 'text') or option['label'] != label:
+                return False
+            if type(option['text']) is not str:
+                return False
+        if type(q['question']) is not str or type(q['tip']) is not str:
+            return False
+        interests = q.get('interests', [])
+        return type(interests) is list and all(type(i) is str for i in interests)
+
+    def append(self, q):
+        ordinal = len(self)
+        intern = sys.intern
+        if self._is_regular(q):
+            self.question_texts.append(intern(q['question']))
+            self.option_texts.extend(intern(o['text']) for o in q['options'])
+            self.correct.append(LABELS.index(q['correct']))
+            self.tips.append(intern(q['tip']))
+            if 'interests' in q:
+                self.interest_ids.extend(self.interest_id(i) for i in q['interests'])
+            else:
+                # Sem a chave "interests": marcada para voltar igual no JSON
+                self.irregular[ordinal] = None
+        else:
+            self.irregular[ordinal] = q
+            self.question_texts.append(q.get('question', '') if type(q) is dict else '')
+            self.option_texts.extend(('', '', '', ''))
+            self.correct.append(0)
+            self.tips.append('')
+            # Os interesses entram nas colunas mesmo assim (cobertura, máscaras do .qbank)
+            interests = q.get('interests') if type(q) is dict else None
+            if type(interests) is list:
+                self.interest_ids.extend(self.interest_id(i) for i in interests if type(i) is str)
+        self.interest_offsets.append(len(self.interest_ids))
+        return ordinal
+
+    def interests_of(self, ordinal):
+        start, end = self.interest_offsets[ordinal], self.interest_offsets[ordinal + 1]
+        names = self.interest_names
+        return [names[i] for i in self.interest_ids[start:end]]
+
+    def interest_mask(self, ordinal):
+        """Bitmask (int) dos interesses da questão, pelo id de cada interesse"""
+        start, end = self.interest_offsets[ordinal], self.interest_offsets[ordinal + 1]
+        mask = 0
+        for i in self.interest_ids[start:end]:
+            mask |= 1 << i
+        return mask
+
+    def record(self, ordinal):
+        return QuestionRecord(self, ordinal)
+
+    def __getitem__(self, ordinal):
+        """A questão no formato do questions.json"""
+        if ordinal < 0:
+            ordinal += len(self)
+        if ordinal in self.irregular:
+            q = self.irregular[ordinal]
+            if q is not None:
+                return q
+        start = ordinal * 4
+        item = {
+            'question': self.question_texts[ordinal],
+            'options': [{'label': label, 'text': text}
+                        for label, text in zip(LABELS, self.option_texts[start:start + 4])],
+            'correct': LABELS[self.correct[ordinal]],
+            'tip': self.tips[ordinal],
+        }
+        if ordinal not in self.irregular:
+            item['interests'] = self.interests_of(ordinal)
+        return item
+
+    def __iter__(self):
+        for ordinal in range(len(self)):
+            yield self[ordinal]
+
+    def to_json(self):
+        return json.dumps(list(self), ensure_ascii=False, indent=2)
+
+
+@instrument.span('load')
+def load_bank(path=QUESTIONS_PATH):
+    """Monta o QuestionBank lendo o arquivo em streaming (sem a lista de dicts intermediária)"""
+    with open(path, 'rb') as f:
+        return QuestionBank.from_questions(item for item, _, _ in iter_items(f))
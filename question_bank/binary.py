@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Formato binário em colunas do banco de questões (.qbank), lido via mmap.
+
+Layout (little-endian, seções alinhadas em 8 bytes):
+
+    cabeçalho   magic 'QBNK', versão, contagens e (offset, tamanho) de cada seção
+    strings     offsets u64 (n_strings + 1) + dados UTF-8 de todos os textos sem repetição
+    question    u32 por questão: id da string da pergunta
+    options     u32 × 4 por questão: ids das strings das opções A–D
+    tip         u32 por questão
+    correct     u8 por questão: índice 0–3 da opção correta
+    flags       u8 por questão: 1 = questão irregular (JSON inteiro na string de `question`),
+                2 = sem a chave "interests"
+    int_offsets u32 (n + 1): fatia de int_ids de cada questão
+    int_ids     u16: ids de interesse, na ordem original
+    int_masks   u64 por questão: bitmask dos interesses com id < 64
+    int_names   u32 por interesse: id da string do nome
+
+O leitor só mapeia o arquivo e lê offsets: abrir custa O(1) e cada questão
+é decodificada sob demanda, sem parsear o resto. Em máquinas big-endian as
+colunas numéricas são copiadas e invertidas na abertura (sem zero-copy).
+
+Uso:
+    python3 -m question_bank.binary [--out Scam/src/data/questions.qbank]
+"""
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from question_bank import instrument
+from question_bank.bank import LABELS, load_bank
+from question_bank.store import QUESTIONS_PATH
+
+BINARY_PATH = 'Scam/src/data/questions.qbank'
+MAGIC = b'QBNK'
+VERSION = 1
+SECTIONS = ('string_offsets', 'string_data', 'question', 'options', 'tip', 'correct',
+            'flags', 'int_offsets', 'int_ids', 'int_masks', 'int_names')
+_HEADER = struct.Struct('<4sHHIII' + 'QQ' * len(SECTIONS))
+
+FLAG_IRREGULAR = 1
+FLAG_NO_INTERESTS = 2
+
+
+def _pad(n):
+    return (8 - n % 8) % 8
+
+
+def _column(view, fmt):
+    """Seção little-endian como sequência de inteiros; memoryview.cast usa a ordem nativa"""
+    if sys.byteorder == 'little':
+        return view.cast(fmt)
+    column = array(fmt, view.tobytes())
+    column.byteswap()
+    return memoryview(column)
+
+
+@instrument.span('qbank')
+def write_binary(bank, path=BINARY_PATH):
+    """Grava o QuestionBank no formato .qbank (troca atômica com os.replace)"""
+    strings = {}
+
+    def sid(text):
+        i = strings.get(text)
+        if i is None:
+            i = strings[text] = len(strings)
+        return i
+
+    n = len(bank)
+    question = [0] * n
+    flags = bytearray(n)
+    for ordinal in range(n):
+        irregular = bank.irregular.get(ordinal, False)
+        if irregular is None:
+            flags[ordinal] = FLAG_NO_INTERESTS
+        elif irregular is not False:
+            flags[ordinal] = FLAG_IRREGULAR
+            question[ordinal] = sid(json.dumps(irregular, ensure_ascii=False))
+            continue
+        question[ordinal] = sid(bank.question_texts[ordinal])
+    options = [sid(t) for t in bank.option_texts]
+    tips = [sid(t) for t in bank.tips]
+    names = [sid(t) for t in bank.interest_names]
+
+    masks = [0] * n
+    offsets = bank.interest_offsets
+    ids = bank.interest_ids
+    for ordinal in range(n):
+        mask = 0
+        for i in ids[offsets[ordinal]:offsets[ordinal + 1]]:
+            if i < 64:
+                mask |= 1 << i
+        masks[ordinal] = mask
+
+    encoded = [s.encode('utf-8') for s in strings]
+    string_offsets = [0]
+    for data in encoded:
+        string_offsets.append(string_offsets[-1] + len(data))
+
+    sections = {
+        'string_offsets': struct.pack(f'<{len(string_offsets)}Q', *string_offsets),
+        'string_data': b''.join(encoded),
+        'question': struct.pack(f'<{n}I', *question),
+        'options': struct.pack(f'<{len(options)}I', *options),
+        'tip': struct.pack(f'<{n}I', *tips),
+        'correct': bytes(bank.correct),
+        'flags': bytes(flags),
+        'int_offsets': struct.pack(f'<{len(offsets)}I', *offsets),
+        'int_ids': struct.pack(f'<{len(ids)}H', *ids),
+        'int_masks': struct.pack(f'<{n}Q', *masks),
+        'int_names': struct.pack(f'<{len(names)}I', *names),
+    }
+
+    position = _HEADER.size + _pad(_HEADER.size)
+    layout = []
+    for name in SECTIONS:
+        layout.extend((position, len(sections[name])))
+        position += len(sections[name]) + _pad(len(sections[name]))
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, 0, n, len(names), len(strings), *layout))
+        f.write(b'\0' * _pad(_HEADER.size))
+        for name in SECTIONS:
+            f.write(sections[name])
+            f.write(b'\0' * _pad(len(sections[name])))
+    os.replace(tmp_path, path)
+
+
+class BinaryBank:
+    """Leitor mmap de um arquivo .qbank; cada coluna é um memoryview tipado (zero-copy)"""
+
+    def __init__(self, path=BINARY_PATH):
+        self._file = open(path, 'rb')
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        header = _HEADER.unpack_from(self._mm, 0)
+        magic, version, _, self.count, self.interest_count, self.string_count = header[:6]
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f'{path} não é um arquivo .qbank versão {VERSION}')
+        view = memoryview(self._mm)
+        layout = header[6:]
+        sec = {}
+        for i, name in enumerate(SECTIONS):
+            start, size = layout[2 * i], layout[2 * i + 1]
+            sec[name] = view[start:start + size]
+        self._string_offsets = _column(sec['string_offsets'], 'Q')
+        self._string_data = sec['string_data']
+        self._question = _column(sec['question'], 'I')
+        self._options = _column(sec['options'], 'I')
+        self._tip = _column(sec['tip'], 'I')
+        self._correct = sec['correct']
+        self._flags = sec['flags']
+        self._int_offsets = _column(sec['int_offsets'], 'I')
+        self._int_ids = _column(sec['int_ids'], 'H')
+        self.masks = _column(sec['int_masks'], 'Q')
+        self.interest_names = [self.string(i) for i in _column(sec['int_names'], 'I')]
+        self._sections = sec
+
+    def string(self, sid):
+        return str(self._string_data[self._string_offsets[sid]:self._string_offsets[sid + 1]], 'utf-8')
+
+    def __len__(self):
+        return self.count
+
+    def question_text(self, ordinal):
+        if self._flags[ordinal] & FLAG_IRREGULAR:
+            # Como no QuestionBank: item que nem é um objeto não tem pergunta
+            item = json.loads(self.string(self._question[ordinal]))
+            return item.get('question', '') if isinstance(item, dict) else ''
+        return self.string(self._question[ordinal])
+
+    def interests_of(self, ordinal):
+        start, end = self._int_offsets[ordinal], self._int_offsets[ordinal + 1]
+        return [self.interest_names[i] for i in self._int_ids[start:end]]
+
+    def __getitem__(self, ordinal):
+        if ordinal < 0:
+            ordinal += self.count
+        if not 0 <= ordinal < self.count:
+            raise IndexError(ordinal)
+        flags = self._flags[ordinal]
+        if flags & FLAG_IRREGULAR:
+            return json.loads(self.string(self._question[ordinal]))
+        start = ordinal * 4
+        item = {
+            'question': self.string(self._question[ordinal]),
+            'options': [{'label': label, 'text': self.string(self._options[start + k])}
+                        for k, label in enumerate(LABELS)],
+            'correct': LABELS[self._correct[ordinal]],
+            'tip': self.string(self._tip[ordinal]),
+        }
+        if not flags & FLAG_NO_INTERESTS:
+            item['interests'] = self.interests_of(ordinal)
+        return item
+
+    def __iter__(self):
+        for ordinal in range(self.count):
+            yield self[ordinal]
+
+    def close(self):
+        # Os memoryviews precisam ser liberados antes de fechar o mmap
+        for name in ('_string_offsets', '_string_data', '_question', '_options', '_tip',
+                     '_correct', '_flags', '_int_offsets', '_int_ids', 'masks'):
+            getattr(self, name).release()
+        for view in self._sections.values():
+            view.release()
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Exporta o banco de questões no formato binário')
+    parser.add_argument('--questions', default=QUESTIONS_PATH)
+    parser.add_argument('--out', default=BINARY_PATH)
+    args = parser.parse_args(argv)
+
+    bank = load_bank(args.questions)
+    write_binary(bank, args.out)
+    json_size = os.path.getsize(args.questions)
+    binary_size = os.path.getsize(args.out)
+    print(f"✅ {len(bank)} questões gravadas em {args.out}")
+    print(f"   JSON: {json_size / 1024:.1f} KB  binário: {binary_size / 1024:.1f} KB "
+          f"({binary_size / json_size:.0%} do JSON)")
+
+
+if __name__ == '__main__':
+    main()
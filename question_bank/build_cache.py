@@ -0,0 +1,149 @@
+"""
+Cache incremental de build das questões.
+
+Cada questão declarada em um script gerador (os argumentos de create_question)
+vira uma chave: hash do conteúdo + hash do código de geração (este pacote:
+create_question e o schema do validador). Questões já vistas saem prontas do
+cache — mesma ordem de opções, mesma letra correta, validação já feita — e só
+as novas ou alteradas passam por create/validate/ID. Rodar o script de novo sem
+mudanças não grava nada; o tempo de rebuild acompanha o tamanho da mudança.
+
+O cache é um JSONL append-only em .question_cache/build.jsonl (o último
+registro de cada chave vale); é reescrito só quando entradas antigas são podadas.
+Questões que já estão no questions.json (mesmo ID de conteúdo, ainda que com
+outra ordem de opções) não são gravadas de novo.
+
+Uso em um script gerador:
+    cache = BuildCache()
+    create_question = cache.create_question
+    ...
+    store.append(cache.take_new())
+    cache.save()
+"""
+import hashlib
+import inspect
+import json
+import os
+import random
+
+from question_bank import generate, instrument, validate
+from question_bank.ids import ID_INDEX_PATH, IdIndex, question_id
+from question_bank.interests import load_interest_names
+from question_bank.store import QUESTIONS_PATH, write_atomic
+
+CACHE_PATH = '.question_cache/build.jsonl'
+
+
+def generator_hash():
+    """Hash do código que transforma a declaração em questão (muda → tudo é refeito)"""
+    source = inspect.getsource(generate.create_question) + inspect.getsource(validate.compile_schema)
+    return hashlib.sha256(source.encode('utf-8')).hexdigest()[:16]
+
+
+def content_key(version, question_text, correct_text, wrong_texts, tip, interests):
+    payload = json.dumps([version, question_text, correct_text, list(wrong_texts), tip, list(interests)],
+                         ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class BuildCache:
+    def __init__(self, path=CACHE_PATH, questions_path=QUESTIONS_PATH, id_index_path=ID_INDEX_PATH):
+        self.path = path
+        self.questions_path = questions_path
+        self.id_index_path = id_index_path
+        self._bank_ids = None
+        self.version = generator_hash()
+        self.entries = {}
+        self.touched = set()
+        self._new = []
+        self._appended = []
+        self._check = None
+        self.hits = 0
+        self.misses = 0
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        self.entries.setdefault(record['key'], {}).update(record)
+
+    def _schema(self):
+        if self._check is None:
+            self._check = validate.compile_schema(load_interest_names())
+        return self._check
+
+    def _in_bank(self, qid):
+        """Usa o índice de IDs se estiver atualizado; senão lê os IDs do banco uma vez"""
+        if self._bank_ids is None:
+            index = IdIndex(self.id_index_path, self.questions_path) if os.path.exists(self.id_index_path) else None
+            if index is not None and not index.stale:
+                self._bank_ids = index
+            else:
+                if index is not None:
+                    index.close()
+                self._bank_ids = set()
+                if os.path.exists(self.questions_path):
+                    with open(self.questions_path, 'rb') as f:
+                        self._bank_ids = {question_id(item) for item, _, _ in validate.iter_items(f)}
+        return qid in self._bank_ids
+
+    def create_question(self, question_text, correct_text, wrong_texts, tip, interests):
+        """Mesma assinatura de create_question, com resultado em cache e embaralhamento estável"""
+        key = content_key(self.version, question_text, correct_text, wrong_texts, tip, interests)
+        self.touched.add(key)
+        entry = self.entries.get(key)
+        if entry is not None and 'question' in entry:
+            self.hits += 1
+            instrument.count('build_cache.hits')
+            if not entry.get('emitted'):
+                self._new.append(key)
+            return entry['question']
+
+        self.misses += 1
+        instrument.count('build_cache.misses')
+        # Semente derivada do conteúdo: a mesma questão sempre sai com a mesma ordem de opções
+        rng = random.Random(int(key[:16], 16))
+        q = generate.create_question(question_text, correct_text, list(wrong_texts), tip, list(interests), rng)
+        qid = question_id(q)
+        entry = {'key': key, 'id': qid, 'question': q, 'errors': self._schema()(q)}
+        if self._in_bank(qid):
+            entry['emitted'] = True
+        else:
+            self._new.append(key)
+        self.entries[key] = entry
+        self._appended.append(entry)
+        return q
+
+    def errors(self):
+        """Problemas de validação das questões usadas nesta execução"""
+        return [(self.entries[k]['question']['question'], self.entries[k]['errors'])
+                for k in self.touched if self.entries[k].get('errors')]
+
+    def take_new(self):
+        """Questões ainda não gravadas no banco; marca-as como gravadas"""
+        result = []
+        for key in dict.fromkeys(self._new):
+            entry = self.entries[key]
+            if not entry.get('emitted'):
+                entry['emitted'] = True
+                self._appended.append({'key': key, 'emitted': True})
+                result.append(entry['question'])
+        self._new = []
+        return result
+
+    def save(self, prune=False):
+        """
+        Anexa as entradas novas ao cache. Com prune=True, reescreve o arquivo só com
+        as chaves usadas nesta execução (questões removidas do script somem do cache).
+        """
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        if prune and any(k not in self.touched for k in self.entries):
+            kept = [self.entries[k] for k in self.entries if k in self.touched]
+            data = ''.join(json.dumps(e, ensure_ascii=False) + '\n' for e in kept)
+            write_atomic(self.path, data.encode('utf-8'))
+            self.entries = {e['key']: e for e in kept}
+        elif self._appended:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                for record in self._appended:
+                    f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self._appended = []
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Bundles de questões por interesse + manifesto para carregamento sob demanda.
+
+Cada questão é gravada uma única vez, no shard do seu interesse principal (o
+primeiro da lista). Shards grandes são divididos em blocos de no máximo
+`--max-items` questões. O manifesto lista, para cada shard, quantidade,
+tamanho e hash do conteúdo, e para cada interesse em quais shards existem
+questões com ele — assim o cliente busca só os shards dos interesses
+escolhidos e filtra localmente, sem duplicar questões com vários interesses.
+
+Os nomes dos arquivos incluem o hash do conteúdo, então podem ser servidos
+com cache permanente; só o manifest.json muda a cada build.
+
+Uso:
+    python3 -m question_bank.bundles [--out Scam/public/question-bundles]
+"""
+import argparse
+import hashlib
+import json
+import os
+
+from question_bank import instrument
+from question_bank.store import QUESTIONS_PATH, write_atomic
+
+BUNDLES_DIR = 'Scam/public/question-bundles'
+MANIFEST_NAME = 'manifest.json'
+MAX_ITEMS = 500
+NO_INTEREST = ''
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def primary_interest(question):
+    interests = question.get('interests') or []
+    return interests[0] if interests else NO_INTEREST
+
+
+def plan_shards(questions, max_items=MAX_ITEMS):
+    """
+    Agrupa as questões pelo interesse principal (na ordem da primeira aparição)
+    e divide grupos grandes em blocos. Retorna lista de (interesse, [questões]).
+    """
+    groups = {}
+    for q in questions:
+        groups.setdefault(primary_interest(q), []).append(q)
+    shards = []
+    for interest, items in groups.items():
+        for start in range(0, len(items), max_items):
+            shards.append((interest, items[start:start + max_items]))
+    return shards
+
+
+@instrument.span('bundles.render')
+def render_bundles(questions, max_items=MAX_ITEMS):
+    """Monta os shards e o manifesto em memória; retorna (manifesto, {arquivo: bytes})"""
+    shards_meta = []
+    interests = {}
+    files = {}
+
+    for index, (interest, items) in enumerate(plan_shards(questions, max_items)):
+        data = json.dumps(items, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        digest = content_hash(data)
+        file_name = f'shard-{index:04d}.{digest[:12]}.json'
+        files[file_name] = data
+        shards_meta.append({
+            'file': file_name,
+            'interest': interest,
+            'count': len(items),
+            'bytes': len(data),
+            'sha256': digest,
+        })
+        for q in items:
+            for interest_name in q.get('interests') or ():
+                entry = interests.setdefault(interest_name, {'count': 0, 'shards': []})
+                entry['count'] += 1
+                if not entry['shards'] or entry['shards'][-1] != index:
+                    entry['shards'].append(index)
+
+    instrument.count('bundles.shards', len(shards_meta))
+    manifest = {
+        'version': 1,
+        'total': sum(s['count'] for s in shards_meta),
+        'shards': shards_meta,
+        'interests': dict(sorted(interests.items())),
+    }
+    return manifest, files
+
+
+@instrument.span('bundles')
+def build_bundles(questions, out_dir=BUNDLES_DIR, max_items=MAX_ITEMS):
+    """Grava os shards e o manifesto em `out_dir`; retorna o manifesto"""
+    os.makedirs(out_dir, exist_ok=True)
+    manifest, files = render_bundles(questions, max_items)
+    for file_name, data in files.items():
+        path = os.path.join(out_dir, file_name)
+        if not os.path.exists(path):
+            write_atomic(path, data)
+    write_atomic(os.path.join(out_dir, MANIFEST_NAME),
+                 json.dumps(manifest, ensure_ascii=False, indent=2).encode('utf-8'))
+
+    # Remove shards de builds anteriores que não são mais referenciados
+    for file_name in os.listdir(out_dir):
+        if file_name.startswith('shard-') and file_name.endswith('.json') and file_name not in files:
+            os.remove(os.path.join(out_dir, file_name))
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Gera bundles de questões por interesse')
+    parser.add_argument('--questions', default=QUESTIONS_PATH)
+    parser.add_argument('--out', default=BUNDLES_DIR)
+    parser.add_argument('--max-items', type=int, default=MAX_ITEMS,
+                        help='máximo de questões por shard')
+    args = parser.parse_args(argv)
+
+    with open(args.questions, 'r', encoding='utf-8') as f:
+        questions = json.load(f)
+    manifest = build_bundles(questions, args.out, args.max_items)
+    total_bytes = sum(s['bytes'] for s in manifest['shards'])
+    print(f"✅ {manifest['total']} questões em {len(manifest['shards'])} shards "
+          f"({total_bytes / 1024:.1f} KB) em {args.out}")
+
+
+if __name__ == '__main__':
+    main()
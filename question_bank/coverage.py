@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Planejador de cobertura de interesses.
+
+Monta a matriz de incidência questão × interesse (NumPy) a partir do
+questions.json e da lista canônica de interesses, calcula quantas questões
+faltam para cada interesse atingir a meta e sugere combinações de tags
+(set cover guloso) que fecham todos os déficits com o mínimo de questões novas.
+
+Uso:
+    python3 -m question_bank.coverage --target 10 [--tags 3]
+"""
+import argparse
+from collections import Counter
+
+import numpy as np
+
+from question_bank.bank import QuestionBank, load_bank
+from question_bank.interests import INTERESTS_PATH, load_interest_names
+from question_bank.store import QUESTIONS_PATH
+
+DEFAULT_TARGET = 10
+TAGS_PER_QUESTION = 3
+
+
+def incidence_matrix(questions, interest_names):
+    """
+    Matriz booleana (questões × interesses) e contagem de tags fora da lista canônica.
+    As coordenadas são acumuladas em arrays planos e a matriz é preenchida de uma vez.
+    """
+    if isinstance(questions, QuestionBank):
+        return _bank_incidence_matrix(questions, interest_names)
+    column = {name: i for i, name in enumerate(interest_names)}
+    rows = []
+    cols = []
+    unknown = Counter()
+    n = 0
+    for n, q in enumerate(questions, 1):
+        for interest in q.get('interests') or ():
+            c = column.get(interest)
+            if c is None:
+                unknown[interest] += 1
+            else:
+                rows.append(n - 1)
+                cols.append(c)
+    matrix = np.zeros((n, len(interest_names)), dtype=bool)
+    matrix[np.array(rows, dtype=np.int64), np.array(cols, dtype=np.int64)] = True
+    return matrix, unknown
+
+
+def _bank_incidence_matrix(bank, interest_names):
+    """Mesmo resultado de incidence_matrix, direto das colunas do QuestionBank"""
+    column = {name: i for i, name in enumerate(interest_names)}
+    # id do interesse no banco → coluna canônica (-1 se não estiver em interests.ts)
+    lookup = np.array([column.get(name, -1) for name in bank.interest_names] or [-1], dtype=np.int64)
+    ids = np.frombuffer(bank.interest_ids, dtype=np.uint16).astype(np.int64)
+    offsets = np.frombuffer(bank.interest_offsets, dtype=np.uint32)
+    rows = np.repeat(np.arange(len(bank), dtype=np.int64), np.diff(offsets))
+    cols = lookup[ids]
+
+    matrix = np.zeros((len(bank), len(interest_names)), dtype=bool)
+    known = cols >= 0
+    matrix[rows[known], cols[known]] = True
+
+    unknown = Counter()
+    per_id = np.bincount(ids[~known], minlength=len(bank.interest_names))
+    for i in np.flatnonzero(per_id):
+        unknown[bank.interest_names[i]] = int(per_id[i])
+    return matrix, unknown
+
+
+def interest_counts(questions, interest_names=None):
+    """Número de questões por interesse (dicionário nome → contagem)"""
+    if interest_names is None:
+        interest_names = load_interest_names()
+    matrix, _ = incidence_matrix(questions, interest_names)
+    return dict(zip(interest_names, matrix.sum(axis=0).tolist()))
+
+
+def deficits(matrix, target):
+    """Quantas questões faltam para cada interesse atingir `target`"""
+    counts = matrix.sum(axis=0, dtype=np.int64)
+    return np.maximum(target - counts, 0)
+
+
+def cooccurrence_matrix(matrix, chunk_rows=1 << 16):
+    """Quantas questões têm cada par de interesses juntos (M^T M, em blocos para limitar memória)"""
+    result = np.zeros((matrix.shape[1], matrix.shape[1]), dtype=np.int64)
+    for start in range(0, matrix.shape[0], chunk_rows):
+        block = matrix[start:start + chunk_rows].astype(np.float32)
+        result += (block.T @ block).astype(np.int64)
+    return result
+
+
+def plan_new_questions(deficit, cooccurrence, tags_per_question=TAGS_PER_QUESTION):
+    """
+    Set cover guloso: cada questão nova leva as `tags_per_question` tags com maior
+    déficit restante (empates resolvidos pela co-ocorrência com as tags já escolhidas).
+    Uma mesma combinação é repetida enquanto a ordem dos déficits não muda.
+    Retorna Counter {tupla de índices de interesse: quantidade de questões}.
+    """
+    remaining = deficit.astype(np.int64).copy()
+    plan = Counter()
+    # Afinidade normalizada para [0, 1) — só serve como desempate
+    affinity = cooccurrence.astype(np.float64)
+    if affinity.max() > 0:
+        affinity = affinity / (affinity.max() + 1)
+
+    while remaining.any():
+        chosen = [int(np.argmax(remaining))]
+        for _ in range(tags_per_question - 1):
+            score = remaining + affinity[chosen].sum(axis=0) / len(chosen)
+            score[chosen] = -1
+            score[remaining <= 0] = -1
+            best = int(np.argmax(score))
+            if score[best] < 0:
+                break
+            chosen.append(best)
+
+        others = np.delete(remaining, chosen)
+        repeat = int(remaining[chosen].min()) - (int(others.max()) if others.size else 0)
+        repeat = max(repeat, 1)
+        remaining[chosen] -= repeat
+        np.maximum(remaining, 0, out=remaining)
+        plan[tuple(sorted(chosen))] += repeat
+    return plan
+
+
+def lower_bound(deficit, tags_per_question=TAGS_PER_QUESTION):
+    """Nenhum plano usa menos questões que isto"""
+    if not deficit.any():
+        return 0
+    return int(max(deficit.max(), -(-int(deficit.sum()) // tags_per_question)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Planejador de cobertura de interesses')
+    parser.add_argument('--questions', default=QUESTIONS_PATH)
+    parser.add_argument('--interests', default=INTERESTS_PATH)
+    parser.add_argument('--target', type=int, default=DEFAULT_TARGET,
+                        help='mínimo de questões por interesse')
+    parser.add_argument('--tags', type=int, default=TAGS_PER_QUESTION,
+                        help='quantidade de interesses por questão nova')
+    args = parser.parse_args(argv)
+
+    names = load_interest_names(args.interests)
+    matrix, unknown = incidence_matrix(load_bank(args.questions), names)
+    counts = matrix.sum(axis=0, dtype=np.int64)
+    deficit = deficits(matrix, args.target)
+
+    print(f"Questões: {matrix.shape[0]}  Interesses: {len(names)}  Meta: {args.target}\n")
+    for i in np.argsort(-deficit, kind='stable'):
+        if deficit[i]:
+            print(f"  {names[i]}: {counts[i]} questões (faltam {deficit[i]})")
+    for interest, count in unknown.most_common():
+        print(f"⚠️  Interesse fora de interests.ts: {interest!r} ({count} questões)")
+
+    if not deficit.any():
+        print("✅ Todos os interesses atingiram a meta")
+        return
+
+    plan = plan_new_questions(deficit, cooccurrence_matrix(matrix), args.tags)
+    total = sum(plan.values())
+    print(f"\nSugestão: {total} questões novas (mínimo teórico: {lower_bound(deficit, args.tags)})")
+    for combo, count in plan.most_common():
+        print(f"  {count}x {[names[i] for i in combo]}")
+
+
+if __name__ == '__main__':
+    main()
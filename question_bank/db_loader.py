@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Carga do banco de questões no PostgreSQL da API (projeto3aapi).
+
+O questions.json é lido em streaming e enviado com COPY para uma tabela de
+staging temporária; depois, dentro da mesma transação, alguns comandos SQL
+fazem a carga de uma vez só:
+
+    questions           uma linha por questão, chave = ID de conteúdo (question_bank.ids)
+    question_options    opções de cada questão, na ordem
+    question_interests  interesses de cada questão, na ordem
+
+O upsert é por ID de conteúdo: recarregar o mesmo banco não duplica nada e só
+atualiza as questões que mudaram (dica, ordem das opções, interesses, posição).
+Um hash das opções e dos interesses (`links_hash`) fica em `questions`; as
+linhas de question_options e question_interests só são apagadas e inseridas
+de novo para as questões em que esse hash mudou.
+Com --prune, questões que saíram do questions.json são apagadas.
+
+Para testar sem um servidor PostgreSQL, --sqlite carrega as mesmas tabelas em
+um arquivo SQLite (o staging usa executemany em vez de COPY).
+
+Uso:
+    python3 -m question_bank.db_loader [--dsn "dbname=projeto3aapi user=postgres host=localhost"] [--prune]
+    python3 -m question_bank.db_loader --sqlite /tmp/questions.db
+"""
+import argparse
+import csv
+import hashlib
+import io
+import json
+import sqlite3
+import time
+
+from question_bank import instrument
+from question_bank.ids import question_id
+from question_bank.store import QUESTIONS_PATH
+from question_bank.validate import iter_items
+
+# Mesmo banco de application.properties (a senha vem de PGPASSWORD ou ~/.pgpass)
+DEFAULT_DSN = 'dbname=projeto3aapi user=postgres host=localhost port=5432'
+COPY_CHUNK = 1024 * 1024
+
+SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS questions (
+        content_hash VARCHAR(16) PRIMARY KEY,
+        position INTEGER NOT NULL,
+        question TEXT NOT NULL,
+        correct VARCHAR(1) NOT NULL,
+        tip TEXT NOT NULL,
+        links_hash VARCHAR(16)
+    )""",
+    """CREATE TABLE IF NOT EXISTS question_options (
+        question_hash VARCHAR(16) NOT NULL REFERENCES questions (content_hash) ON DELETE CASCADE,
+        position SMALLINT NOT NULL,
+        label VARCHAR(1) NOT NULL,
+        text TEXT NOT NULL,
+        PRIMARY KEY (question_hash, position)
+    )""",
+    """CREATE TABLE IF NOT EXISTS question_interests (
+        question_hash VARCHAR(16) NOT NULL REFERENCES questions (content_hash) ON DELETE CASCADE,
+        position SMALLINT NOT NULL,
+        interest TEXT NOT NULL,
+        PRIMARY KEY (question_hash, position)
+    )""",
+    "CREATE INDEX IF NOT EXISTS question_interests_interest ON question_interests (interest)",
+)
+
+# Primeira ocorrência de cada ID (o banco pode ter a mesma questão repetida)
+FIRST_ROWS = """CREATE TEMP TABLE first_rows AS
+    SELECT MIN(position) AS position FROM questions_staging GROUP BY content_hash"""
+
+# Questões novas ou com opções/interesses diferentes do que está gravado (antes do upsert)
+CHANGED_LINKS = """CREATE TEMP TABLE changed_links AS
+    SELECT s.content_hash, s.position
+    FROM questions_staging s JOIN first_rows f ON f.position = s.position
+    LEFT JOIN questions q ON q.content_hash = s.content_hash
+    WHERE q.links_hash IS NULL OR q.links_hash <> s.links_hash"""
+
+UPSERT_QUESTIONS = """INSERT INTO questions (content_hash, position, question, correct, tip, links_hash)
+    SELECT s.content_hash, s.position, s.question, s.correct, s.tip, s.links_hash
+    FROM questions_staging s JOIN first_rows f ON f.position = s.position
+    WHERE true
+    ON CONFLICT (content_hash) DO UPDATE SET
+        position = excluded.position, question = excluded.question,
+        correct = excluded.correct, tip = excluded.tip, links_hash = excluded.links_hash
+    WHERE questions.position <> excluded.position OR questions.question <> excluded.question
+       OR questions.correct <> excluded.correct OR questions.tip <> excluded.tip
+       OR questions.links_hash IS NULL OR questions.links_hash <> excluded.links_hash"""
+
+DELETE_CHILDREN = "DELETE FROM {table} WHERE question_hash IN (SELECT content_hash FROM changed_links)"
+
+PRUNE = (
+    "DELETE FROM question_options WHERE question_hash NOT IN (SELECT content_hash FROM questions_staging)",
+    "DELETE FROM question_interests WHERE question_hash NOT IN (SELECT content_hash FROM questions_staging)",
+    "DELETE FROM questions WHERE content_hash NOT IN (SELECT content_hash FROM questions_staging)",
+)
+
+
+class PostgresDialect:
+    staging = """CREATE TEMP TABLE questions_staging (
+        content_hash VARCHAR(16) NOT NULL, position INTEGER NOT NULL, question TEXT NOT NULL,
+        correct VARCHAR(1) NOT NULL, tip TEXT NOT NULL, options JSONB NOT NULL, interests JSONB NOT NULL,
+        links_hash VARCHAR(16) NOT NULL
+    )"""
+    # Tabelas criadas antes da coluna links_hash
+    add_links_hash = 'ALTER TABLE questions ADD COLUMN IF NOT EXISTS links_hash VARCHAR(16)'
+    insert_options = """INSERT INTO question_options (question_hash, position, label, text)
+        SELECT s.content_hash, o.ord - 1, o.elem->>'label', o.elem->>'text'
+        FROM questions_staging s JOIN changed_links c ON c.position = s.position
+        CROSS JOIN LATERAL jsonb_array_elements(s.options) WITH ORDINALITY AS o (elem, ord)"""
+    insert_interests = """INSERT INTO question_interests (question_hash, position, interest)
+        SELECT s.content_hash, i.ord - 1, i.interest
+        FROM questions_staging s JOIN changed_links c ON c.position = s.position
+        CROSS JOIN LATERAL jsonb_array_elements_text(s.interests) WITH ORDINALITY AS i (interest, ord)"""
+
+    @classmethod
+    def migrate(cls, cursor):
+        cursor.execute(cls.add_links_hash)
+
+    @staticmethod
+    def load_staging(cursor, rows):
+        cursor.copy_expert('COPY questions_staging FROM STDIN WITH (FORMAT csv)', CsvStream(rows))
+
+    @staticmethod
+    def analyze(cursor):
+        cursor.execute('ANALYZE questions_staging')
+
+
+class SqliteDialect:
+    staging = """CREATE TEMP TABLE questions_staging (
+        content_hash TEXT NOT NULL, position INTEGER NOT NULL, question TEXT NOT NULL,
+        correct TEXT NOT NULL, tip TEXT NOT NULL, options TEXT NOT NULL, interests TEXT NOT NULL,
+        links_hash TEXT NOT NULL
+    )"""
+    insert_options = """INSERT INTO question_options (question_hash, position, label, text)
+        SELECT s.content_hash, o.key, json_extract(o.value, '$.label'), json_extract(o.value, '$.text')
+        FROM questions_staging s JOIN changed_links c ON c.position = s.position, json_each(s.options) o"""
+    insert_interests = """INSERT INTO question_interests (question_hash, position, interest)
+        SELECT s.content_hash, i.key, i.value
+        FROM questions_staging s JOIN changed_links c ON c.position = s.position, json_each(s.interests) i"""
+
+    @staticmethod
+    def migrate(cursor):
+        # SQLite não tem ADD COLUMN IF NOT EXISTS
+        columns = [row[1] for row in cursor.execute('PRAGMA table_info(questions)')]
+        if 'links_hash' not in columns:
+            cursor.execute('ALTER TABLE questions ADD COLUMN links_hash TEXT')
+
+    @staticmethod
+    def load_staging(cursor, rows):
+        cursor.executemany('INSERT INTO questions_staging VALUES (?, ?, ?, ?, ?, ?, ?, ?)', rows)
+
+    @staticmethod
+    def analyze(cursor):
+        cursor.execute('CREATE INDEX temp.questions_staging_position ON questions_staging (position)')
+
+
+class CsvStream:
+    """Arquivo só de leitura que gera o CSV do COPY sob demanda (sem montar tudo em memória)"""
+
+    def __init__(self, rows):
+        self.rows = iter(rows)
+        self.buffer = io.StringIO()
+        # Tudo entre aspas: no COPY em CSV um campo vazio sem aspas vira NULL
+        self.writer = csv.writer(self.buffer, lineterminator='\n', quoting=csv.QUOTE_ALL)
+        self.pending = ''
+
+    def read(self, size=COPY_CHUNK):
+        if size is None or size < 0:
+            size = COPY_CHUNK
+        while len(self.pending) < size:
+            self.buffer.seek(0)
+            self.buffer.truncate()
+            for row in self.rows:
+                self.writer.writerow(row)
+                if self.buffer.tell() >= COPY_CHUNK:
+                    break
+            chunk = self.buffer.getvalue()
+            if not chunk:
+                break
+            self.pending += chunk
+        data, self.pending = self.pending[:size], self.pending[size:]
+        return data
+
+
+def staging_rows(questions_path, stats):
+    """Linhas do staging, lidas em streaming do questions.json"""
+    with open(questions_path, 'rb') as f:
+        for position, (item, _, _) in enumerate(iter_items(f)):
+            stats['staged'] += 1
+            options = json.dumps([{'label': o.get('label', ''), 'text': o.get('text', '')}
+                                  for o in item.get('options') or ()], ensure_ascii=False)
+            interests = json.dumps(item.get('interests') or [], ensure_ascii=False)
+            links_hash = hashlib.blake2b(f'{options}\x1e{interests}'.encode('utf-8'), digest_size=8).hexdigest()
+            yield (
+                question_id(item),
+                position,
+                item.get('question', ''),
+                item.get('correct', ''),
+                item.get('tip', ''),
+                options,
+                interests,
+                links_hash,
+            )
+
+
+def load(connection, dialect, questions_path=QUESTIONS_PATH, prune=False):
+    """Carrega o questions.json em uma transação; retorna contagens da carga"""
+    stats = {'staged': 0}
+    cursor = connection.cursor()
+    try:
+        for statement in SCHEMA:
+            cursor.execute(statement)
+        dialect.migrate(cursor)
+        cursor.execute(dialect.staging)
+        with instrument.span('db.staging'):
+            dialect.load_staging(cursor, staging_rows(questions_path, stats))
+        with instrument.span('db.upsert'):
+            dialect.analyze(cursor)
+            cursor.execute(FIRST_ROWS)
+            cursor.execute(CHANGED_LINKS)
+            cursor.execute('SELECT COUNT(*) FROM changed_links')
+            stats['links'] = cursor.fetchone()[0]
+            cursor.execute(UPSERT_QUESTIONS)
+            stats['changed'] = cursor.rowcount
+            for table in ('question_options', 'question_interests'):
+                cursor.execute(DELETE_CHILDREN.format(table=table))
+            cursor.execute(dialect.insert_options)
+            cursor.execute(dialect.insert_interests)
+            if prune:
+                cursor.execute(PRUNE[0])
+                cursor.execute(PRUNE[1])
+                cursor.execute(PRUNE[2])
+                stats['pruned'] = cursor.rowcount
+            cursor.execute('DROP TABLE changed_links')
+            cursor.execute('DROP TABLE first_rows')
+            cursor.execute('DROP TABLE questions_staging')
+        cursor.execute('SELECT COUNT(*) FROM questions')
+        stats['total'] = cursor.fetchone()[0]
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+    instrument.count('db.staged', stats['staged'])
+    return stats
+
+
+def connect_postgres(dsn):
+    try:
+        import psycopg2
+    except ImportError:
+        raise SystemExit("⚠️  psycopg2 não está instalado: pip install psycopg2-binary")
+    return psycopg2.connect(dsn)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Carrega o banco de questões no PostgreSQL')
+    parser.add_argument('--questions', default=QUESTIONS_PATH)
+    parser.add_argument('--dsn', default=DEFAULT_DSN, help='conexão libpq do PostgreSQL')
+    parser.add_argument('--sqlite', help='carrega em um arquivo SQLite em vez do PostgreSQL')
+    parser.add_argument('--prune', action='store_true', help='apaga questões que não estão mais no JSON')
+    args = parser.parse_args(argv)
+
+    if args.sqlite:
+        connection, dialect = sqlite3.connect(args.sqlite), SqliteDialect
+    else:
+        connection, dialect = connect_postgres(args.dsn), PostgresDialect
+    start = time.perf_counter()
+    try:
+        stats = load(connection, dialect, args.questions, args.prune)
+    finally:
+        connection.close()
+    elapsed = time.perf_counter() - start
+    print(f"✅ {stats['staged']} questões enviadas, {stats['changed']} inseridas ou alteradas, "
+          f"{stats['total']} na tabela ({elapsed:.2f}s)")
+    print(f"   opções e interesses regravados em {stats['links']} questões")
+    if args.prune:
+        print(f"   {stats['pruned']} questões removidas")
+
+
+if __name__ == '__main__':
+    main()
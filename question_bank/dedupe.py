@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Detecção de questões quase duplicadas com MinHash + LSH.
+
+O texto é normalizado (acentos, caixa, pontuação), a pergunta e as opções
+viram shingles de palavras e cada questão recebe uma assinatura MinHash.
+O LSH agrupa assinaturas parecidas em buckets, então só pares candidatos são
+comparados — nada de comparar todas as questões entre si.
+
+A compactação (python3 -m question_bank.store compact) usa este módulo para
+descartar questões pendentes que já existem no banco.
+
+Uso:
+    python3 -m question_bank.dedupe [--threshold 0.8]
+"""
+import argparse
+import json
+import re
+import unicodedata
+import zlib
+
+import numpy as np
+
+from question_bank import instrument
+from question_bank.store import QuestionStore, QUESTIONS_PATH, SEGMENTS_DIR
+
+NUM_PERM = 128
+SHINGLE_SIZE = 3
+DEFAULT_THRESHOLD = 0.8
+
+_SHIFT = np.uint64(32)
+
+_PUNCTUATION = re.compile(r'[^a-z0-9\n]+')
+
+
+def normalize_text(text):
+    """Remove acentos, pontuação e diferenças de caixa (quebras de linha são mantidas)"""
+    text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii')
+    return _PUNCTUATION.sub(' ', text.lower()).strip()
+
+
+def shingles(question, size=SHINGLE_SIZE):
+    """Conjunto de n-gramas de palavras da pergunta e das opções (a ordem das opções não importa)"""
+    parts = [question.get('question', '')]
+    parts.extend(sorted(o.get('text', '') for o in question.get('options', [])))
+    result = set()
+    # Normaliza tudo de uma vez; cada parte fica em uma linha
+    for line in normalize_text('\n'.join(p.replace('\n', ' ') for p in parts)).split('\n'):
+        words = line.split()
+        if len(words) < size:
+            if words:
+                result.add(' '.join(words))
+            continue
+        for i in range(len(words) - size + 1):
+            result.add(' '.join(words[i:i + size]))
+    return result
+
+
+def _hash_shingle(shingle):
+    return zlib.crc32(shingle.encode('utf-8'))
+
+
+class MinHasher:
+    """
+    Calcula assinaturas MinHash em lote com NumPy.
+    Cada permutação é um hash multiply-shift: ((a * x + b) mod 2^64) >> 32, com `a` ímpar.
+    """
+
+    def __init__(self, num_perm=NUM_PERM, seed=1):
+        self.num_perm = num_perm
+        rng = np.random.RandomState(seed)
+        self.a = rng.randint(1, np.iinfo(np.int64).max, size=num_perm, dtype=np.int64).astype(np.uint64) | np.uint64(1)
+        self.b = rng.randint(0, np.iinfo(np.int64).max, size=num_perm, dtype=np.int64).astype(np.uint64)
+
+    def signatures(self, shingle_sets):
+        """Uma linha (num_perm,) de uint32 por conjunto de shingles"""
+        lengths = []
+        hashes = []
+        for s in shingle_sets:
+            # Conjuntos vazios recebem um shingle sentinela para não quebrar o reduceat
+            items = s or ('',)
+            lengths.append(len(items))
+            hashes.extend(_hash_shingle(x) for x in items)
+        if not lengths:
+            return np.empty((0, self.num_perm), dtype=np.uint32)
+
+        h = np.array(hashes, dtype=np.uint64)
+        permuted = h[:, None] * self.a[None, :]
+        permuted += self.b
+        permuted >>= _SHIFT
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        return np.minimum.reduceat(permuted, starts, axis=0).astype(np.uint32)
+
+
+def optimal_bands(threshold, num_perm):
+    """Escolhe (bandas, linhas) cujo limiar do LSH, (1/b)^(1/r), fica mais perto do desejado"""
+    best = None
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        error = abs((1.0 / bands) ** (1.0 / rows) - threshold)
+        if best is None or error < best[0]:
+            best = (error, bands, rows)
+    return best[1], best[2]
+
+
+class LSHIndex:
+    """Buckets por banda da assinatura; chaves com alguma banda igual viram candidatas"""
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD, num_perm=NUM_PERM, seed=2):
+        self.bands, self.rows = optimal_bands(threshold, num_perm)
+        self.buckets = [{} for _ in range(self.bands)]
+        # Multiplicadores para resumir cada banda em um único inteiro de 64 bits
+        rng = np.random.RandomState(seed)
+        self._mix = rng.randint(1, np.iinfo(np.int64).max, size=self.rows, dtype=np.int64).astype(np.uint64) | np.uint64(1)
+
+    def band_hashes(self, signatures):
+        """Matriz (n, bandas) de hashes de banda, calculada de uma vez para o lote"""
+        sigs = np.asarray(signatures, dtype=np.uint64).reshape(-1, self.bands, self.rows)
+        with np.errstate(over='ignore'):
+            return (sigs * self._mix).sum(axis=2).tolist()
+
+    def insert(self, key, bands):
+        for bucket, band in zip(self.buckets, bands):
+            bucket.setdefault(band, []).append(key)
+
+    def query(self, bands):
+        candidates = set()
+        for bucket, band in zip(self.buckets, bands):
+            found = bucket.get(band)
+            if found:
+                candidates.update(found)
+        return candidates
+
+
+class Deduplicator:
+    """
+    Mantém as assinaturas vistas até agora e descarta questões quase iguais.
+    As primeiras questões vistas (ex.: o banco existente) têm prioridade.
+    """
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD, num_perm=NUM_PERM, batch_size=2048):
+        self.threshold = threshold
+        self.hasher = MinHasher(num_perm)
+        self.index = LSHIndex(threshold, num_perm)
+        self.batch_size = batch_size
+        self.signatures = []
+        self.texts = []
+        self.parent = []
+        self.dropped = []
+
+    def _find(self, i):
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    @instrument.span('dedupe.batch')
+    def _process(self, batch):
+        """Retorna, para cada questão do lote, o índice da questão de que é duplicata (ou None)"""
+        sigs = self.hasher.signatures([shingles(q) for q in batch])
+        band_rows = self.index.band_hashes(sigs)
+        result = []
+        for q, sig, bands in zip(batch, sigs, band_rows):
+            key = len(self.signatures)
+            match = None
+            candidates = self.index.query(bands)
+            if candidates:
+                candidates = list(candidates)
+                similarity = np.count_nonzero(np.stack([self.signatures[c] for c in candidates]) == sig, axis=1) / len(sig)
+                best = int(np.argmax(similarity))
+                if similarity[best] >= self.threshold:
+                    match = candidates[best]
+            self.signatures.append(sig)
+            self.texts.append(q.get('question', ''))
+            self.parent.append(key if match is None else self._find(match))
+            self.index.insert(key, bands)
+            result.append(match)
+        return result
+
+    def _batches(self, questions):
+        batch = []
+        for q in questions:
+            batch.append(q)
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def add_existing(self, questions):
+        """Registra questões que já estão no banco (nunca são descartadas)"""
+        for batch in self._batches(questions):
+            self._process(batch)
+
+    def filter(self, questions):
+        """Gera só as questões que não são quase duplicatas de algo já visto"""
+        for batch in self._batches(questions):
+            instrument.count('dedupe.in', len(batch))
+            for q, match in zip(batch, self._process(batch)):
+                if match is None:
+                    yield q
+                else:
+                    instrument.count('dedupe.dropped')
+                    self.dropped.append((q.get('question', ''), self.texts[match]))
+
+    def clusters(self):
+        """Grupos (com 2 ou mais questões) de índices considerados duplicados"""
+        groups = {}
+        for i in range(len(self.parent)):
+            groups.setdefault(self._find(i), []).append(i)
+        return [g for g in groups.values() if len(g) > 1]
+
+
+def find_duplicates(questions, threshold=DEFAULT_THRESHOLD):
+    """Agrupa questões quase duplicadas; retorna listas de índices"""
+    dedup = Deduplicator(threshold)
+    dedup.add_existing(questions)
+    return dedup.clusters()
+
+
+def dedupe_transform(existing_questions, threshold=DEFAULT_THRESHOLD):
+    """Transform para QuestionStore.compact: descarta pendentes que já existem no banco"""
+    dedup = Deduplicator(threshold)
+    dedup.add_existing(existing_questions)
+
+    def transform(pending):
+        yield from dedup.filter(pending)
+        for text, original in dedup.dropped:
+            print(f"⚠️  Duplicata descartada: {text!r} ~ {original!r}")
+
+    return transform
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Detecção de questões quase duplicadas')
+    parser.add_argument('--questions', default=QUESTIONS_PATH)
+    parser.add_argument('--segments', default=SEGMENTS_DIR)
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    store = QuestionStore(args.questions, args.segments)
+    with open(args.questions, 'r', encoding='utf-8') as f:
+        existing = json.load(f)
+
+    # Lista grupos de duplicatas no banco e nos segmentos pendentes
+    questions = existing + list(store.iter_pending())
+    clusters = find_duplicates(questions, args.threshold)
+    for cluster in clusters:
+        print(f"\nGrupo com {len(cluster)} questões:")
+        for i in cluster:
+            origin = 'banco' if i < len(existing) else 'pendente'
+            print(f"  [{origin} #{i}] {questions[i]['question']}")
+    print(f"\nTotal de grupos: {len(clusters)}")
+
+if __name__ == '__main__':
+    main()
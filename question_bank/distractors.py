@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Qualidade dos distratores: opções erradas que entregam a resposta.
+
+Todas as opções do banco viram uma única matriz esparsa TF-IDF (uma linha por
+opção, mesmos termos da busca: acentos, stopwords e stem leve), lida em uma
+passada pelo questions.json em streaming. As métricas saem de operações sobre
+a matriz e arrays N × 4, sem laço por questão:
+
+    similaridade  cosseno entre cada distrator e a opção correta; um distrator
+                  quase igual à correta deixa a questão ambígua
+    tamanho       comprimento da correta ÷ maior distrator; a correta bem mais
+                  longa (e mais específica) que todas as outras é uma pista
+    reuso         em quantas questões o mesmo distrator (texto normalizado)
+                  aparece; distratores genéricos como "Garantia do fabricante"
+                  repetidos no banco todo são fáceis de descartar
+
+Só questões bem formadas (4 opções A–D e `correct` válido) entram na análise;
+as demais são contadas e ficam para o question_bank.validate.
+
+Uso:
+    python3 -m question_bank.distractors [--show 20] [--out /tmp/distratores.json]
+"""
+import argparse
+import json
+import time
+from array import array
+
+import numpy as np
+from scipy import sparse
+
+from question_bank import instrument
+from question_bank.dedupe import normalize_text
+from question_bank.ids import question_id
+from question_bank.search import tokenize
+from question_bank.store import QUESTIONS_PATH, write_atomic
+from question_bank.validate import LABELS, iter_items
+
+MAX_SIMILARITY = 0.8
+LENGTH_RATIO = 1.5
+MAX_REUSE = 10
+
+
+class Options:
+    """Opções das questões bem formadas, em colunas: linha 4·i + k = opção k da questão i"""
+
+    def __init__(self):
+        self.vocabulary = {}
+        self.texts = {}                # texto normalizado → código
+        self.indices = array('I')      # termos de cada opção (com repetição)
+        self.indptr = array('Q', [0])
+        self.lengths = array('I')      # caracteres de cada opção
+        self.text_codes = array('I')
+        self.correct = array('B')
+        self.ordinals = array('I')     # ordinal no questions.json
+        self.skipped = 0
+
+    def add(self, item, ordinal):
+        options = item.get('options') if isinstance(item, dict) else None
+        if (not isinstance(options, list) or len(options) != len(LABELS)
+                or item.get('correct') not in LABELS
+                or any(not isinstance(o, dict) or not isinstance(o.get('text'), str) for o in options)):
+            self.skipped += 1
+            return
+        vocabulary = self.vocabulary
+        for option in options:
+            text = option['text']
+            for term in tokenize(text):
+                tid = vocabulary.get(term)
+                if tid is None:
+                    tid = vocabulary[term] = len(vocabulary)
+                self.indices.append(tid)
+            self.indptr.append(len(self.indices))
+            self.lengths.append(len(text.strip()))
+            self.text_codes.append(self.texts.setdefault(normalize_text(text), len(self.texts)))
+        self.correct.append(LABELS.index(item['correct']))
+        self.ordinals.append(ordinal)
+
+    def __len__(self):
+        return len(self.correct)
+
+    def tfidf(self):
+        """Matriz CSR (opções × termos) TF-IDF com linhas de norma 1"""
+        indices = np.frombuffer(self.indices, dtype=np.uint32).astype(np.int32)
+        indptr = np.frombuffer(self.indptr, dtype=np.uint64).astype(np.int64)
+        shape = (len(indptr) - 1, len(self.vocabulary))
+        matrix = sparse.csr_matrix((np.ones(len(indices), dtype=np.float32), indices, indptr), shape=shape)
+        matrix.sum_duplicates()
+        df = np.bincount(matrix.indices, minlength=shape[1])
+        idf = np.log((1 + shape[0]) / (1 + df)).astype(np.float32) + 1
+        matrix.data *= idf[matrix.indices]
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        norms[norms == 0] = 1
+        matrix.data /= np.repeat(norms, np.diff(matrix.indptr)).astype(np.float32)
+        return matrix
+
+
+def load_options(questions_path=QUESTIONS_PATH):
+    options = Options()
+    with instrument.span('distractors.load'):
+        with open(questions_path, 'rb') as f:
+            for ordinal, (item, _, _) in enumerate(iter_items(f)):
+                options.add(item, ordinal)
+    return options
+
+
+def analyze(options, max_similarity=MAX_SIMILARITY, length_ratio=LENGTH_RATIO, max_reuse=MAX_REUSE):
+    """
+    Métricas N × 4 e flags por questão. Retorna dict de arrays: similarity
+    (distrator × correta; NaN na própria correta), length_ratio, reuse (maior
+    reuso entre os distratores) e as máscaras de cada flag.
+    """
+    n = len(options)
+    k = len(LABELS)
+    rows = np.arange(n)
+    correct = np.frombuffer(options.correct, dtype=np.uint8).astype(np.int64)
+    with instrument.span('distractors.score'):
+        matrix = options.tfidf()
+        correct_rows = matrix[rows * k + correct]
+        similarity = np.empty((n, k))
+        for column in range(k):
+            # Produto escalar linha a linha de duas matrizes do mesmo formato
+            similarity[:, column] = np.asarray(matrix[column::k].multiply(correct_rows).sum(axis=1)).ravel()
+        is_correct = np.zeros((n, k), dtype=bool)
+        is_correct[rows, correct] = True
+        similarity[is_correct] = np.nan
+
+        lengths = np.frombuffer(options.lengths, dtype=np.uint32).reshape(n, k).astype(np.float64)
+        longest_wrong = np.where(is_correct, 0, lengths).max(axis=1)
+        ratio = lengths[rows, correct] / np.maximum(longest_wrong, 1)
+
+        codes = np.frombuffer(options.text_codes, dtype=np.uint32).reshape(n, k)
+        uses = np.bincount(codes[~is_correct], minlength=len(options.texts))
+        reuse = np.where(is_correct, 0, uses[codes]).max(axis=1)
+
+    flags = {
+        'similar': np.nanmax(similarity, axis=1) >= max_similarity,
+        'length': ratio >= length_ratio,
+        'reused': reuse >= max_reuse,
+    }
+    instrument.count('distractors.items', n)
+    return {'similarity': similarity, 'length_ratio': ratio, 'reuse': reuse,
+            'correct_longest': lengths[rows, correct] > longest_wrong, 'flags': flags}
+
+
+def _collect(questions_path, ordinals, func):
+    """{ordinal: func(questão)} para os ordinais pedidos, em uma passada (para no último)"""
+    wanted = set(ordinals)
+    found = {}
+    with open(questions_path, 'rb') as f:
+        for ordinal, (item, _, _) in enumerate(iter_items(f)):
+            if ordinal in wanted:
+                found[ordinal] = func(item)
+                if len(found) == len(wanted):
+                    break
+    return found
+
+
+def weak_items(result):
+    """Posições (em `options`) das questões com alguma flag, das mais suspeitas para as menos"""
+    flags = result['flags']
+    count = sum(mask.astype(np.int64) for mask in flags.values())
+    weak = np.flatnonzero(count)
+    # Mais flags primeiro; empate pela vantagem de tamanho da correta
+    order = np.lexsort((-result['length_ratio'][weak], -count[weak]))
+    return weak[order]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Aponta questões com distratores fracos')
+    parser.add_argument('--questions', default=QUESTIONS_PATH)
+    parser.add_argument('--max-similarity', type=float, default=MAX_SIMILARITY,
+                        help='cosseno distrator × correta a partir do qual a questão é ambígua')
+    parser.add_argument('--length-ratio', type=float, default=LENGTH_RATIO,
+                        help='correta ÷ maior distrator a partir do qual o tamanho entrega a resposta')
+    parser.add_argument('--max-reuse', type=int, default=MAX_REUSE,
+                        help='usos de um mesmo distrator a partir dos quais ele é genérico')
+    parser.add_argument('--show', type=int, default=20, help='questões suspeitas mostradas')
+    parser.add_argument('--out', help='grava o relatório completo em JSON')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    options = load_options(args.questions)
+    if not len(options):
+        print("⚠️  Nenhuma questão bem formada encontrada")
+        return
+    result = analyze(options, args.max_similarity, args.length_ratio, args.max_reuse)
+    weak = weak_items(result)
+    elapsed = time.perf_counter() - start
+
+    n = len(options)
+    flags = result['flags']
+    print(f"✅ {n} questões analisadas em {elapsed:.2f}s ({len(options.vocabulary)} termos, "
+          f"{len(options.texts)} textos de opção distintos)")
+    print(f"   correta é a opção mais longa em {result['correct_longest'].mean() * 100:.0f}% "
+          f"(o esperado sem viés é ~25%)")
+    print(f"   distrator parecido com a correta (≥ {args.max_similarity}): {int(flags['similar'].sum())}")
+    print(f"   correta ≥ {args.length_ratio}× o maior distrator: {int(flags['length'].sum())}")
+    print(f"   distrator repetido em ≥ {args.max_reuse} questões: {int(flags['reused'].sum())}")
+    if options.skipped:
+        print(f"⚠️  {options.skipped} questões fora do formato ignoradas (veja question_bank.validate)")
+
+    shown = weak[:args.show]
+    if len(shown):
+        texts = _collect(args.questions, [int(options.ordinals[i]) for i in shown],
+                         lambda item: item.get('question', ''))
+        print(f"\nQuestões mais suspeitas ({len(weak)} no total):")
+        for i in shown:
+            ordinal = int(options.ordinals[i])
+            names = [name for name, mask in flags.items() if mask[i]]
+            print(f"- #{ordinal} [{', '.join(names)}] {texts[ordinal]}")
+
+    if args.out:
+        ids = _collect(args.questions, [int(options.ordinals[i]) for i in weak], question_id)
+        flagged = []
+        for i in weak:
+            ordinal = int(options.ordinals[i])
+            flagged.append({
+                'id': ids[ordinal],
+                'ordinal': ordinal,
+                'flags': [name for name, mask in flags.items() if mask[i]],
+                'maxSimilarity': round(float(np.nanmax(result['similarity'][i])), 4),
+                'lengthRatio': round(float(result['length_ratio'][i]), 4),
+                'maxReuse': int(result['reuse'][i]),
+            })
+        report = {
+            'version': 1,
+            'items': n,
+            'skipped': options.skipped,
+            'correctLongestRate': round(float(result['correct_longest'].mean()), 4),
+            'flagged': flagged,
+        }
+        write_atomic(args.out, json.dumps(report, ensure_ascii=False, indent=2).encode('utf-8'))
+        print(f"\n📄 Relatório em {args.out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Expansão paralela de templates de questões.
+
+Os templates (no formato de `questions_templates` em generate_all_questions.py:
+{interesse: [questões]}) são divididos em shards — um por interesse ou por
+bloco de templates. Cada shard roda em um processo do ProcessPoolExecutor com
+uma semente própria derivada da semente base, grava seu próprio arquivo e no
+fim os shards são juntados na ordem original. Com a mesma semente a saída é
+idêntica, independente do número de processos.
+
+Uso:
+    python3 -m question_bank.generate --templates generate_all_questions.py \
+        --variants 100 --output /tmp/bulk.json [--workers 8] [--seed 42]
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import runpy
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from question_bank import instrument
+from question_bank.store import QuestionStore, format_item
+
+LETTERS = ['A', 'B', 'C', 'D']
+DEFAULT_CHUNK = 1000
+
+
+def create_question(question_text, correct_text, wrong_texts, tip, interests, rng=random):
+    """Cria uma questão com opções embaralhadas"""
+    all_texts = [correct_text] + wrong_texts[:3]  # Garantir 4 opções
+    rng.shuffle(all_texts)
+
+    correct_idx = all_texts.index(correct_text)
+    options = []
+    for i, letter in enumerate(LETTERS):
+        options.append({"label": letter, "text": all_texts[i]})
+
+    return {
+        "question": question_text,
+        "options": options,
+        "correct": LETTERS[correct_idx],
+        "tip": tip,
+        "interests": interests
+    }
+
+
+def from_template(template, rng, variant=None):
+    """Reembaralha as opções de um template já montado (com `options` e `correct`)"""
+    correct_text = next(o['text'] for o in template['options'] if o['label'] == template['correct'])
+    wrong_texts = [o['text'] for o in template['options'] if o['label'] != template['correct']]
+    question_text = template['question']
+    if variant is not None:
+        question_text = f"{question_text} [variante {variant}]"
+    return create_question(question_text, correct_text, wrong_texts,
+                           template['tip'], list(template.get('interests', [])), rng)
+
+
+def shard_seed(base_seed, shard_key):
+    """Semente determinística por shard (não depende do hash() aleatório do Python)"""
+    digest = hashlib.sha256(f'{base_seed}:{shard_key}'.encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'little')
+
+
+def make_shards(templates, variants, chunk_size=DEFAULT_CHUNK):
+    """
+    Divide o trabalho em shards (interesse, bloco). Cada shard recebe no máximo
+    `chunk_size` questões geradas.
+    """
+    shards = []
+    per_chunk = max(1, chunk_size // max(variants, 1))
+    for interest, items in templates.items():
+        for start in range(0, len(items), per_chunk):
+            shards.append({
+                'index': len(shards),
+                'key': f'{interest}:{start}',
+                'templates': items[start:start + per_chunk],
+                'variants': variants,
+            })
+    return shards
+
+
+def expand_shard(shard, base_seed, out_dir, fmt='jsonl'):
+    """
+    Executado nos processos filhos: gera as questões do shard e grava o arquivo.
+    Com fmt='json' o shard já sai formatado como trecho da lista final (indent=2),
+    então o merge só concatena bytes.
+    """
+    rng = random.Random(shard_seed(base_seed, shard['key']))
+    path = os.path.join(out_dir, f"shard-{shard['index']:06d}.{fmt}")
+    count = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        for template in shard['templates']:
+            for v in range(shard['variants']):
+                variant = v + 1 if shard['variants'] > 1 else None
+                q = from_template(template, rng, variant)
+                if fmt == 'json':
+                    f.write((',\n' if count else '') + format_item(q))
+                else:
+                    f.write(json.dumps(q, ensure_ascii=False) + '\n')
+                count += 1
+    return shard['index'], path, count
+
+
+def iter_shard_files(paths):
+    """Lê shards JSONL na ordem"""
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                yield json.loads(line)
+
+
+def merge_json_shards(results, path):
+    """Junta shards fmt='json' em um único arquivo igual ao de json.dump(..., indent=2)"""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as out:
+        out.write(b'[')
+        first = True
+        for _, shard_path, count in results:
+            if not count:
+                continue
+            out.write(b'\n' if first else b',\n')
+            with open(shard_path, 'rb') as f:
+                shutil.copyfileobj(f, out)
+            first = False
+        out.write(b']' if first else b'\n]')
+    os.replace(tmp_path, path)
+
+
+@instrument.span('generate')
+def generate(templates, variants=1, seed=0, workers=None, chunk_size=DEFAULT_CHUNK,
+             fmt='jsonl', work_dir=None):
+    """
+    Expande os templates em paralelo. Retorna (resultados ordenados
+    [(índice, arquivo, quantidade)], diretório temporário que o chamador deve remover).
+    """
+    shards = make_shards(templates, variants, chunk_size)
+    out_dir = tempfile.mkdtemp(prefix='question_shards_', dir=work_dir)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(expand_shard, shard, seed, out_dir, fmt) for shard in shards]
+        results = [future.result() for future in futures]
+    results.sort()
+    instrument.count('generate.items', sum(count for _, _, count in results))
+    return results, out_dir
+
+
+def load_templates(path):
+    """Lê templates de um .json ou da variável `questions_templates` de um script Python"""
+    if path.endswith('.json'):
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return runpy.run_path(path)['questions_templates']
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Expansão paralela de templates de questões')
+    parser.add_argument('--templates', default='generate_all_questions.py',
+                        help='arquivo .json ou script com `questions_templates`')
+    parser.add_argument('--variants', type=int, default=1,
+                        help='variantes geradas por template')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--chunk', type=int, default=DEFAULT_CHUNK,
+                        help='máximo de questões por shard')
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument('--output', help='grava um arquivo JSON com todas as questões')
+    target.add_argument('--append', action='store_true',
+                        help='grava no log de segmentos do banco (question_bank.store)')
+    args = parser.parse_args(argv)
+
+    templates = load_templates(args.templates)
+    fmt = 'json' if args.output else 'jsonl'
+    start = time.perf_counter()
+    results, out_dir = generate(templates, args.variants, args.seed, args.workers, args.chunk, fmt)
+    elapsed = time.perf_counter() - start
+    total = sum(count for _, _, count in results)
+    print(f"Geradas {total} questões em {len(results)} shards ({elapsed:.2f}s)")
+
+    try:
+        start = time.perf_counter()
+        if args.output:
+            merge_json_shards(results, args.output)
+            print(f"✅ Gravado em {args.output} ({time.perf_counter() - start:.2f}s)")
+        else:
+            QuestionStore().append(iter_shard_files(path for _, path, _ in results))
+            print("✅ Gravado no log de segmentos; execute `python3 -m question_bank.store compact`")
+    finally:
+        shutil.rmtree(out_dir, ignore_errors=True)
+
+if __name__ == '__main__':
+    main()
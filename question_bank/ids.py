@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+IDs estáveis de questões e índice id → offset no questions.json.
+
+O ID é um hash (blake2b, 64 bits, em hex) da pergunta, das opções ordenadas e
+do texto da opção correta, depois de normalizar espaços e caixa. Como as
+opções entram ordenadas, reembaralhar com shuffle_options não muda o ID.
+
+O índice fica ao lado do questions.json (questions.ids.idx): uma tabela hash
+de endereçamento aberto, com registros fixos (id, offset), lida via mmap —
+achar uma questão é uma sondagem na tabela e um seek no JSON.
+
+Uso:
+    python3 -m question_bank.ids build
+    python3 -m question_bank.ids get <id>
+"""
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import unicodedata
+
+from question_bank import instrument
+from question_bank.store import QUESTIONS_PATH
+from question_bank.validate import iter_items
+
+ID_INDEX_PATH = 'Scam/src/data/questions.ids.idx'
+MAGIC = b'QIDX'
+_HEADER = struct.Struct('<4sIQQQQ')   # magic, versão, n, capacidade, tamanho e mtime do JSON
+_SLOT = struct.Struct('<QQ')          # id, offset + 1 (0 = vazio)
+VERSION = 1
+
+
+def _normalize(text):
+    return ' '.join(unicodedata.normalize('NFC', text).casefold().split())
+
+
+def question_id(question):
+    """ID determinístico do conteúdo da questão (independe da ordem das opções)"""
+    options = question.get('options') or []
+    texts = sorted(_normalize(o.get('text', '')) for o in options)
+    correct = next((o.get('text', '') for o in options if o.get('label') == question.get('correct')), '')
+    payload = '\x1e'.join([_normalize(question.get('question', '')), '\x1f'.join(texts), _normalize(correct)])
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def _capacity(n):
+    capacity = 16
+    while capacity < 2 * n:
+        capacity *= 2
+    return capacity
+
+
+@instrument.span('ids')
+def build_id_index(questions_path=QUESTIONS_PATH, index_path=ID_INDEX_PATH):
+    """Percorre o JSON em streaming e grava a tabela id → offset. Retorna (n, ids repetidos)"""
+    entries = []
+    with open(questions_path, 'rb') as f:
+        for item, _, offset in iter_items(f):
+            entries.append((int(question_id(item), 16), offset))
+
+    capacity = _capacity(len(entries))
+    mask = capacity - 1
+    table = bytearray(capacity * _SLOT.size)
+    duplicates = []
+    for key, offset in entries:
+        slot = key & mask
+        while True:
+            existing, stored_offset = _SLOT.unpack_from(table, slot * _SLOT.size)
+            if stored_offset == 0:
+                _SLOT.pack_into(table, slot * _SLOT.size, key, offset + 1)
+                break
+            if existing == key:
+                # Mesmo conteúdo repetido no banco: mantém a primeira ocorrência
+                duplicates.append(f'{key:016x}')
+                break
+            slot = (slot + 1) & mask
+
+    stat = os.stat(questions_path)
+    tmp_path = index_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, len(entries) - len(duplicates), capacity,
+                             stat.st_size, stat.st_mtime_ns))
+        f.write(table)
+    os.replace(tmp_path, index_path)
+    instrument.count('ids.duplicates', len(duplicates))
+    return len(entries), duplicates
+
+
+class IdIndex:
+    """Consulta o índice de IDs e lê a questão direto do offset no questions.json"""
+
+    def __init__(self, index_path=ID_INDEX_PATH, questions_path=QUESTIONS_PATH):
+        self.questions_path = questions_path
+        with open(index_path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.count, self.capacity, size, mtime = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f'{index_path} não é um índice de IDs válido')
+        stat = os.stat(questions_path)
+        self.stale = (stat.st_size, stat.st_mtime_ns) != (size, mtime)
+        self._json = open(questions_path, 'rb')
+        self._decoder = json.JSONDecoder()
+
+    def offset(self, qid):
+        """Offset em bytes da questão no questions.json, ou None"""
+        key = int(qid, 16)
+        mask = self.capacity - 1
+        slot = key & mask
+        while True:
+            stored, offset = _SLOT.unpack_from(self._mm, _HEADER.size + slot * _SLOT.size)
+            if offset == 0:
+                return None
+            if stored == key:
+                return offset - 1
+            slot = (slot + 1) & mask
+
+    def get(self, qid):
+        offset = self.offset(qid)
+        if offset is None:
+            return None
+        size = 16 * 1024
+        while True:
+            self._json.seek(offset)
+            data = self._json.read(size)
+            try:
+                # O bloco pode terminar no meio de um caractere; isso não afeta o item
+                item, _ = self._decoder.raw_decode(data.decode('utf-8', errors='ignore'))
+                return item
+            except json.JSONDecodeError:
+                if len(data) < size:
+                    raise
+                size *= 4
+
+    def __contains__(self, qid):
+        return self.offset(qid) is not None
+
+    def close(self):
+        self._mm.close()
+        self._json.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='IDs estáveis e índice id → offset')
+    parser.add_argument('--questions', default=QUESTIONS_PATH)
+    parser.add_argument('--index', default=ID_INDEX_PATH)
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('build', help='gera o índice ao lado do questions.json')
+    get = sub.add_parser('get', help='mostra a questão com o ID informado')
+    get.add_argument('id')
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        total, duplicates = build_id_index(args.questions, args.index)
+        print(f"✅ {total} questões indexadas em {args.index}")
+        if duplicates:
+            print(f"⚠️  {len(duplicates)} questões com conteúdo repetido: {', '.join(duplicates[:10])}")
+        return 0
+
+    with IdIndex(args.index, args.questions) as index:
+        if index.stale:
+            print("⚠️  questions.json mudou desde a geração do índice; execute `build` de novo")
+        item = index.get(args.id)
+    if item is None:
+        print(f"Questão {args.id} não encontrada")
+        return 1
+    print(json.dumps(item, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,176 @@
+"""
+Instrumentação das etapas do banco de questões: spans com tempo, contadores e
+pico de memória.
+
+Os módulos do pacote marcam suas etapas com `span('nome')` e contam itens com
+`count('nome', n)`. Medir é barato e acontece sempre; a saída é ligada por
+variáveis de ambiente, sem editar os scripts:
+
+    QUESTION_BANK_REPORT=relatorio.json   relatório (tempo por etapa, contadores, pico de memória);
+                                          '-' imprime um resumo no stderr
+    QUESTION_BANK_TRACE=trace.json        trace no formato Chrome (chrome://tracing, Perfetto)
+    QUESTION_BANK_MEMORY=1                pico de memória por span com tracemalloc (mais lento)
+    QUESTION_BANK_PROFILE=etapa           cProfile só dos spans com esse nome, gravado em etapa.prof
+
+Os arquivos são gravados quando o processo termina. O relatório soma todas as
+chamadas; o trace guarda só os últimos MAX_SPANS spans, para que processos
+longos (watch, servidor) não acumulem memória.
+
+Uso:
+    QUESTION_BANK_REPORT=- QUESTION_BANK_TRACE=/tmp/trace.json \
+        python3 -m question_bank.store compact
+"""
+import atexit
+import cProfile
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+MAX_SPANS = 100000
+
+
+class Instrumentation:
+    """Coleta spans e contadores de um processo"""
+
+    def __init__(self, memory=False, profile_stage=None, max_spans=MAX_SPANS):
+        # (nome, início em µs, duração em µs, thread, pico ou None, args), só os mais recentes
+        self.spans = deque(maxlen=max_spans)
+        self.stages = {}      # totais por nome de todos os spans já fechados
+        self.counters = {}
+        self.memory = memory
+        self.profile_stage = profile_stage
+        self.profiler = None
+        self._origin = time.perf_counter()
+        self._peaks = []      # pilha de picos dos spans abertos (com memory=True)
+        self.peak = 0
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextmanager
+    def span(self, name, **args):
+        profiling = name == self.profile_stage
+        if profiling:
+            if self.profiler is None:
+                self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        if self.memory:
+            self._enter_memory()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            peak = self._exit_memory() if self.memory else None
+            if profiling:
+                self.profiler.disable()
+            self.spans.append((name, (start - self._origin) * 1e6, (end - start) * 1e6,
+                               threading.get_ident(), peak, args))
+            stage = self.stages.setdefault(name, {'calls': 0, 'seconds': 0.0, 'max_seconds': 0.0})
+            stage['calls'] += 1
+            stage['seconds'] += end - start
+            stage['max_seconds'] = max(stage['max_seconds'], end - start)
+            if peak is not None:
+                stage['peak_bytes'] = max(stage.get('peak_bytes', 0), peak)
+
+    def _enter_memory(self):
+        # tracemalloc tem um único pico; o do span pai é guardado antes de zerar
+        peak = tracemalloc.get_traced_memory()[1]
+        if self._peaks:
+            self._peaks[-1] = max(self._peaks[-1], peak)
+        self.peak = max(self.peak, peak)
+        tracemalloc.reset_peak()
+        self._peaks.append(0)
+
+    def _exit_memory(self):
+        peak = max(self._peaks.pop(), tracemalloc.get_traced_memory()[1])
+        if self._peaks:
+            self._peaks[-1] = max(self._peaks[-1], peak)
+        self.peak = max(self.peak, peak)
+        tracemalloc.reset_peak()
+        return peak
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def report(self):
+        """Resumo por etapa (chamadas, tempo total e máximo, pico), contadores e memória"""
+        stages = {name: dict(stage) for name, stage in self.stages.items()}
+        result = {'stages': stages, 'counters': dict(self.counters)}
+        if self.memory:
+            result['peak_traced_bytes'] = max(self.peak, tracemalloc.get_traced_memory()[1])
+        if resource is not None:
+            # ru_maxrss é em KB no Linux e em bytes no macOS
+            maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            result['max_rss_bytes'] = maxrss if sys.platform == 'darwin' else maxrss * 1024
+        return result
+
+    def chrome_trace(self):
+        """Eventos no formato Trace Event (fase 'X': início + duração) e contadores (fase 'C')"""
+        pid = os.getpid()
+        events = []
+        for name, start, duration, tid, peak, args in self.spans:
+            event_args = dict(args)
+            if peak is not None:
+                event_args['peak_bytes'] = peak
+            events.append({'name': name, 'ph': 'X', 'ts': round(start, 1), 'dur': round(duration, 1),
+                           'pid': pid, 'tid': tid, 'args': event_args})
+        end = (time.perf_counter() - self._origin) * 1e6
+        for name, value in self.counters.items():
+            events.append({'name': name, 'ph': 'C', 'ts': round(end, 1), 'pid': pid, 'args': {name: value}})
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def print_summary(self, out=sys.stderr):
+        report = self.report()
+        for name, stage in sorted(report['stages'].items(), key=lambda kv: -kv[1]['seconds']):
+            peak = f"  pico {stage['peak_bytes'] / 2**20:.1f} MB" if 'peak_bytes' in stage else ''
+            print(f"  {name:<24} {stage['seconds'] * 1000:10.1f} ms  ({stage['calls']}x){peak}", file=out)
+        for name, value in sorted(report['counters'].items()):
+            print(f"  {name:<24} {value:>10}", file=out)
+        if 'max_rss_bytes' in report:
+            print(f"  {'memória máxima (RSS)':<24} {report['max_rss_bytes'] / 2**20:10.1f} MB", file=out)
+
+    def write(self, report_path=None, trace_path=None):
+        if report_path == '-':
+            self.print_summary()
+        elif report_path:
+            with open(report_path, 'w', encoding='utf-8') as f:
+                json.dump(self.report(), f, ensure_ascii=False, indent=2)
+        if trace_path:
+            with open(trace_path, 'w', encoding='utf-8') as f:
+                json.dump(self.chrome_trace(), f)
+        if self.profiler is not None:
+            self.profiler.dump_stats(f'{self.profile_stage}.prof')
+
+
+_current = Instrumentation(memory=os.environ.get('QUESTION_BANK_MEMORY') == '1',
+                           profile_stage=os.environ.get('QUESTION_BANK_PROFILE') or None)
+
+
+def current():
+    return _current
+
+
+def span(name, **args):
+    """Context manager que mede uma etapa (`with span('dedupe'): ...`)"""
+    return _current.span(name, **args)
+
+
+def count(name, n=1):
+    _current.count(name, n)
+
+
+def _write_at_exit():
+    _current.write(os.environ.get('QUESTION_BANK_REPORT'), os.environ.get('QUESTION_BANK_TRACE'))
+
+
+atexit.register(_write_at_exit)
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Taxa de erro por interesse (e por par de interesses) a partir dos logs de respostas.
+
+Os logs (mesmo formato de question_bank.answer_stats) são lidos em uma
+passada e viram colunas codificadas por dicionário: código da questão
+(pelo `questionId` ou pelo texto, como em getQuestionId), acertou e
+timestamp. Tudo depois é redução agrupada com NumPy, em dois níveis:
+
+    respostas → questões         bincount pelo código da questão
+    questões → interesses        as tags de cada questão em CSR; os totais da
+                                 questão são repetidos para cada tag e somados
+                                 de novo com bincount (o mesmo para os pares
+                                 de tags e para as células questão × janela)
+
+Para cada interesse saem respostas, erros, taxa de erro com intervalo de
+confiança de Wilson (95%), a série por janela de tempo (--window dias) e a
+tendência: inclinação da taxa de erro por janela (mínimos quadrados
+ponderados pelas respostas). Os pares de interesses com pelo menos
+--min-answers respostas vêm ordenados pela taxa de erro.
+
+Uso:
+    python3 -m question_bank.interest_errors respostas.jsonl [mais.jsonl ...] [--window 7] \
+        [--out Scam/public/interest-errors.json]
+"""
+import argparse
+import itertools
+import json
+import time
+from array import array
+from datetime import datetime, timezone
+
+import numpy as np
+
+from question_bank import instrument
+from question_bank.answer_stats import iter_answers, question_key
+from question_bank.ids import question_id
+from question_bank.interests import INTERESTS_PATH, load_interest_names
+from question_bank.store import QUESTIONS_PATH, write_atomic
+from question_bank.validate import iter_items
+
+ERRORS_PATH = 'Scam/public/interest-errors.json'
+WINDOW_DAYS = 7
+MIN_ANSWERS = 30
+Z_95 = 1.959964
+DAY_MS = 86400 * 1000
+
+
+class QuestionMeta:
+    """Questões codificadas (texto e ID → código) com as tags em CSR, e os pares de tags"""
+
+    def __init__(self, questions_path=QUESTIONS_PATH, interests_path=INTERESTS_PATH):
+        self.names = load_interest_names(interests_path)
+        codes = {name: i for i, name in enumerate(self.names)}
+        self.keys = {}
+        offsets, ids = array('I', [0]), array('H')
+        pair_offsets, pairs = array('I', [0]), array('I')
+        k = len(self.names)
+        with open(questions_path, 'rb') as f:
+            for item, _, _ in iter_items(f):
+                if not isinstance(item, dict):
+                    continue
+                code = len(offsets) - 1
+                # A mesma questão repetida no banco fica com o primeiro código
+                self.keys.setdefault(question_key(item.get('question', '')), code)
+                self.keys.setdefault(question_id(item), code)
+                tags = sorted({codes[name] for name in item.get('interests') or () if name in codes})
+                ids.extend(tags)
+                offsets.append(len(ids))
+                pairs.extend(a * k + b for a, b in itertools.combinations(tags, 2))
+                pair_offsets.append(len(pairs))
+        self.offsets = np.frombuffer(offsets, dtype=np.uint32).astype(np.int64)
+        self.ids = np.frombuffer(ids, dtype=np.uint16).astype(np.int64)
+        self.pair_offsets = np.frombuffer(pair_offsets, dtype=np.uint32).astype(np.int64)
+        self.pairs = np.frombuffer(pairs, dtype=np.uint32).astype(np.int64)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def code(self, answer):
+        """Código da questão de um registro de resposta (KeyError se desconhecida)"""
+        qid = answer.get('questionId')
+        if qid is not None:
+            return self.keys[qid]
+        return self.keys[question_key(answer['questionText'])]
+
+
+class Events:
+    """Colunas das respostas: código da questão, acertou (0/1) e timestamp em ms (0 = sem)"""
+
+    def __init__(self, questions, correct, timestamps, skipped=0):
+        self.questions = np.asarray(questions, dtype=np.int64)
+        self.correct = np.asarray(correct, dtype=np.int8)
+        self.timestamps = np.asarray(timestamps, dtype=np.int64)
+        self.skipped = skipped
+
+    def __len__(self):
+        return len(self.questions)
+
+
+def load_events(paths, meta):
+    questions, correct, timestamps = array('i'), array('b'), array('q')
+    skipped = 0
+    with instrument.span('interest_errors.load'):
+        for path in paths:
+            for answer in iter_answers(path):
+                try:
+                    code = meta.code(answer)
+                    timestamp = int(answer.get('timestamp') or 0)
+                except (KeyError, TypeError, AttributeError, ValueError):
+                    skipped += 1
+                    continue
+                questions.append(code)
+                correct.append(1 if answer.get('isCorrect') else 0)
+                timestamps.append(timestamp)
+    instrument.count('answers.read', len(questions) + skipped)
+    instrument.count('answers.skipped', skipped)
+    return Events(np.frombuffer(questions, dtype=np.int32), np.frombuffer(correct, dtype=np.int8),
+                  np.frombuffer(timestamps, dtype=np.int64), skipped)
+
+
+def wilson(errors, answers, z=Z_95):
+    """Intervalo de Wilson da proporção de erros (arrays; sem respostas → [0, 1])"""
+    n = np.maximum(answers, 1)
+    p = errors / n
+    center = (p + z * z / (2 * n)) / (1 + z * z / n)
+    half = z * np.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / (1 + z * z / n)
+    low = np.where(answers > 0, center - half, 0.0)
+    high = np.where(answers > 0, center + half, 1.0)
+    return low, high
+
+
+def _slices(offsets, rows):
+    """Posições das fatias CSR das linhas `rows` (concatenadas, na ordem) e o tamanho de cada uma"""
+    counts = offsets[rows + 1] - offsets[rows]
+    starts = np.repeat(offsets[rows] - (np.cumsum(counts) - counts), counts)
+    return starts + np.arange(counts.sum()), counts
+
+
+def trend(answers, errors):
+    """Inclinação da taxa de erro por janela (linhas = grupos), ponderada pelas respostas"""
+    x = np.arange(answers.shape[1], dtype=np.float64)
+    rate = np.divide(errors, answers, out=np.zeros_like(errors, dtype=np.float64), where=answers > 0)
+    weight = answers.astype(np.float64)
+    total = weight.sum(axis=1)
+    safe = np.maximum(total, 1)
+    mean_x = (weight * x).sum(axis=1) / safe
+    mean_y = (weight * rate).sum(axis=1) / safe
+    dx = x - mean_x[:, None]
+    var = (weight * dx * dx).sum(axis=1)
+    cov = (weight * dx * (rate - mean_y[:, None])).sum(axis=1)
+    return np.divide(cov, var, out=np.zeros_like(cov), where=var > 0)
+
+
+def aggregate(events, meta, window_days=WINDOW_DAYS):
+    """Reduções agrupadas; retorna dict de arrays por interesse, por par e por janela"""
+    k = len(meta.names)
+    n_questions = len(meta)
+    with instrument.span('interest_errors.aggregate'):
+        wrong = 1 - events.correct.astype(np.float64)
+        per_question = np.stack([
+            np.bincount(events.questions, minlength=n_questions).astype(np.float64),
+            np.bincount(events.questions, wrong, minlength=n_questions),
+        ])
+
+        every = np.arange(n_questions)
+        positions, counts = _slices(meta.offsets, every)
+        interests = np.stack([np.bincount(meta.ids[positions], np.repeat(row, counts), minlength=k)
+                              for row in per_question])
+        positions, counts = _slices(meta.pair_offsets, every)
+        pairs = np.stack([np.bincount(meta.pairs[positions], np.repeat(row, counts), minlength=k * k)
+                          for row in per_question])
+
+        timed = events.timestamps > 0
+        if timed.any():
+            start = int(events.timestamps[timed].min())
+            windows = (events.timestamps[timed] - start) // (window_days * DAY_MS)
+            n_windows = int(windows.max()) + 1
+            # Células questão × janela com respostas (np.unique: não depende de questões × janelas)
+            cells, inverse = np.unique(events.questions[timed] * n_windows + windows, return_inverse=True)
+            per_cell = np.stack([np.bincount(inverse, minlength=len(cells)).astype(np.float64),
+                                 np.bincount(inverse, wrong[timed], minlength=len(cells))])
+            cell_question, cell_window = np.divmod(cells, n_windows)
+            positions, counts = _slices(meta.offsets, cell_question)
+            slots = meta.ids[positions] * n_windows + np.repeat(cell_window, counts)
+            series = np.stack([np.bincount(slots, np.repeat(row, counts), minlength=k * n_windows)
+                               for row in per_cell]).reshape(2, k, n_windows)
+        else:
+            start, n_windows = 0, 0
+            series = np.zeros((2, k, 0))
+    return {
+        'answers': interests[0], 'errors': interests[1],
+        'pair_answers': pairs[0].reshape(k, k), 'pair_errors': pairs[1].reshape(k, k),
+        'series_answers': series[0], 'series_errors': series[1],
+        'start': start, 'windows': n_windows,
+    }
+
+
+def build_report(events, meta, result, window_days, min_answers):
+    names = meta.names
+    answers, errors = result['answers'], result['errors']
+    low, high = wilson(errors, answers)
+    slopes = trend(result['series_answers'], result['series_errors'])
+    interests = {}
+    for i in np.argsort(-np.divide(errors, answers, out=np.zeros_like(errors), where=answers > 0)):
+        if not answers[i]:
+            continue
+        window_answers = result['series_answers'][i]
+        window_errors = result['series_errors'][i]
+        interests[names[i]] = {
+            'answers': int(answers[i]),
+            'errors': int(errors[i]),
+            'errorRate': round(float(errors[i] / answers[i]), 4),
+            'ci95': [round(float(low[i]), 4), round(float(high[i]), 4)],
+            'trendPerWindow': round(float(slopes[i]), 5),
+            'windows': [round(float(e / a), 4) if a else None for a, e in zip(window_answers, window_errors)],
+            'windowAnswers': [int(a) for a in window_answers],
+        }
+
+    pair_answers, pair_errors = result['pair_answers'], result['pair_errors']
+    a_idx, b_idx = np.nonzero(pair_answers >= max(min_answers, 1))
+    rates = pair_errors[a_idx, b_idx] / pair_answers[a_idx, b_idx]
+    pair_low, pair_high = wilson(pair_errors[a_idx, b_idx], pair_answers[a_idx, b_idx])
+    pairs = []
+    for j in np.argsort(-rates, kind='stable'):
+        a, b = a_idx[j], b_idx[j]
+        pairs.append({
+            'interests': [names[a], names[b]],
+            'answers': int(pair_answers[a, b]),
+            'errors': int(pair_errors[a, b]),
+            'errorRate': round(float(rates[j]), 4),
+            'ci95': [round(float(pair_low[j]), 4), round(float(pair_high[j]), 4)],
+        })
+
+    start = result['start']
+    return {
+        'version': 1,
+        'answers': len(events),
+        'skipped': events.skipped,
+        'windowDays': window_days,
+        'start': datetime.fromtimestamp(start / 1000, timezone.utc).isoformat() if start else None,
+        'interests': interests,
+        'pairs': pairs,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Taxa de erro por interesse a partir dos logs de respostas')
+    parser.add_argument('logs', nargs='+', help='arquivos JSONL ou lista JSON de respostas')
+    parser.add_argument('--questions', default=QUESTIONS_PATH)
+    parser.add_argument('--interests', default=INTERESTS_PATH)
+    parser.add_argument('--window', type=int, default=WINDOW_DAYS, help='tamanho da janela de tempo em dias')
+    parser.add_argument('--min-answers', type=int, default=MIN_ANSWERS,
+                        help='respostas mínimas para um par de interesses entrar no relatório')
+    parser.add_argument('--out', default=ERRORS_PATH)
+    parser.add_argument('--show', type=int, default=10, help='pares mostrados')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    meta = QuestionMeta(args.questions, args.interests)
+    events = load_events(args.logs, meta)
+    if not len(events):
+        print("⚠️  Nenhuma resposta de questões conhecidas encontrada")
+        return
+    result = aggregate(events, meta, args.window)
+    report = build_report(events, meta, result, args.window, args.min_answers)
+    write_atomic(args.out, json.dumps(report, ensure_ascii=False, indent=2).encode('utf-8'))
+    elapsed = time.perf_counter() - start
+
+    print(f"✅ {len(events)} respostas em {elapsed:.2f}s, {result['windows']} janelas de {args.window} dias "
+          f"→ {args.out}")
+    print(f"   {'interesse':<26}{'respostas':>10}{'erro':>8}{'IC 95%':>16}{'tendência':>11}")
+    for name, entry in report['interests'].items():
+        low, high = entry['ci95']
+        print(f"   {name:<26}{entry['answers']:>10}{entry['errorRate'] * 100:>7.1f}%"
+              f"{f'{low * 100:.1f}–{high * 100:.1f}%':>16}{entry['trendPerWindow'] * 100:>+10.2f}pp")
+    if report['pairs']:
+        print(f"\nPares com mais erros (≥ {args.min_answers} respostas):")
+        for entry in report['pairs'][:args.show]:
+            print(f"- {' + '.join(entry['interests'])}: {entry['errorRate'] * 100:.1f}% "
+                  f"de {entry['answers']} respostas")
+    if events.skipped:
+        print(f"⚠️  {events.skipped} respostas ignoradas (incompletas ou de questões desconhecidas)")
+
+
+if __name__ == '__main__':
+    main()
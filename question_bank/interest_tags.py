@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+Sugestão de interesses por questão (k-means em mini-lotes semeado pelo interests.ts).
+
+Pergunta e dica viram vetores esparsos por hashing (mesmos termos da busca,
+2^HASH_BITS dimensões, TF-IDF com norma 1), sem vocabulário crescendo com o
+banco. Cada interesse do interestsList começa com um centróide montado do
+nome e da descrição; os lotes de questões refinam os centróides como no
+k-means em mini-lotes: cada questão vai para o centróide mais parecido — com
+um pequeno bônus para as tags que ela já tem — e o centróide anda na direção
+da média do lote, com passo 1/contagem. A descrição conta como
+DESCRIPTION_WEIGHT questões, então o centróide não se afasta do tema.
+
+No fim, cada questão é comparada a todos os centróides: as tags sugeridas são
+as até MAX_TAGS mais parecidas (acima de MIN_SCORE e de RELATIVE × a melhor),
+e uma tag atual bem abaixo da melhor é apontada para remoção — é o caso do
+"Tecnologia" acrescentado em quase toda questão gerada.
+
+Memória limitada: o questions.json é lido uma vez em streaming e tokenizado em
+lotes de BATCH_SIZE questões; os lotes esparsos vão para um arquivo temporário
+e as passadas seguintes (ajuste e sugestão) leem um lote por vez. O resto da
+memória é a matriz de centróides (interesses × 2^HASH_BITS).
+
+Uso:
+    python3 -m question_bank.interest_tags [--out /tmp/tags.jsonl] [--show 20]
+    python3 -m question_bank.interest_tags --apply   # regrava o questions.json com as sugestões
+"""
+import argparse
+import functools
+import json
+import os
+import random
+import tempfile
+import time
+import zlib
+from array import array
+
+import numpy as np
+from scipy import sparse
+
+from question_bank import instrument
+from question_bank.ids import question_id
+from question_bank.interests import INTERESTS_PATH, load_interests
+from question_bank.search import tokenize
+from question_bank.store import QUESTIONS_PATH, format_item
+from question_bank.validate import iter_items
+
+HASH_BITS = 18
+BATCH_SIZE = 10000
+EPOCHS = 2
+DESCRIPTION_WEIGHT = 20
+MAX_TAGS = 3
+# Scores padronizados por interesse (desvios em relação à média do banco)
+MIN_Z = 2.0
+# Similaridade (cosseno) mínima para sugerir uma tag nova
+MIN_SCORE = 0.15
+# Tag atual abaixo da média do interesse é sugerida para remoção
+REMOVE_Z = 0.0
+
+
+@functools.lru_cache(maxsize=1 << 16)
+def _bucket(term):
+    return zlib.crc32(term.encode('utf-8')) & ((1 << HASH_BITS) - 1)
+
+
+def _texts(item):
+    if not isinstance(item, dict):
+        return ''
+    parts = [item.get('question'), item.get('tip')]
+    return '\n'.join(p for p in parts if isinstance(p, str))
+
+
+def _tags(item, codes):
+    interests = item.get('interests') if isinstance(item, dict) else None
+    if not isinstance(interests, list):
+        return ()
+    return [codes[name] for name in interests if isinstance(name, str) and name in codes]
+
+
+class Batch:
+    """Lote tokenizado: termos (buckets) em CSR e máscara das tags atuais"""
+
+    def __init__(self, indices, indptr, tags):
+        self.indices = indices
+        self.indptr = indptr
+        self.tags = tags
+
+    def __len__(self):
+        return len(self.indptr) - 1
+
+    def matrix(self, idf):
+        """TF-IDF com linhas de norma 1 (linhas vazias ficam zeradas)"""
+        shape = (len(self), len(idf))
+        m = sparse.csr_matrix((np.ones(len(self.indices), dtype=np.float32), self.indices, self.indptr),
+                              shape=shape)
+        m.sum_duplicates()
+        m.data = (1 + np.log(m.data)) * idf[m.indices]
+        norms = np.sqrt(np.bincount(np.repeat(np.arange(shape[0]), np.diff(m.indptr)),
+                                    m.data.astype(np.float64) ** 2, shape[0]))
+        norms[norms == 0] = 1
+        m.data /= np.repeat(norms, np.diff(m.indptr)).astype(np.float32)
+        return m
+
+
+def tokenize_batches(questions_path, codes, spill, batch_size=BATCH_SIZE):
+    """
+    Lê o banco uma vez e grava os lotes no arquivo `spill` (np.save em sequência).
+    Retorna (posição de cada lote no arquivo, questões, frequência de documento de cada bucket).
+    """
+    df = np.zeros(1 << HASH_BITS, dtype=np.int64)
+    offsets = []
+    total = 0
+    k = len(codes)
+
+    def flush(indices, indptr, tags):
+        offsets.append(spill.tell())
+        mask = np.zeros((len(indptr) - 1, k), dtype=bool)
+        for row, ids in enumerate(tags):
+            mask[row, ids] = True
+        indices = np.frombuffer(indices, dtype=np.uint32).astype(np.int32)
+        indptr = np.frombuffer(indptr, dtype=np.uint32).astype(np.int64)
+        for array_ in (indices, indptr, mask):
+            np.save(spill, array_)
+        # Cada bucket conta uma vez por questão
+        rows = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+        unique = np.unique(rows.astype(np.int64) << HASH_BITS | indices)
+        df[:] += np.bincount(unique & ((1 << HASH_BITS) - 1), minlength=len(df))
+
+    with instrument.span('tags.tokenize'), open(questions_path, 'rb') as f:
+        indices, indptr, tags = array('I'), array('I', [0]), []
+        for item, _, _ in iter_items(f):
+            indices.extend(_bucket(term) for term in tokenize(_texts(item)))
+            indptr.append(len(indices))
+            tags.append(_tags(item, codes))
+            total += 1
+            if len(tags) >= batch_size:
+                flush(indices, indptr, tags)
+                indices, indptr, tags = array('I'), array('I', [0]), []
+        if tags:
+            flush(indices, indptr, tags)
+    instrument.count('tags.items', total)
+    return offsets, total, df
+
+
+def read_batches(spill, offsets, order=None):
+    """Lê de volta os lotes gravados por tokenize_batches (na ordem `order`, se dada)"""
+    for i in (range(len(offsets)) if order is None else order):
+        spill.seek(offsets[i])
+        yield Batch(np.load(spill), np.load(spill), np.load(spill))
+
+
+def description_centroids(interests, idf):
+    """Um vetor por interesse a partir do nome e da descrição"""
+    indices, indptr = array('I'), array('I', [0])
+    for name, description in interests:
+        indices.extend(_bucket(term) for term in tokenize(f'{name} {name} {description}'))
+        indptr.append(len(indices))
+    batch = Batch(np.frombuffer(indices, dtype=np.uint32).astype(np.int32),
+                  np.frombuffer(indptr, dtype=np.uint32).astype(np.int64), None)
+    return batch.matrix(idf).toarray()
+
+
+def _normalize_rows(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return matrix / norms
+
+
+def calibrate(batches, centroids):
+    """Média e desvio do score de cada interesse sobre as questões com texto"""
+    k = len(centroids)
+    total, sums, squares = 0, np.zeros(k), np.zeros(k)
+    for x in batches:
+        scores = np.asarray(x @ centroids.T)[np.diff(x.indptr) > 0]
+        total += len(scores)
+        sums += scores.sum(axis=0)
+        squares += (scores.astype(np.float64) ** 2).sum(axis=0)
+    mean = sums / max(total, 1)
+    std = np.sqrt(np.maximum(squares / max(total, 1) - mean ** 2, 0))
+    std[std == 0] = 1
+    return mean, std
+
+
+def fit(batches, centroids, counts, calibration=None):
+    """
+    Uma época de centróides em mini-lotes; `centroids` (interesses × dimensões)
+    e `counts` são atualizados. Cada questão puxa os centróides das tags que já
+    tem (peso 1/quantidade de tags); sem tags, puxa o centróide mais parecido.
+    Com `calibration` (média, desvio), tags atuais que seriam removidas não puxam.
+    """
+    for x, tags in batches:
+        scores = np.asarray(x @ centroids.T)
+        if calibration is not None:
+            mean, std = calibration
+            tags = tags & ((scores - mean) / std >= REMOVE_Z)
+        weights = tags.astype(np.float32)
+        untagged = ~tags.any(axis=1)
+        weights[untagged, scores[untagged].argmax(axis=1)] = 1
+        # Questões sem nenhum termo não puxam centróide nenhum
+        weights[np.diff(x.indptr) == 0] = 0
+        weights /= np.maximum(weights.sum(axis=1, keepdims=True), 1)
+        sums = np.asarray((sparse.csr_matrix(weights.T) @ x).todense())
+        n = weights.sum(axis=0).astype(np.float64)
+        counts += n
+        centroids += (sums - n[:, None] * centroids) / counts[:, None]
+        centroids[:] = _normalize_rows(centroids)
+    return centroids
+
+
+def suggest(scores, z, min_score=MIN_SCORE, min_z=MIN_Z, max_tags=MAX_TAGS):
+    """Máscara (lote × interesses) das tags sugeridas: as `max_tags` de maior score padronizado"""
+    top = min(max_tags, z.shape[1])
+    ranked = np.argpartition(-z, top - 1, axis=1)[:, :top]
+    mask = np.zeros(z.shape, dtype=bool)
+    np.put_along_axis(mask, ranked, True, axis=1)
+    return mask & (z >= min_z) & (scores >= min_score)
+
+
+def run(questions_path=QUESTIONS_PATH, interests_path=INTERESTS_PATH, batch_size=BATCH_SIZE,
+        epochs=EPOCHS, seed=0, on_item=None):
+    """
+    Tokeniza, ajusta os centróides e sugere tags. `on_item(item, atuais,
+    sugeridas, adicionar, remover)` é chamado para cada questão (nomes de
+    interesses, na ordem do score). Retorna um resumo por interesse.
+    """
+    interests = load_interests(interests_path)
+    names = [name for name, _ in interests]
+    codes = {name: i for i, name in enumerate(names)}
+    with tempfile.TemporaryFile(dir=os.path.dirname(os.path.abspath(questions_path))) as spill:
+        offsets, total, df = tokenize_batches(questions_path, codes, spill, batch_size)
+        idf = (np.log((1 + total) / (1 + df)) + 1).astype(np.float32)
+        centroids = description_centroids(interests, idf)
+        rng = random.Random(seed)
+        with instrument.span('tags.fit'):
+            counts = np.full(len(names), float(DESCRIPTION_WEIGHT))
+            calibration = None
+            for _ in range(epochs):
+                order = list(range(len(offsets)))
+                rng.shuffle(order)
+                fit(((b.matrix(idf), b.tags) for b in read_batches(spill, offsets, order)),
+                    centroids, counts, calibration)
+                calibration = calibrate((b.matrix(idf) for b in read_batches(spill, offsets)), centroids)
+        mean, std = calibration
+
+        summary = {'items': total, 'changed': 0,
+                   'current': np.zeros(len(names), dtype=np.int64),
+                   'suggested': np.zeros(len(names), dtype=np.int64),
+                   'added': np.zeros(len(names), dtype=np.int64),
+                   'removed': np.zeros(len(names), dtype=np.int64)}
+        with instrument.span('tags.suggest'), open(questions_path, 'rb') as f:
+            items = iter_items(f) if on_item is not None else None
+            for batch in read_batches(spill, offsets):
+                x = batch.matrix(idf)
+                scores = np.asarray(x @ centroids.T)
+                z = (scores - mean) / std
+                suggested = suggest(scores, z)
+                removed = batch.tags & (z < REMOVE_Z)
+                # Questões sem texto ficam como estão
+                removed[np.diff(x.indptr) == 0] = False
+                added = suggested & ~batch.tags
+                # Nunca deixa uma questão sem interesse: mantém a melhor tag atual
+                emptied = batch.tags.any(axis=1) & ~(batch.tags & ~removed).any(axis=1) & ~added.any(axis=1)
+                if emptied.any():
+                    best = np.where(batch.tags, z, -np.inf).argmax(axis=1)
+                    removed[emptied, best[emptied]] = False
+                summary['current'] += batch.tags.sum(axis=0)
+                summary['suggested'] += suggested.sum(axis=0)
+                summary['added'] += added.sum(axis=0)
+                summary['removed'] += removed.sum(axis=0)
+                changed = added.any(axis=1) | removed.any(axis=1)
+                summary['changed'] += int(changed.sum())
+                if items is None:
+                    continue
+                order = np.argsort(-z, axis=1)
+                for row in range(len(batch)):
+                    item, _, _ = next(items)
+                    ranked = order[row]
+                    on_item(item,
+                            [names[i] for i in ranked if batch.tags[row, i]],
+                            [names[i] for i in ranked if suggested[row, i]],
+                            [names[i] for i in ranked if added[row, i]],
+                            [names[i] for i in ranked if removed[row, i]])
+    summary['names'] = names
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Sugere interesses para as questões a partir do texto')
+    parser.add_argument('--questions', default=QUESTIONS_PATH)
+    parser.add_argument('--interests', default=INTERESTS_PATH)
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+    parser.add_argument('--epochs', type=int, default=EPOCHS)
+    parser.add_argument('--out', help='grava as mudanças sugeridas (uma questão por linha, JSONL)')
+    parser.add_argument('--show', type=int, default=10, help='exemplos de mudanças mostrados')
+    parser.add_argument('--apply', action='store_true',
+                        help='regrava o questions.json: remove as tags apontadas e acrescenta as sugeridas')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    examples = []
+    out = open(args.out, 'w', encoding='utf-8') if args.out else None
+    rewritten = None
+    if args.apply:
+        tmp_path = args.questions + '.tmp'
+        rewritten = open(tmp_path, 'w', encoding='utf-8')
+        rewritten.write('[')
+    written = 0
+
+    def on_item(item, current, suggested, added, removed):
+        nonlocal written
+        if added or removed:
+            if len(examples) < args.show:
+                examples.append((item.get('question', ''), added, removed))
+            if out is not None:
+                out.write(json.dumps({'id': question_id(item), 'question': item.get('question', ''),
+                                      'interests': current, 'suggested': suggested,
+                                      'add': added, 'remove': removed}, ensure_ascii=False) + '\n')
+        if rewritten is not None:
+            if added or removed:
+                # Sem a chave "interests" a questão ganha a lista; valor que não é lista fica como está
+                interests = item.setdefault('interests', [])
+                if isinstance(interests, list):
+                    item['interests'] = [name for name in interests if name not in removed] + added
+            rewritten.write((',\n' if written else '\n') + format_item(item))
+            written += 1
+
+    try:
+        needs_items = out is not None or rewritten is not None or args.show > 0
+        summary = run(args.questions, args.interests, args.batch_size, args.epochs,
+                      on_item=on_item if needs_items else None)
+    except BaseException:
+        if rewritten is not None:
+            rewritten.close()
+            os.remove(args.questions + '.tmp')
+        raise
+    finally:
+        if out is not None:
+            out.close()
+    if rewritten is not None:
+        rewritten.write('\n]' if written else ']')
+        rewritten.flush()
+        os.fsync(rewritten.fileno())
+        rewritten.close()
+        os.replace(args.questions + '.tmp', args.questions)
+    elapsed = time.perf_counter() - start
+
+    print(f"✅ {summary['items']} questões em {elapsed:.2f}s: {summary['changed']} com mudanças sugeridas")
+    print(f"   {'interesse':<26}{'atual':>8}{'sugerido':>10}{'+':>7}{'-':>7}")
+    order = np.argsort(-(summary['added'] + summary['removed']))
+    for i in order:
+        if not summary['current'][i] and not summary['suggested'][i]:
+            continue
+        print(f"   {summary['names'][i]:<26}{summary['current'][i]:>8}{summary['suggested'][i]:>10}"
+              f"{summary['added'][i]:>7}{summary['removed'][i]:>7}")
+    for question, added, removed in examples:
+        changes = ', '.join([f'+{name}' for name in added] + [f'-{name}' for name in removed])
+        print(f"- {question}\n    {changes}")
+    if args.apply:
+        print(f"📝 {args.questions} regravado com as tags ajustadas")
+    if args.out:
+        print(f"📄 Mudanças em {args.out}")
+
+
+if __name__ == '__main__':
+    main()
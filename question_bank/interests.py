@@ -0,0 +1,19 @@
+"""
+Lista canônica de interesses, lida de Scam/src/data/interests.ts.
+"""
+import re
+
+INTERESTS_PATH = 'Scam/src/data/interests.ts'
+
+_ENTRY = re.compile(r'\{\s*name:\s*"((?:[^"\\]|\\.)*)",\s*description:\s*"((?:[^"\\]|\\.)*)"\s*\}')
+
+
+def load_interests(path=INTERESTS_PATH):
+    """Lista de (nome, descrição) na ordem do interestsList"""
+    with open(path, 'r', encoding='utf-8') as f:
+        source = f.read()
+    return _ENTRY.findall(source)
+
+
+def load_interest_names(path=INTERESTS_PATH):
+    return [name for name, _ in load_interests(path)]
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Índice invertido interesse → questões, gravado ao lado do questions.json.
+
+Para cada interesse guarda a lista ordenada de ordinais (posição da questão
+no questions.json) codificada com deltas + varint (LEB128) em base64, além da
+contagem. Filtrar por interesses vira um merge das listas de postings, e a
+tela de interesses pode mostrar quantas questões existem sem varrer o banco.
+
+Uso:
+    python3 -m question_bank.inverted_index [--out Scam/src/data/questions.index.json]
+"""
+import argparse
+import base64
+import heapq
+import json
+
+from question_bank import instrument
+from question_bank.store import QUESTIONS_PATH, write_atomic
+
+INDEX_PATH = 'Scam/src/data/questions.index.json'
+
+
+def encode_varints(values):
+    """Codifica inteiros não negativos em LEB128"""
+    out = bytearray()
+    for v in values:
+        while v >= 0x80:
+            out.append((v & 0x7F) | 0x80)
+            v >>= 7
+        out.append(v)
+    return bytes(out)
+
+
+def decode_varints(data):
+    value = 0
+    shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            yield value
+            value = 0
+            shift = 0
+
+
+def encode_postings(ordinals):
+    """Lista ordenada de ordinais → deltas em varint, em base64"""
+    deltas = []
+    previous = 0
+    for o in ordinals:
+        deltas.append(o - previous)
+        previous = o
+    return base64.b64encode(encode_varints(deltas)).decode('ascii')
+
+
+def decode_postings(encoded):
+    current = 0
+    result = []
+    for delta in decode_varints(base64.b64decode(encoded)):
+        current += delta
+        result.append(current)
+    return result
+
+
+def build_postings(questions):
+    """{interesse: [ordinais em ordem crescente]} em uma única passada"""
+    postings = {}
+    for ordinal, q in enumerate(questions):
+        for interest in set(q.get('interests') or ()):
+            postings.setdefault(interest, []).append(ordinal)
+    return postings
+
+
+@instrument.span('index')
+def build_index(questions):
+    postings = build_postings(questions)
+    return {
+        'version': 1,
+        'total': len(questions),
+        'encoding': 'delta-varint-base64',
+        'interests': {
+            interest: {'count': len(ordinals), 'postings': encode_postings(ordinals)}
+            for interest, ordinals in sorted(postings.items())
+        },
+    }
+
+
+def union(posting_lists):
+    """Merge k-way de listas ordenadas, sem repetir ordinais"""
+    last = None
+    for ordinal in heapq.merge(*posting_lists):
+        if ordinal != last:
+            yield ordinal
+            last = ordinal
+
+
+def select(index, interests):
+    """Ordinais das questões que têm pelo menos um dos interesses"""
+    entries = index['interests']
+    return list(union(decode_postings(entries[i]['postings']) for i in interests if i in entries))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Gera o índice invertido de interesses')
+    parser.add_argument('--questions', default=QUESTIONS_PATH)
+    parser.add_argument('--out', default=INDEX_PATH)
+    args = parser.parse_args(argv)
+
+    with open(args.questions, 'r', encoding='utf-8') as f:
+        questions = json.load(f)
+    index = build_index(questions)
+    write_atomic(args.out, json.dumps(index, ensure_ascii=False, indent=2).encode('utf-8'))
+    print(f"✅ Índice com {len(index['interests'])} interesses gravado em {args.out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Dificuldade das questões por Teoria de Resposta ao Item (Rasch / 2PL).
+
+Os logs de respostas (mesmo formato de question_bank.answer_stats; o usuário
+vem do campo `userId` ou, se não houver, cada arquivo conta como um usuário)
+viram as células respondidas de uma matriz esparsa usuários × questões, em
+coordenadas (usuário, questão, tentativas, acertos). O modelo é
+
+    P(acerto) = 1 / (1 + exp(-a_j (θ_i - b_j)))
+
+com habilidade θ por usuário, dificuldade b e discriminação a por questão
+(no Rasch, a = 1). O ajuste alterna passos de Newton vetorizados — todos os
+usuários de uma vez, depois todas as questões — somando sobre as células com
+np.bincount, com priors normais fracos para que usuários que acertaram tudo
+não divirjam. Milhões de respostas cabem em memória e ajustam em segundos.
+
+O resultado (dificuldade, discriminação, erro padrão, respostas e taxa de
+acerto por questão) é gravado como metadado à parte, indexado pelo ID estável.
+
+Uso:
+    python3 -m question_bank.irt respostas.jsonl [mais.jsonl ...] [--model 2pl|rasch] \
+        [--out Scam/public/question-difficulty.json]
+"""
+import argparse
+import json
+from array import array
+
+import numpy as np
+from scipy.special import expit
+
+from question_bank import instrument
+from question_bank.answer_stats import id_key, iter_answers, question_key
+from question_bank.store import QUESTIONS_PATH, write_atomic
+
+DIFFICULTY_PATH = 'Scam/public/question-difficulty.json'
+MAX_ITER = 100
+TOL = 1e-3
+# Desvios-padrão dos priors: θ ~ N(0, 1), b ~ N(0, 2²), log a ~ N(0, 0.5²)
+THETA_SD = 1.0
+B_SD = 2.0
+LOG_A_SD = 0.5
+MAX_STEP = 1.0
+
+
+class Responses:
+    """Tentativas e acertos por célula (usuário, questão) respondida, em arrays paralelos"""
+
+    def __init__(self, users, items, correct, n_users=None, n_items=None):
+        users = np.asarray(users, dtype=np.int64)
+        items = np.asarray(items, dtype=np.int64)
+        correct = np.asarray(correct, dtype=np.float64)
+        n_users = int(users.max()) + 1 if n_users is None else n_users
+        n_items = int(items.max()) + 1 if n_items is None else n_items
+        # Respostas repetidas do mesmo usuário à mesma questão viram uma célula binomial
+        cells, inverse = np.unique(users * n_items + items, return_inverse=True)
+        attempts = np.bincount(inverse).astype(np.float64)
+        hits = np.bincount(inverse, weights=correct, minlength=len(cells))
+        rows, cols = np.divmod(cells, n_items)
+        # O ajuste só soma por linha e por coluna (bincount); matrizes CSR seriam uma segunda cópia
+        self.shape = (n_users, n_items)
+        self.rows = rows
+        self.cols = cols
+        self.n = attempts
+        self.c = hits
+        self.answers = len(users)
+
+
+def _newton(grad, hess):
+    return np.clip(grad / hess, -MAX_STEP, MAX_STEP)
+
+
+def fit(responses, model='2pl', max_iter=MAX_ITER, tol=TOL):
+    """
+    Ajusta o modelo por Newton alternado. Retorna dict com theta, b, a, erros
+    padrão de b e a, número de iterações e se convergiu.
+    """
+    n_users, n_items = responses.shape
+    rows, cols, n, c = responses.rows, responses.cols, responses.n, responses.c
+    theta = np.zeros(n_users)
+    # Início da dificuldade pela taxa de acerto (logit invertido)
+    rate = (np.bincount(cols, c, n_items) + 0.5) / (np.bincount(cols, n, n_items) + 1.0)
+    b = -np.log(rate / (1 - rate))
+    a = np.ones(n_items)
+    two_pl = model == '2pl'
+
+    def residuals():
+        p = expit(a[cols] * (theta[rows] - b[cols]))
+        return c - n * p, n * p * (1 - p)
+
+    iterations = 0
+    converged = False
+    with instrument.span('irt.fit', model=model):
+        for iterations in range(1, max_iter + 1):
+            r, w = residuals()
+            ac = a[cols]
+            grad = np.bincount(rows, ac * r, n_users) - theta / THETA_SD ** 2
+            hess = np.bincount(rows, ac * ac * w, n_users) + 1 / THETA_SD ** 2
+            step_theta = _newton(grad, hess)
+            theta += step_theta
+
+            r, w = residuals()
+            grad = np.bincount(cols, -ac * r, n_items) - b / B_SD ** 2
+            hess = np.bincount(cols, ac * ac * w, n_items) + 1 / B_SD ** 2
+            step_b = _newton(grad, hess)
+            b += step_b
+
+            step_a = np.zeros(1)
+            if two_pl:
+                r, w = residuals()
+                d = theta[rows] - b[cols]
+                # Parametrizado em log a, para a ficar positivo
+                log_a = np.log(a)
+                grad = a * np.bincount(cols, d * r, n_items) - log_a / LOG_A_SD ** 2
+                hess = a * a * np.bincount(cols, d * d * w, n_items) + 1 / LOG_A_SD ** 2
+                step_a = _newton(grad, hess)
+                a = np.exp(log_a + step_a)
+
+            if max(np.abs(step_theta).max(initial=0), np.abs(step_b).max(initial=0),
+                   np.abs(step_a).max(initial=0)) < tol:
+                converged = True
+                break
+
+    if two_pl:
+        # Escala identificada fixando θ com média 0 e desvio 1 (o modelo não muda)
+        mean, sd = theta.mean(), theta.std() or 1.0
+        theta = (theta - mean) / sd
+        b = (b - mean) / sd
+        a = a * sd
+
+    _, w = residuals()
+    se_b = 1 / np.sqrt(np.bincount(cols, a[cols] ** 2 * w, n_items) + 1 / B_SD ** 2)
+    d = theta[rows] - b[cols]
+    se_a = a / np.sqrt(a * a * np.bincount(cols, d * d * w, n_items) + 1 / LOG_A_SD ** 2) if two_pl else None
+    return {'theta': theta, 'b': b, 'a': a, 'se_b': se_b, 'se_a': se_a,
+            'iterations': iterations, 'converged': converged}
+
+
+def load_responses(paths, key):
+    """Lê os logs em uma passada; retorna (Responses, chaves das questões, quantidade ignorada)"""
+    users, items, correct = array('i'), array('i'), array('b')
+    user_codes, item_codes = {}, {}
+    skipped = 0
+    with instrument.span('irt.load'):
+        for path in paths:
+            for answer in iter_answers(path):
+                try:
+                    item = key(answer)
+                except (KeyError, TypeError, AttributeError):
+                    skipped += 1
+                    continue
+                user = answer.get('userId', path)
+                users.append(user_codes.setdefault(user, len(user_codes)))
+                items.append(item_codes.setdefault(item, len(item_codes)))
+                correct.append(1 if answer.get('isCorrect') else 0)
+    if not users:
+        return None, [], skipped
+    responses = Responses(np.frombuffer(users, dtype=np.int32), np.frombuffer(items, dtype=np.int32),
+                          np.frombuffer(correct, dtype=np.int8), len(user_codes), len(item_codes))
+    instrument.count('irt.answers', responses.answers)
+    return responses, list(item_codes), skipped
+
+
+def item_report(responses, result, item_keys, model):
+    n_items = responses.shape[1]
+    answers = np.bincount(responses.cols, responses.n, n_items)
+    hits = np.bincount(responses.cols, responses.c, n_items)
+    items = {}
+    for j, key in enumerate(item_keys):
+        entry = {
+            'difficulty': round(float(result['b'][j]), 4),
+            'difficultySE': round(float(result['se_b'][j]), 4),
+            'answers': int(answers[j]),
+            'correctRate': round(float(hits[j] / answers[j]), 4),
+        }
+        if result['se_a'] is not None:
+            entry['discrimination'] = round(float(result['a'][j]), 4)
+            entry['discriminationSE'] = round(float(result['se_a'][j]), 4)
+        items[key] = entry
+    return {
+        'version': 1,
+        'model': model,
+        'users': responses.shape[0],
+        'answers': responses.answers,
+        'converged': result['converged'],
+        'items': items,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Ajusta dificuldade e discriminação (TRI) das questões')
+    parser.add_argument('logs', nargs='+', help='arquivos JSONL ou lista JSON de respostas')
+    parser.add_argument('--model', choices=('2pl', 'rasch'), default='2pl')
+    parser.add_argument('--out', default=DIFFICULTY_PATH)
+    parser.add_argument('--questions', default=QUESTIONS_PATH)
+    parser.add_argument('--by-text', action='store_true',
+                        help='indexa pelo texto da pergunta (chave de questionStats.ts) em vez do ID')
+    parser.add_argument('--max-iter', type=int, default=MAX_ITER)
+    args = parser.parse_args(argv)
+
+    key = (lambda answer: question_key(answer['questionText'])) if args.by_text else id_key(args.questions)
+    responses, item_keys, skipped = load_responses(args.logs, key)
+    if responses is None:
+        print("⚠️  Nenhuma resposta encontrada")
+        return
+    result = fit(responses, args.model, args.max_iter)
+    report = item_report(responses, result, item_keys, args.model)
+    write_atomic(args.out, json.dumps(report, ensure_ascii=False, indent=2).encode('utf-8'))
+    status = 'convergiu' if result['converged'] else 'não convergiu'
+    print(f"✅ {responses.answers} respostas de {responses.shape[0]} usuários, {len(item_keys)} questões "
+          f"({args.model}, {status} em {result['iterations']} iterações) → {args.out}")
+    if skipped:
+        print(f"⚠️  {skipped} respostas ignoradas (incompletas ou de questões desconhecidas)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Sorteio de questões ponderado pela relevância, com o método alias (Vose).
+
+O peso de cada questão é o mesmo de getQuestionRelevanceScore em
+questions.ts: quantos dos interesses selecionados ela tem (questões com peso
+zero ficam de fora, como no filtro do front-end; sem interesses selecionados
+o sorteio é uniforme). A tabela alias de cada combinação de interesses é
+montada uma vez e guardada em cache; cada sorteio custa O(1), então tirar
+`count` questões distintas custa O(count) esperado, sem embaralhar o banco.
+
+Uso:
+    python3 -m question_bank.sampler --count 10 --interests Games Tecnologia [--seed 1]
+"""
+import argparse
+import heapq
+import json
+import random
+from collections import Counter, OrderedDict
+
+from question_bank.inverted_index import build_postings
+from question_bank.store import QUESTIONS_PATH
+
+CACHE_SIZE = 128
+# Acima desta fração de rejeições o sorteio por alias deixa de compensar
+MAX_REJECTION_RATIO = 4
+
+
+class AliasTable:
+    """Tabela alias de Vose: sorteia um índice com probabilidade proporcional ao peso"""
+
+    __slots__ = ('items', 'prob', 'alias', 'weights')
+
+    def __init__(self, items, weights):
+        n = len(items)
+        total = float(sum(weights))
+        if n == 0 or total <= 0:
+            raise ValueError('a tabela alias precisa de pelo menos um peso positivo')
+        self.items = items
+        self.weights = weights
+        scaled = [w * n / total for w in weights]
+        self.prob = [0.0] * n
+        self.alias = [0] * n
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s = small.pop()
+            g = large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = g
+            scaled[g] = scaled[g] + scaled[s] - 1.0
+            (small if scaled[g] < 1.0 else large).append(g)
+        for i in large + small:
+            self.prob[i] = 1.0
+
+    def __len__(self):
+        return len(self.items)
+
+    def draw(self, rng=random):
+        i = int(rng.random() * len(self.prob))
+        return self.items[i] if rng.random() < self.prob[i] else self.items[self.alias[i]]
+
+    def draw_distinct(self, count, rng=random):
+        """`count` itens distintos (sorteio sucessivo, descartando repetidos)"""
+        n = len(self.items)
+        if count >= n:
+            result = list(self.items)
+            rng.shuffle(result)
+            return result
+        chosen = []
+        seen = set()
+        attempts = 0
+        limit = MAX_REJECTION_RATIO * count + 16
+        while len(chosen) < count and attempts < limit:
+            attempts += 1
+            item = self.draw(rng)
+            if item not in seen:
+                seen.add(item)
+                chosen.append(item)
+        if len(chosen) < count:
+            # Pesos muito concentrados: completa com Efraimidis–Spirakis (chave u^(1/w))
+            rest = [(it, w) for it, w in zip(self.items, self.weights) if it not in seen]
+            keys = ((rng.random() ** (1.0 / w), it) for it, w in rest)
+            chosen.extend(it for _, it in heapq.nlargest(count - len(chosen), keys))
+        return chosen
+
+
+class QuizSampler:
+    """Sorteia questões de um banco, com tabelas alias em cache por combinação de interesses"""
+
+    def __init__(self, questions, cache_size=CACHE_SIZE):
+        self.questions = questions
+        self.postings = build_postings(questions)
+        self.cache_size = cache_size
+        self._tables = OrderedDict()
+
+    def table(self, interests):
+        key = frozenset(interests)
+        table = self._tables.get(key)
+        if table is not None:
+            self._tables.move_to_end(key)
+            return table
+
+        if key:
+            # Relevância = quantos interesses selecionados a questão tem
+            scores = Counter()
+            for interest in key:
+                scores.update(self.postings.get(interest, ()))
+            ordinals = sorted(scores)
+            weights = [scores[o] for o in ordinals]
+        else:
+            ordinals = list(range(len(self.questions)))
+            weights = [1] * len(ordinals)
+        table = AliasTable(ordinals, weights) if ordinals else None
+
+        self._tables[key] = table
+        if len(self._tables) > self.cache_size:
+            self._tables.popitem(last=False)
+        return table
+
+    def sample_ordinals(self, count, interests=(), rng=random):
+        table = self.table(interests)
+        if table is None:
+            return []
+        return table.draw_distinct(count, rng)
+
+    def sample(self, count, interests=(), rng=random):
+        return [self.questions[o] for o in self.sample_ordinals(count, interests, rng)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Sorteia questões ponderadas pela relevância')
+    parser.add_argument('--questions', default=QUESTIONS_PATH)
+    parser.add_argument('--count', type=int, default=10)
+    parser.add_argument('--interests', nargs='*', default=[])
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    with open(args.questions, 'r', encoding='utf-8') as f:
+        questions = json.load(f)
+    rng = random.Random(args.seed)
+    sampler = QuizSampler(questions)
+    for q in sampler.sample(args.count, args.interests, rng):
+        print(f"- {q['question']}  {q.get('interests', [])}")
+
+
+if __name__ == '__main__':
+    main()
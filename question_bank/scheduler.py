@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Agendador de revisão espaçada (SM-2) para escolher as próximas questões.
+
+Cada par (usuário, questão) respondido guarda o estado do SM-2: fator de
+facilidade, repetições seguidas certas, intervalo e próxima revisão. Acertar
+(qualidade 4) aumenta o intervalo; errar (qualidade 1) zera as repetições e a
+questão volta no dia seguinte. As questões de cada usuário ficam em um heap
+pela data de revisão, então as próximas N vencidas saem em O(N log Q); quando
+faltam questões vencidas, o restante vem de questões que o usuário nunca viu,
+em uma ordem aleatória fixa do banco.
+
+O estado fica em arrays compactos (um índice por par usuário/questão), e cada
+entrada do heap é um inteiro (revisão << 24 | questão) em vez de uma tupla. A
+reprodução em lote dos logs só atualiza os estados e monta cada heap uma vez
+no fim (heapify), sem uma entrada por resposta.
+
+Uso:
+    python3 -m question_bank.scheduler respostas.jsonl [mais.jsonl ...] --user 42 [--count 10]
+"""
+import argparse
+import heapq
+import json
+import random
+import time
+from array import array
+
+from question_bank import instrument
+from question_bank.answer_stats import iter_answers, question_key
+from question_bank.store import QUESTIONS_PATH
+
+DAY = 86400
+INITIAL_EASINESS = 2.5
+MIN_EASINESS = 1.3
+QUALITY_CORRECT = 4
+QUALITY_WRONG = 1
+# Teto do intervalo em dias (~100 anos): sem ele o intervalo cresce ~2,5× por acerto
+# e estoura o array('I') depois de umas 25 revisões certas seguidas
+MAX_INTERVAL = 36500
+_ORDINAL_BITS = 24
+_ORDINAL_MASK = (1 << _ORDINAL_BITS) - 1
+
+
+def sm2(easiness, repetitions, interval, quality):
+    """Um passo do SM-2; retorna (facilidade, repetições, intervalo em dias)"""
+    if quality >= 3:
+        if repetitions == 0:
+            interval = 1
+        elif repetitions == 1:
+            interval = 6
+        else:
+            interval = min(round(interval * easiness), MAX_INTERVAL)
+        repetitions += 1
+    else:
+        repetitions = 0
+        interval = 1
+    easiness = max(MIN_EASINESS, easiness + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+    return easiness, repetitions, interval
+
+
+class Scheduler:
+    """Estado SM-2 por usuário e questão, com um heap de revisões por usuário"""
+
+    def __init__(self, n_questions, seed=0):
+        if n_questions > _ORDINAL_MASK:
+            raise ValueError(f'no máximo {_ORDINAL_MASK} questões')
+        self.n_questions = n_questions
+        # Ordem fixa das questões novas (a mesma para todos os usuários)
+        self.new_order = list(range(n_questions))
+        random.Random(seed).shuffle(self.new_order)
+        self.easiness = array('f')
+        self.repetitions = array('H')
+        self.interval = array('I')
+        self.due = array('q')
+        self.states = {}     # usuário → {questão: índice do estado}
+        self.heaps = {}      # usuário → heap de (revisão << 24 | questão)
+        self.cursors = {}    # usuário → posição em new_order
+
+    def _state(self, user, question):
+        states = self.states.get(user)
+        if states is None:
+            states = self.states[user] = {}
+            self.heaps[user] = []
+        sid = states.get(question)
+        if sid is None:
+            sid = states[question] = len(self.due)
+            self.easiness.append(INITIAL_EASINESS)
+            self.repetitions.append(0)
+            self.interval.append(0)
+            self.due.append(0)
+        return sid
+
+    def _update(self, sid, correct, now):
+        quality = QUALITY_CORRECT if correct else QUALITY_WRONG
+        easiness, repetitions, interval = sm2(self.easiness[sid], self.repetitions[sid],
+                                              self.interval[sid], quality)
+        self.easiness[sid] = easiness
+        self.repetitions[sid] = min(repetitions, 0xFFFF)
+        self.interval[sid] = interval
+        self.due[sid] = int(now) + interval * DAY
+
+    def review(self, user, question, correct, now=None):
+        """Registra uma resposta e reagenda a questão (O(log Q))"""
+        now = time.time() if now is None else now
+        sid = self._state(user, question)
+        self._update(sid, correct, now)
+        # A entrada antiga fica no heap e é descartada quando aparecer (revisão diferente)
+        heapq.heappush(self.heaps[user], self.due[sid] << _ORDINAL_BITS | question)
+
+    def replay(self, answers):
+        """
+        Reproduz respostas históricas (usuário, questão, acertou, timestamp em segundos),
+        em ordem de tempo, e monta os heaps uma única vez no fim.
+        """
+        with instrument.span('scheduler.replay'):
+            count = 0
+            for user, question, correct, timestamp in sorted(answers, key=lambda a: a[3]):
+                self._update(self._state(user, question), correct, timestamp)
+                count += 1
+            due = self.due
+            for user, states in self.states.items():
+                heap = [due[sid] << _ORDINAL_BITS | question for question, sid in states.items()]
+                heapq.heapify(heap)
+                self.heaps[user] = heap
+        instrument.count('scheduler.replayed', count)
+        return count
+
+    def due_questions(self, user, count, now=None):
+        """Até `count` questões vencidas do usuário, da mais atrasada para a menos"""
+        now = time.time() if now is None else now
+        heap = self.heaps.get(user)
+        if not heap:
+            return []
+        states = self.states[user]
+        due = self.due
+        limit = (int(now) + 1) << _ORDINAL_BITS
+        chosen = []
+        keep = []
+        while heap and len(chosen) < count and heap[0] < limit:
+            key = heapq.heappop(heap)
+            question = key & _ORDINAL_MASK
+            if due[states[question]] != key >> _ORDINAL_BITS or question in chosen:
+                continue  # entrada antiga, já reagendada
+            chosen.append(question)
+            keep.append(key)
+        # Continuam agendadas até serem respondidas
+        for key in keep:
+            heapq.heappush(heap, key)
+        return chosen
+
+    def new_questions(self, user, count):
+        """Até `count` questões que o usuário ainda não viu, na ordem fixa do banco"""
+        states = self.states.get(user, {})
+        order = self.new_order
+        cursor = self.cursors.get(user, 0)
+        # O cursor só passa das já respondidas; as entregues continuam até serem respondidas
+        while cursor < len(order) and order[cursor] in states:
+            cursor += 1
+        self.cursors[user] = cursor
+        chosen = []
+        while cursor < len(order) and len(chosen) < count:
+            question = order[cursor]
+            cursor += 1
+            if question not in states:
+                chosen.append(question)
+        return chosen
+
+    def next_questions(self, user, count, now=None):
+        """Próximas `count` questões: primeiro as vencidas, depois as novas"""
+        chosen = self.due_questions(user, count, now)
+        if len(chosen) < count:
+            chosen.extend(self.new_questions(user, count - len(chosen)))
+        return chosen
+
+
+def load_answers(paths, questions_path=QUESTIONS_PATH):
+    """(usuário, ordinal da questão, acertou, timestamp em segundos) dos logs, e as questões do banco"""
+    with open(questions_path, 'r', encoding='utf-8') as f:
+        questions = json.load(f)
+    ordinals = {}
+    for ordinal, q in enumerate(questions):
+        ordinals.setdefault(question_key(q.get('question', '')), ordinal)
+    answers = []
+    for path in paths:
+        for answer in iter_answers(path):
+            ordinal = ordinals.get(question_key(answer.get('questionText', '')))
+            if ordinal is None:
+                continue
+            # timestamp de questionStats.ts vem de Date.now() (milissegundos)
+            answers.append((answer.get('userId', path), ordinal, bool(answer.get('isCorrect')),
+                            answer.get('timestamp', 0) / 1000))
+    return answers, questions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Próximas questões por revisão espaçada (SM-2)')
+    parser.add_argument('logs', nargs='+', help='arquivos JSONL ou lista JSON de respostas')
+    parser.add_argument('--user', help='usuário (userId do log; sem userId, o caminho do arquivo)')
+    parser.add_argument('--count', type=int, default=10)
+    parser.add_argument('--now', type=float, default=None, help='timestamp em segundos (padrão: agora)')
+    parser.add_argument('--questions', default=QUESTIONS_PATH)
+    args = parser.parse_args(argv)
+
+    answers, questions = load_answers(args.logs, args.questions)
+    scheduler = Scheduler(len(questions))
+    scheduler.replay(answers)
+    user = args.user if args.user is not None else args.logs[0]
+    if user not in scheduler.states and user.isdigit() and int(user) in scheduler.states:
+        user = int(user)
+    print(f"✅ {len(answers)} respostas de {len(scheduler.states)} usuários reproduzidas")
+    now = time.time() if args.now is None else args.now
+    due = set(scheduler.due_questions(user, args.count, now))
+    for ordinal in scheduler.next_questions(user, args.count, now):
+        tag = 'revisão' if ordinal in due else 'nova'
+        print(f"- [{tag}] {questions[ordinal]['question']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,546 @@
+#!/usr/bin/env python3
+"""
+Busca textual (BM25) na pergunta, nas opções e na dica das questões.
+
+Tokenização para português: acentos, caixa e pontuação são normalizados como
+na deduplicação, stopwords saem e um stemmer leve junta plural, feminino e
+advérbios em -mente ("transações" e "transação", "falsa" e "falso").
+
+O índice fica em Scam/src/data/questions.search/: um manifest.json e
+segmentos binários imutáveis (até SEGMENT_DOCS questões cada), lidos via mmap.
+Cada segmento tem, por termo, os ordinais das questões (deltas) e as
+frequências em varint, como em question_bank.inverted_index, mas codificados e
+decodificados com NumPy — uma consulta decodifica e pontua todas as postings de
+um termo de uma vez. A pergunta pesa o dobro das opções e da dica.
+
+Atualização incremental: a compactação só acrescenta questões no fim do
+questions.json, então o manifesto guarda o hash do trecho já indexado; se ele
+não mudou, só as questões novas são lidas e viram um segmento novo. Qualquer
+outra mudança (ou segmentos pequenos demais acumulados) refaz o índice.
+
+Uso:
+    python3 -m question_bank.search update
+    python3 -m question_bank.search build
+    python3 -m question_bank.search query "pix falso" [--limit 10]
+"""
+import argparse
+import functools
+import hashlib
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+import numpy as np
+
+from question_bank import instrument
+from question_bank.dedupe import normalize_text
+from question_bank.store import QUESTIONS_PATH, write_atomic
+from question_bank.validate import iter_items
+
+SEARCH_DIR = 'Scam/src/data/questions.search'
+MANIFEST = 'manifest.json'
+MAGIC = b'QSRC'
+VERSION = 1
+SECTIONS = ('doc_lengths', 'doc_offsets', 'term_offsets', 'term_data', 'df',
+            'doc_starts', 'tf_starts', 'doc_data', 'tf_data')
+# magic, versão, reservado, primeiro ordinal, questões, termos
+_HEADER = struct.Struct('<4sHHQII' + 'QQ' * len(SECTIONS))
+
+# Peso (inteiro) de cada campo na frequência do termo
+FIELDS = (('question', 2), ('options', 1), ('tip', 1))
+K1 = 1.2
+B = 0.75
+SEGMENT_DOCS = 100000
+# Segmentos além do necessário antes de refazer tudo em segmentos cheios
+MAX_EXTRA_SEGMENTS = 8
+HASH_CHUNK = 1024 * 1024
+
+STOPWORDS = frozenset("""
+a o as os um uma uns umas de do da dos das em no na nos nas num numa por pelo pela pelos pelas
+para pra com sem sob ao aos e ou mas que se nao sim ja mais menos muito muita como quando onde
+qual quais quem seu sua seus suas meu minha teu tua ele ela eles elas voce voces isso isto esse
+essa esses essas este esta estes estas aquele aquela lhe lhes me te nos vos ser sao foi era
+estao tem ter ha so tambem entre ate apos
+""".split())
+
+
+def _pad(n):
+    return (8 - n % 8) % 8
+
+
+@functools.lru_cache(maxsize=1 << 16)
+def stem(word):
+    """Stemmer leve: plural, -mente e vogal final (gênero)"""
+    if len(word) <= 3 or word.isdigit():
+        return word
+    if word.endswith(('oes', 'aes')):
+        word = word[:-3] + 'ao'
+    elif word.endswith(('ais', 'eis', 'ois')):
+        word = word[:-2] + 'l'
+    elif word.endswith('ns'):
+        word = word[:-2] + 'm'
+    elif word.endswith(('res', 'zes')):
+        word = word[:-2]
+    elif word.endswith('s') and not word.endswith('ss'):
+        word = word[:-1]
+    if len(word) > 7 and word.endswith('mente'):
+        word = word[:-5]
+    if len(word) > 4 and word[-1] in 'aoe':
+        word = word[:-1]
+    return word
+
+
+def tokenize(text):
+    """Termos (já com stem) de um texto, na ordem, sem stopwords"""
+    return [stem(word) for word in normalize_text(text).split() if word not in STOPWORDS]
+
+
+def document_terms(item):
+    """Frequência ponderada de cada termo da questão (pergunta, opções e dica)"""
+    if not isinstance(item, dict):
+        return {}
+    options = item.get('options')
+    texts = {
+        'question': item.get('question') or '',
+        'options': ' '.join(o.get('text') or '' for o in options if isinstance(o, dict))
+        if isinstance(options, list) else '',
+        'tip': item.get('tip') or '',
+    }
+    counts = {}
+    for field, weight in FIELDS:
+        if not isinstance(texts[field], str):
+            continue
+        for term in tokenize(texts[field]):
+            counts[term] = counts.get(term, 0) + weight
+    return counts
+
+
+def _encode_varints(values):
+    """LEB128 de um array inteiro inteiro, vetorizado; retorna (bytes, tamanho de cada valor)"""
+    values = np.asarray(values, dtype=np.uint64)
+    sizes = np.ones(len(values), dtype=np.int64)
+    rest = values >> 7
+    while rest.any():
+        sizes += rest > 0
+        rest >>= 7
+    ends = np.cumsum(sizes)
+    out = np.empty(int(ends[-1]) if len(ends) else 0, dtype=np.uint8)
+    starts = ends - sizes
+    rest = values
+    for k in range(int(sizes.max(initial=0))):
+        live = sizes > k
+        more = (sizes[live] > k + 1).astype(np.uint8) << 7
+        out[starts[live] + k] = (rest[live] & 0x7F).astype(np.uint8) | more
+        rest = rest >> 7
+    return out.tobytes(), sizes
+
+
+def _decode_varints(data):
+    """Inverso de _encode_varints para um trecho de bytes"""
+    data = np.frombuffer(data, dtype=np.uint8)
+    if not len(data) or data.max() < 0x80:
+        return data.astype(np.int64)
+    ends = np.flatnonzero(data < 0x80)
+    starts = np.empty_like(ends)
+    starts[0] = 0
+    starts[1:] = ends[:-1] + 1
+    shift = np.arange(len(data)) - np.repeat(starts, ends - starts + 1)
+    return np.add.reduceat((data & 0x7F).astype(np.int64) << (7 * shift), starts)
+
+
+class SegmentWriter:
+    """Acumula questões em arrays planos (termo, questão, frequência) e grava um segmento"""
+
+    def __init__(self, doc_base):
+        self.doc_base = doc_base
+        self.vocabulary = {}
+        self.term_ids = array('I')
+        self.doc_ids = array('I')
+        self.tfs = array('I')
+        self.lengths = array('I')
+        self.offsets = array('Q')
+
+    def __len__(self):
+        return len(self.lengths)
+
+    def add(self, item, offset):
+        doc = len(self.lengths)
+        counts = document_terms(item)
+        vocabulary = self.vocabulary
+        for term, tf in counts.items():
+            tid = vocabulary.get(term)
+            if tid is None:
+                tid = vocabulary[term] = len(vocabulary)
+            self.term_ids.append(tid)
+            self.doc_ids.append(doc)
+            self.tfs.append(tf)
+        self.lengths.append(sum(counts.values()))
+        self.offsets.append(offset)
+
+    def write(self, path):
+        terms = sorted(self.vocabulary)
+        rank = np.empty(len(terms), dtype=np.int64)
+        rank[[self.vocabulary[t] for t in terms]] = np.arange(len(terms))
+        term_rank = rank[np.frombuffer(self.term_ids, dtype=np.uint32)]
+        # Estável: dentro de cada termo, as questões continuam em ordem crescente
+        order = np.argsort(term_rank, kind='stable')
+        docs = np.frombuffer(self.doc_ids, dtype=np.uint32).astype(np.int64)[order]
+        tfs = np.frombuffer(self.tfs, dtype=np.uint32)[order]
+        df = np.bincount(term_rank, minlength=len(terms))
+        first = np.concatenate(([0], np.cumsum(df)))
+        deltas = np.diff(docs, prepend=0)
+        # A primeira questão de cada termo fica absoluta
+        deltas[first[:-1]] = docs[first[:-1]]
+        doc_data, doc_sizes = _encode_varints(deltas)
+        tf_data, tf_sizes = _encode_varints(tfs)
+        doc_starts = np.concatenate(([0], np.cumsum(doc_sizes)))[first]
+        tf_starts = np.concatenate(([0], np.cumsum(tf_sizes)))[first]
+
+        encoded = [t.encode('utf-8') for t in terms]
+        term_offsets = np.concatenate(([0], np.cumsum([len(t) for t in encoded], dtype=np.int64)))
+        sections = {
+            'doc_lengths': self.lengths.tobytes(),
+            'doc_offsets': self.offsets.tobytes(),
+            'term_offsets': term_offsets.astype('<u8').tobytes(),
+            'term_data': b''.join(encoded),
+            'df': df.astype('<u4').tobytes(),
+            'doc_starts': doc_starts.astype('<u8').tobytes(),
+            'tf_starts': tf_starts.astype('<u8').tobytes(),
+            'doc_data': doc_data,
+            'tf_data': tf_data,
+        }
+        position = _HEADER.size + _pad(_HEADER.size)
+        layout = []
+        for name in SECTIONS:
+            layout.extend((position, len(sections[name])))
+            position += len(sections[name]) + _pad(len(sections[name]))
+
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, 0, self.doc_base, len(self.lengths), len(terms), *layout))
+            f.write(b'\0' * _pad(_HEADER.size))
+            for name in SECTIONS:
+                f.write(sections[name])
+                f.write(b'\0' * _pad(len(sections[name])))
+        os.replace(tmp_path, path)
+        return sum(self.lengths)
+
+
+class Segment:
+    """Leitor mmap de um segmento; as colunas são arrays NumPy sobre o mmap (zero-copy)"""
+
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        header = _HEADER.unpack_from(self._mm, 0)
+        magic, version, _, self.doc_base, self.n_docs, self.n_terms = header[:6]
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f'{path} não é um segmento de busca versão {VERSION}')
+        layout = header[6:]
+        self._sections = {name: (layout[2 * i], layout[2 * i + 1]) for i, name in enumerate(SECTIONS)}
+        self.doc_lengths = self._array('doc_lengths', np.uint32)
+        self.doc_offsets = self._array('doc_offsets', np.uint64)
+        self._term_offsets = self._array('term_offsets', np.uint64).tolist()
+        self._df = self._array('df', np.uint32)
+        self._doc_starts = self._array('doc_starts', np.uint64)
+        self._tf_starts = self._array('tf_starts', np.uint64)
+
+    def _array(self, name, dtype):
+        start, size = self._sections[name]
+        return np.frombuffer(self._mm, dtype=dtype, count=size // np.dtype(dtype).itemsize, offset=start)
+
+    def _bytes(self, name, start, end):
+        base = self._sections[name][0]
+        return self._mm[base + start:base + end]
+
+    def find(self, term):
+        """Posição do termo no dicionário (busca binária nos termos ordenados) ou None"""
+        key = term.encode('utf-8')
+        offsets = self._term_offsets
+        lo, hi = 0, self.n_terms
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._bytes('term_data', offsets[mid], offsets[mid + 1]) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.n_terms and self._bytes('term_data', offsets[lo], offsets[lo + 1]) == key:
+            return lo
+        return None
+
+    def df(self, tid):
+        return int(self._df[tid])
+
+    def postings(self, tid):
+        """(questões locais ao segmento, frequências) de um termo"""
+        doc_start, doc_end = int(self._doc_starts[tid]), int(self._doc_starts[tid + 1])
+        tf_start, tf_end = int(self._tf_starts[tid]), int(self._tf_starts[tid + 1])
+        docs = np.cumsum(_decode_varints(self._bytes('doc_data', doc_start, doc_end)))
+        tfs = _decode_varints(self._bytes('tf_data', tf_start, tf_end))
+        return docs, tfs
+
+    def close(self):
+        # Os arrays sobre o mmap precisam ser liberados antes de fechar
+        self.doc_lengths = self.doc_offsets = self._df = self._doc_starts = self._tf_starts = None
+        self._mm.close()
+        self._file.close()
+
+
+def _signature(path):
+    stat = os.stat(path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _read_manifest(index_dir):
+    try:
+        with open(os.path.join(index_dir, MANIFEST), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifest if manifest.get('version') == VERSION else None
+
+
+def _digest(f, size):
+    """Hash dos primeiros `size` bytes do arquivo"""
+    digest = hashlib.blake2b(digest_size=16)
+    f.seek(0)
+    remaining = size
+    while remaining > 0:
+        chunk = f.read(min(HASH_CHUNK, remaining))
+        if not chunk:
+            break
+        digest.update(chunk)
+        remaining -= len(chunk)
+    return digest.hexdigest()
+
+
+def _indexed_end(f):
+    """Fim do último item da lista (antes do ']' final e do espaço em branco que o precede)"""
+    f.seek(0, os.SEEK_END)
+    size = f.tell()
+    f.seek(max(0, size - 4096))
+    tail = f.read()
+    stripped = tail.rstrip()
+    if not stripped.endswith(b']'):
+        raise ValueError('questions.json não termina com uma lista JSON')
+    return size - len(tail) + len(stripped[:-1].rstrip())
+
+
+class _Resume:
+    """Arquivo que começa com '[' e continua a partir de `position` (para iter_items)"""
+
+    def __init__(self, f, position):
+        self._f = f
+        self._head = b'['
+        f.seek(position)
+
+    def read(self, size):
+        head, self._head = self._head, b''
+        return head + self._f.read(max(0, size - len(head)))
+
+
+def _items_after(f, position):
+    """Gera (item, offset) das questões depois de `position` (fim do trecho já indexado)"""
+    if position == 0:
+        f.seek(0)
+        for item, _, offset in iter_items(f):
+            yield item, offset
+        return
+    f.seek(position)
+    start = position
+    while True:
+        data = f.read(4096)
+        if not data:
+            return
+        stripped = data.lstrip(b' \t\r\n,')
+        if stripped:
+            start += len(data) - len(stripped)
+            break
+        start += len(data)
+    if stripped.startswith(b']'):
+        return
+    for item, _, offset in iter_items(_Resume(f, start)):
+        yield item, start + offset - 1
+
+
+@instrument.span('search.update')
+def update_index(questions_path=QUESTIONS_PATH, index_dir=SEARCH_DIR, rebuild=False):
+    """
+    Atualiza o índice: só as questões acrescentadas desde a última vez, ou tudo
+    se o trecho já indexado mudou. Retorna contagens da atualização.
+    """
+    os.makedirs(index_dir, exist_ok=True)
+    previous = _read_manifest(index_dir)
+    manifest = None if rebuild else previous
+    signature = _signature(questions_path)
+    if manifest is not None and manifest['signature'] == signature:
+        return {'added': 0, 'rebuilt': False, 'docs': manifest['docs'], 'segments': len(manifest['segments'])}
+
+    with open(questions_path, 'rb') as f:
+        if manifest is not None:
+            full = math.ceil(manifest['docs'] / SEGMENT_DOCS)
+            if (len(manifest['segments']) > full + MAX_EXTRA_SEGMENTS
+                    or manifest['prefix'] > signature[1]
+                    or _digest(f, manifest['prefix']) != manifest['digest']):
+                manifest = None
+        rebuilt = manifest is None
+        if rebuilt:
+            # Numeração continua: os segmentos do manifesto atual só somem depois do novo gravado
+            manifest = {'docs': 0, 'length': 0, 'segments': [], 'prefix': 0,
+                        'next': previous['next'] if previous else 1}
+
+        docs, length, added = manifest['docs'], manifest['length'], 0
+        segments = list(manifest['segments'])
+        number = manifest['next']
+        writer = SegmentWriter(docs)
+
+        def flush():
+            nonlocal number, length
+            name = f'{number:06d}.seg'
+            length += writer.write(os.path.join(index_dir, name))
+            segments.append(name)
+            number += 1
+
+        for item, offset in _items_after(f, manifest['prefix']):
+            writer.add(item, offset)
+            added += 1
+            if len(writer) >= SEGMENT_DOCS:
+                flush()
+                writer = SegmentWriter(docs + added)
+        if len(writer):
+            flush()
+        prefix = _indexed_end(f)
+        digest = _digest(f, prefix)
+
+    manifest = {'version': VERSION, 'docs': docs + added, 'length': length, 'segments': segments,
+                'next': number, 'prefix': prefix, 'digest': digest, 'signature': signature}
+    write_atomic(os.path.join(index_dir, MANIFEST), json.dumps(manifest, indent=2).encode('utf-8'))
+    # Segmentos que saíram do manifesto (índice refeito)
+    for name in os.listdir(index_dir):
+        if name.endswith('.seg') and name not in segments:
+            os.remove(os.path.join(index_dir, name))
+    instrument.count('search.indexed', added)
+    return {'added': added, 'rebuilt': rebuilt, 'docs': docs + added, 'segments': len(segments)}
+
+
+class SearchIndex:
+    """Consultas BM25 sobre os segmentos do manifesto"""
+
+    def __init__(self, index_dir=SEARCH_DIR, questions_path=QUESTIONS_PATH):
+        manifest = _read_manifest(index_dir)
+        if manifest is None:
+            raise FileNotFoundError(f'{index_dir} não tem um índice de busca; execute `update`')
+        self.docs = manifest['docs']
+        self.avgdl = manifest['length'] / self.docs if self.docs else 1.0
+        self.segments = [Segment(os.path.join(index_dir, name)) for name in manifest['segments']]
+        self.stale = _signature(questions_path) != manifest['signature']
+        self._norm_cache = {}
+        self._json = open(questions_path, 'rb')
+        self._decoder = json.JSONDecoder()
+
+    def _norms(self, k):
+        """Normalização de tamanho do BM25 de cada questão do segmento k (calculada uma vez)"""
+        norms = self._norm_cache.get(k)
+        if norms is None:
+            lengths = self.segments[k].doc_lengths
+            norms = self._norm_cache[k] = K1 * (1 - B + B * lengths / self.avgdl)
+        return norms
+
+    def search(self, query, limit=10):
+        """Até `limit` resultados (ordinal, score, offset no JSON), do mais relevante para o menos"""
+        terms = list(dict.fromkeys(tokenize(query))) if limit > 0 else []
+        found = [[seg.find(term) for seg in self.segments] for term in terms]
+        scores, ordinals, offsets = [], [], []
+        idf = []
+        for tids in found:
+            df = sum(seg.df(tid) for seg, tid in zip(self.segments, tids) if tid is not None)
+            idf.append(math.log(1 + (self.docs - df + 0.5) / (df + 0.5)))
+        for k, seg in enumerate(self.segments):
+            acc = None
+            for weight, tids in zip(idf, found):
+                if tids[k] is None:
+                    continue
+                docs, tfs = seg.postings(tids[k])
+                if acc is None:
+                    acc = np.zeros(seg.n_docs)
+                acc[docs] += weight * tfs * (K1 + 1) / (tfs + self._norms(k)[docs])
+            if acc is None:
+                continue
+            # Máscara booleana antes: flatnonzero direto no float e argpartition com muitos zeros são lentos
+            hits = np.flatnonzero(acc > 0)
+            if len(hits) > limit:
+                hits = hits[np.argpartition(acc[hits], -limit)[-limit:]]
+            scores.append(acc[hits])
+            ordinals.append(hits + seg.doc_base)
+            offsets.append(seg.doc_offsets[hits])
+        if not scores:
+            return []
+        scores, ordinals, offsets = np.concatenate(scores), np.concatenate(ordinals), np.concatenate(offsets)
+        # Empates: ordinal menor primeiro
+        order = np.lexsort((ordinals, -scores))[:limit]
+        return [(int(ordinals[i]), float(scores[i]), int(offsets[i])) for i in order]
+
+    def get(self, offset):
+        """Questão que começa em `offset` no questions.json"""
+        size = 16 * 1024
+        while True:
+            self._json.seek(offset)
+            data = self._json.read(size)
+            try:
+                item, _ = self._decoder.raw_decode(data.decode('utf-8', errors='ignore'))
+                return item
+            except json.JSONDecodeError:
+                if len(data) < size:
+                    raise
+                size *= 4
+
+    def close(self):
+        for seg in self.segments:
+            seg.close()
+        self._json.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Busca textual (BM25) no banco de questões')
+    parser.add_argument('--questions', default=QUESTIONS_PATH)
+    parser.add_argument('--index', default=SEARCH_DIR)
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('update', help='indexa só as questões novas (ou refaz, se necessário)')
+    sub.add_parser('build', help='refaz o índice do zero')
+    query = sub.add_parser('query', help='mostra as questões mais relevantes')
+    query.add_argument('text')
+    query.add_argument('--limit', type=int, default=10)
+    args = parser.parse_args(argv)
+
+    if args.command in ('update', 'build'):
+        stats = update_index(args.questions, args.index, rebuild=args.command == 'build')
+        action = 'refeito' if stats['rebuilt'] else 'atualizado'
+        print(f"✅ Índice {action}: {stats['added']} questões novas, {stats['docs']} no total "
+              f"em {stats['segments']} segmentos ({args.index})")
+        return 0
+
+    with SearchIndex(args.index, args.questions) as index:
+        if index.stale:
+            print("⚠️  questions.json mudou desde a última indexação; execute `update`")
+        results = index.search(args.text, args.limit)
+        if not results:
+            print("Nenhuma questão encontrada")
+            return 1
+        for ordinal, score, offset in results:
+            item = index.get(offset)
+            print(f"{score:6.2f}  #{ordinal}  {item.get('question', '')}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
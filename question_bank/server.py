@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Serviço HTTP local de questões (asyncio, só biblioteca padrão).
+
+O questions.json é lido uma vez na inicialização. Cada questão é serializada
+uma única vez (com o campo `id` de question_bank.ids), o sorteio usa as
+tabelas alias do QuizSampler e os bundles por interesse são montados e
+comprimidos com gzip antes de o servidor aceitar conexões. Responder a uma
+requisição é só sortear ordinais e concatenar bytes prontos.
+
+Rotas:
+    GET /questions?interests=Games,Tecnologia&count=10
+        `count` questões distintas ponderadas pela relevância (como
+        getRandomQuestions); sem interesses o sorteio é uniforme
+    GET /questions/{id}
+        uma questão pelo ID estável, com ETag (If-None-Match → 304)
+    GET /bundles/manifest.json e GET /bundles/shard-*.json
+        bundles de question_bank.bundles, já comprimidos (Accept-Encoding: gzip),
+        com ETag; os shards têm hash no nome e cache imutável
+
+Uso:
+    python3 -m question_bank.server [--host 127.0.0.1] [--port 8765]
+"""
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import random
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from question_bank import instrument
+from question_bank.bundles import MANIFEST_NAME, render_bundles
+from question_bank.ids import question_id
+from question_bank.sampler import QuizSampler
+from question_bank.store import QUESTIONS_PATH
+
+HOST = '127.0.0.1'
+PORT = 8765
+DEFAULT_COUNT = 10
+MAX_COUNT = 100
+MAX_HEADER_BYTES = 16 * 1024
+MAX_BODY_BYTES = 64 * 1024
+
+REASONS = {200: 'OK', 304: 'Not Modified', 400: 'Bad Request', 404: 'Not Found',
+           405: 'Method Not Allowed', 413: 'Content Too Large', 431: 'Request Header Fields Too Large'}
+JSON_TYPE = 'application/json; charset=utf-8'
+
+
+class StaticResponse:
+    """Corpo pronto de um arquivo, em versão normal e comprimida"""
+
+    __slots__ = ('body', 'gzipped', 'etag', 'gzip_etag', 'cache_control')
+
+    def __init__(self, body, cache_control):
+        self.body = body
+        self.gzipped = gzip.compress(body, compresslevel=9, mtime=0)
+        digest = hashlib.sha256(body).hexdigest()[:16]
+        # ETag forte identifica uma representação só: a comprimida tem a sua
+        self.etag = f'"{digest}"'
+        self.gzip_etag = f'"{digest}-gz"'
+        self.cache_control = cache_control
+
+
+class QuestionService:
+    """Estruturas em memória e roteamento; independente do transporte"""
+
+    def __init__(self, questions_path=QUESTIONS_PATH, rng=None):
+        with open(questions_path, 'rb') as f:
+            data = f.read()
+        questions = json.loads(data)
+        self.version = hashlib.sha256(data).hexdigest()[:12]
+        self.rng = rng or random.Random()
+        self.sampler = QuizSampler(questions)
+        self.ids = [question_id(q) for q in questions]
+        self.by_id = {}
+        for ordinal, qid in enumerate(self.ids):
+            self.by_id.setdefault(qid, ordinal)
+        self.encoded = [json.dumps(dict(q, id=qid), ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+                        for q, qid in zip(questions, self.ids)]
+
+        manifest, files = render_bundles(questions)
+        self.static = {
+            f'/bundles/{name}': StaticResponse(body, 'public, max-age=31536000, immutable')
+            for name, body in files.items()
+        }
+        self.static[f'/bundles/{MANIFEST_NAME}'] = StaticResponse(
+            json.dumps(manifest, ensure_ascii=False).encode('utf-8'), 'no-cache')
+
+    def handle(self, method, target, headers):
+        """Retorna (status, cabeçalhos extras, corpo)"""
+        if method not in ('GET', 'HEAD'):
+            return 405, {'Allow': 'GET, HEAD'}, b''
+        url = urlsplit(target)
+        path = url.path
+
+        if path == '/questions':
+            return self._sample(parse_qs(url.query))
+        if path.startswith('/questions/'):
+            return self._by_id(unquote(path[len('/questions/'):]), headers)
+        static = self.static.get(path)
+        if static is not None:
+            return self._static(static, headers)
+        return 404, {}, b'{"error":"not found"}'
+
+    def _sample(self, query):
+        interests = [i for value in query.get('interests', ()) for i in value.split(',') if i]
+        try:
+            count = int(query.get('count', [DEFAULT_COUNT])[0])
+        except ValueError:
+            return 400, {}, b'{"error":"count deve ser um inteiro"}'
+        count = max(0, min(count, MAX_COUNT))
+        ordinals = self.sampler.sample_ordinals(count, interests, self.rng)
+        encoded = self.encoded
+        body = b'[' + b','.join([encoded[o] for o in ordinals]) + b']'
+        return 200, {'Cache-Control': 'no-store'}, body
+
+    def _by_id(self, qid, headers):
+        ordinal = self.by_id.get(qid)
+        if ordinal is None:
+            return 404, {}, b'{"error":"questao nao encontrada"}'
+        # O ID cobre pergunta e opções; dica e interesses mudam com a versão do banco
+        etag = f'"{qid}-{self.version}"'
+        extra = {'ETag': etag, 'Cache-Control': 'no-cache'}
+        if headers.get('if-none-match') == etag:
+            return 304, extra, b''
+        return 200, extra, self.encoded[ordinal]
+
+    def _static(self, static, headers):
+        gzipped = 'gzip' in headers.get('accept-encoding', '')
+        etag = static.gzip_etag if gzipped else static.etag
+        extra = {'ETag': etag, 'Cache-Control': static.cache_control, 'Vary': 'Accept-Encoding'}
+        if gzipped:
+            extra['Content-Encoding'] = 'gzip'
+        if headers.get('if-none-match') == etag:
+            return 304, extra, b''
+        return 200, extra, static.gzipped if gzipped else static.body
+
+
+def render_response(status, extra, body, keep_alive, head=False):
+    lines = [f'HTTP/1.1 {status} {REASONS[status]}', 'Access-Control-Allow-Origin: *']
+    if status != 304:
+        lines.append(f'Content-Length: {len(body)}')
+        lines.append(f'Content-Type: {JSON_TYPE}')
+    lines.extend(f'{name}: {value}' for name, value in extra.items())
+    if not keep_alive:
+        lines.append('Connection: close')
+    header = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+    return header if head or status == 304 else header + body
+
+
+async def serve_connection(service, reader, writer):
+    try:
+        while True:
+            try:
+                raw = await reader.readuntil(b'\r\n\r\n')
+            except asyncio.LimitOverrunError:
+                writer.write(render_response(431, {}, b'', False))
+                break
+            except (asyncio.IncompleteReadError, ConnectionError):
+                break
+            request_line, *header_lines = raw.decode('latin-1').split('\r\n')
+            try:
+                method, target, version = request_line.split(' ', 2)
+            except ValueError:
+                writer.write(render_response(400, {}, b'', False))
+                break
+            headers = {}
+            for line in header_lines:
+                name, sep, value = line.partition(':')
+                if sep:
+                    headers[name.strip().lower()] = value.strip()
+            connection = headers.get('connection', '').lower()
+            keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+
+            # Corpo de requisição não é usado por nenhuma rota; é descartado
+            try:
+                length = int(headers.get('content-length') or 0)
+            except ValueError:
+                length = -1
+            if length < 0:
+                writer.write(render_response(400, {}, b'', False))
+                break
+            if length > MAX_BODY_BYTES:
+                writer.write(render_response(413, {}, b'', False))
+                break
+            if length:
+                await reader.readexactly(length)
+
+            status, extra, body = service.handle(method, target, headers)
+            instrument.count(f'server.{status}')
+            writer.write(render_response(status, extra, body, keep_alive, method == 'HEAD'))
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(service, host=HOST, port=PORT):
+    server = await asyncio.start_server(lambda r, w: serve_connection(service, r, w),
+                                        host, port, limit=MAX_HEADER_BYTES)
+    print(f"✅ {len(service.encoded)} questões em http://{host}:{port}/questions", flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serviço HTTP local de questões')
+    parser.add_argument('--questions', default=QUESTIONS_PATH)
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    args = parser.parse_args(argv)
+
+    with instrument.span('server.load'):
+        service = QuestionService(args.questions)
+    try:
+        asyncio.run(serve(service, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Armazenamento append-only das questões.
+
+Questões novas são gravadas em segmentos JSONL (uma questão por linha) e só
+depois a compactação as junta ao questions.json lido pelo front-end. Assim,
+adicionar uma questão não exige carregar nem reescrever o banco inteiro.
+
+Uso:
+    python3 -m question_bank.store status
+    python3 -m question_bank.store compact [--no-dedupe] [--threshold 0.8]
+"""
+import argparse
+import json
+import os
+
+from question_bank import instrument
+
+QUESTIONS_PATH = 'Scam/src/data/questions.json'
+SEGMENTS_DIR = 'Scam/src/data/segments'
+
+# Tamanho a partir do qual um novo segmento é aberto
+MAX_SEGMENT_BYTES = 64 * 1024 * 1024
+
+COPY_CHUNK = 1024 * 1024
+
+# Segmentos já juntados a um questions.json que ainda não foram apagados
+JOURNAL_NAME = 'compacting.json'
+
+
+def format_item(question):
+    """Formata uma questão exatamente como json.dump(..., indent=2) faz dentro da lista"""
+    text = json.dumps(question, ensure_ascii=False, indent=2)
+    return '\n'.join('  ' + line for line in text.split('\n'))
+
+
+def write_atomic(path, data):
+    """Grava bytes em um temporário no mesmo diretório e troca com os.replace"""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class QuestionStore:
+    """Log de segmentos JSONL + artefato questions.json"""
+
+    def __init__(self, questions_path=QUESTIONS_PATH, segments_dir=SEGMENTS_DIR,
+                 max_segment_bytes=MAX_SEGMENT_BYTES):
+        self.questions_path = questions_path
+        self.segments_dir = segments_dir
+        self.max_segment_bytes = max_segment_bytes
+
+    def segment_paths(self):
+        """Segmentos pendentes, em ordem de criação"""
+        if not os.path.isdir(self.segments_dir):
+            return []
+        self._recover()
+        names = sorted(n for n in os.listdir(self.segments_dir) if n.endswith('.jsonl'))
+        return [os.path.join(self.segments_dir, n) for n in names]
+
+    def _active_segment(self):
+        paths = self.segment_paths()
+        if paths and os.path.getsize(paths[-1]) < self.max_segment_bytes:
+            return paths[-1]
+        number = int(os.path.basename(paths[-1])[:-len('.jsonl')]) + 1 if paths else 1
+        return os.path.join(self.segments_dir, f'{number:06d}.jsonl')
+
+    @instrument.span('store.append')
+    def append(self, questions):
+        """Grava as questões no fim do segmento ativo. Custo proporcional só às questões novas."""
+        count = 0
+        f = None
+        try:
+            for q in questions:
+                if f is None or f.tell() >= self.max_segment_bytes:
+                    if f is not None:
+                        f.flush()
+                        os.fsync(f.fileno())
+                        f.close()
+                    os.makedirs(self.segments_dir, exist_ok=True)
+                    f = open(self._active_segment(), 'a', encoding='utf-8')
+                f.write(json.dumps(q, ensure_ascii=False) + '\n')
+                count += 1
+            if f is not None:
+                f.flush()
+                os.fsync(f.fileno())
+        finally:
+            if f is not None:
+                f.close()
+        instrument.count('store.appended', count)
+        return count
+
+    def iter_pending(self):
+        """Percorre as questões ainda não compactadas"""
+        for path in self.segment_paths():
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        yield json.loads(line)
+
+    def pending_count(self):
+        count = 0
+        for path in self.segment_paths():
+            with open(path, 'rb') as f:
+                count += sum(1 for line in f if line.strip())
+        return count
+
+    def _recover(self):
+        """
+        Termina uma compactação interrompida. O diário lista os segmentos e o
+        (mtime, tamanho) do questions.json que já os contém: se o arquivo atual
+        é esse, os segmentos já foram juntados e só falta apagá-los; senão o
+        os.replace não aconteceu e eles continuam pendentes.
+        """
+        journal_path = os.path.join(self.segments_dir, JOURNAL_NAME)
+        try:
+            with open(journal_path, 'r', encoding='utf-8') as f:
+                journal = json.load(f)
+        except FileNotFoundError:
+            return
+        try:
+            stat = os.stat(self.questions_path)
+            merged = [stat.st_mtime_ns, stat.st_size] == journal['questions']
+        except FileNotFoundError:
+            merged = False
+        if merged:
+            for name in journal['segments']:
+                path = os.path.join(self.segments_dir, name)
+                if os.path.exists(path):
+                    os.remove(path)
+        os.remove(journal_path)
+
+    def _split_tail(self, f):
+        """Retorna (posição do ']' final, se a lista já tem itens) sem parsear o arquivo"""
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        tail = b''
+        while pos > 0:
+            step = min(4096, pos)
+            pos -= step
+            f.seek(pos)
+            tail = f.read(step) + tail
+            stripped = tail.rstrip()
+            if not stripped:
+                continue
+            if not stripped.endswith(b']'):
+                raise ValueError(f'{self.questions_path} não termina com uma lista JSON')
+            close = pos + len(stripped) - 1
+            before = stripped[:-1].rstrip()
+            if before:
+                return close, not before.endswith(b'[')
+        raise ValueError(f'{self.questions_path} não contém uma lista JSON')
+
+    @instrument.span('store.compact')
+    def compact(self, transform=None):
+        """
+        Junta os segmentos pendentes ao questions.json.
+
+        O conteúdo existente é copiado em blocos para um arquivo temporário
+        (sem json.load), as questões novas são anexadas e o resultado substitui
+        o original com os.replace. Antes da troca, um diário registra quais
+        segmentos o novo arquivo contém; assim, se o processo cair antes de
+        apagá-los, a próxima leitura dos segmentos termina o serviço em vez de
+        juntá-los de novo. `transform` pode filtrar/alterar a sequência de
+        questões pendentes.
+        """
+        segments = self.segment_paths()
+        if not segments:
+            return 0
+
+        pending = self.iter_pending()
+        if transform is not None:
+            pending = transform(pending)
+
+        tmp_path = self.questions_path + '.tmp'
+        added = 0
+        if os.path.exists(self.questions_path):
+            src = open(self.questions_path, 'rb')
+        else:
+            src = None
+        try:
+            with open(tmp_path, 'wb') as out:
+                if src is not None:
+                    close, has_items = self._split_tail(src)
+                    # Copia tudo até o último item, sem o '\n]' final
+                    remaining = close - _trailing_ws(src, close)
+                    src.seek(0)
+                    while remaining > 0:
+                        chunk = src.read(min(COPY_CHUNK, remaining))
+                        out.write(chunk)
+                        remaining -= len(chunk)
+                else:
+                    out.write(b'[')
+                    has_items = False
+
+                for q in pending:
+                    out.write((',\n' if has_items else '\n').encode('utf-8'))
+                    out.write(format_item(q).encode('utf-8'))
+                    has_items = True
+                    added += 1
+                out.write(b'\n]' if has_items else b']')
+                out.flush()
+                os.fsync(out.fileno())
+        finally:
+            if src is not None:
+                src.close()
+        stat = os.stat(tmp_path)
+        journal = {'segments': [os.path.basename(p) for p in segments],
+                   'questions': [stat.st_mtime_ns, stat.st_size]}
+        journal_path = os.path.join(self.segments_dir, JOURNAL_NAME)
+        write_atomic(journal_path, json.dumps(journal).encode('utf-8'))
+        os.replace(tmp_path, self.questions_path)
+
+        for path in segments:
+            os.remove(path)
+        os.remove(journal_path)
+        instrument.count('compact.written', added)
+        return added
+
+
+def _trailing_ws(f, close):
+    """Quantos bytes de espaço em branco precedem a posição `close`"""
+    start = max(0, close - 4096)
+    f.seek(start)
+    data = f.read(close - start)
+    return len(data) - len(data.rstrip())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Log append-only do banco de questões')
+    parser.add_argument('--questions', default=QUESTIONS_PATH)
+    parser.add_argument('--segments', default=SEGMENTS_DIR)
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('status', help='mostra quantas questões aguardam compactação')
+    compact = sub.add_parser('compact', help='junta os segmentos ao questions.json')
+    compact.add_argument('--no-dedupe', action='store_true',
+                         help='não descarta questões quase duplicadas antes de juntar')
+    compact.add_argument('--threshold', type=float, default=0.8,
+                         help='similaridade mínima para considerar duplicata')
+    args = parser.parse_args(argv)
+
+    store = QuestionStore(args.questions, args.segments)
+    if args.command == 'status':
+        print(f"Segmentos pendentes: {len(store.segment_paths())}")
+        print(f"Questões pendentes: {store.pending_count()}")
+    elif args.command == 'compact':
+        transform = None
+        if not args.no_dedupe and store.segment_paths():
+            from question_bank.dedupe import dedupe_transform
+            existing = []
+            # Sem questions.json a compactação cria o arquivo; nada a comparar
+            if os.path.exists(args.questions):
+                with open(args.questions, 'r', encoding='utf-8') as f:
+                    existing = json.load(f)
+            transform = dedupe_transform(existing, args.threshold)
+        added = store.compact(transform=transform)
+        print(f"✅ Compactadas {added} questões em {args.questions}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Validador em streaming do banco de questões.
+
+O arquivo é lido em blocos e cada item da lista é decodificado com
+JSONDecoder.raw_decode assim que termina de chegar, então a memória usada não
+depende do tamanho do banco (só do maior item). Cada item passa por um schema
+pré-compilado e as falhas são reportadas com linha e offset em bytes.
+
+Uso:
+    python3 -m question_bank.validate [Scam/src/data/questions.json] [--max-errors 50]
+    python3 -m question_bank.validate Scam/src/data/segments/000001.jsonl
+"""
+import argparse
+import codecs
+import json
+import sys
+
+from question_bank import instrument
+from question_bank.interests import INTERESTS_PATH, load_interest_names
+from question_bank.store import QUESTIONS_PATH
+
+CHUNK_SIZE = 1024 * 1024
+LABELS = ('A', 'B', 'C', 'D')
+_WHITESPACE = ' \t\r\n'
+
+
+class ValidationError:
+    __slots__ = ('index', 'line', 'offset', 'message')
+
+    def __init__(self, index, line, offset, message):
+        self.index = index
+        self.line = line
+        self.offset = offset
+        self.message = message
+
+    def __str__(self):
+        return f"linha {self.line} (byte {self.offset}) item #{self.index}: {self.message}"
+
+
+class StreamError(Exception):
+    """JSON malformado: não dá para continuar lendo"""
+
+    def __init__(self, line, offset, message):
+        super().__init__(f"linha {line} (byte {offset}): {message}")
+        self.line = line
+        self.offset = offset
+
+
+def iter_items(f, chunk_size=CHUNK_SIZE):
+    """
+    Gera (item, linha, offset em bytes) para cada elemento da lista JSON em `f`
+    (aberto em modo binário), sem carregar o arquivo inteiro.
+    """
+    decoder = json.JSONDecoder()
+    decoder_buf = ''
+    # Guarda os bytes de um caractere UTF-8 cortado no fim do bloco até o próximo
+    utf8 = codecs.getincrementaldecoder('utf-8')()
+    mark = 0               # posição em `decoder_buf` cuja linha/offset já são conhecidos
+    line = 1               # linha de `mark`
+    offset = 0             # offset em bytes de `mark`
+    eof = False
+    state = 'start'        # start -> item -> separator -> ... -> end
+    pos = 0
+
+    def here():
+        """Linha e offset de `pos`, contando só o trecho desde a última marca"""
+        nonlocal mark, line, offset
+        line += decoder_buf.count('\n', mark, pos)
+        offset += len(decoder_buf[mark:pos].encode('utf-8'))
+        mark = pos
+        return line, offset
+
+    def fill():
+        nonlocal decoder_buf, eof, pos, mark
+        data = f.read(chunk_size)
+        if not data:
+            eof = True
+            try:
+                utf8.decode(b'', final=True)
+            except UnicodeDecodeError:
+                raise StreamError(*here(), 'UTF-8 inválido no fim do arquivo')
+            return
+        here()
+        # Com blocos menores que um caractere o texto pode vir vazio; quem chama lê de novo
+        decoder_buf = decoder_buf[pos:] + utf8.decode(data)
+        pos = mark = 0
+
+    def skip_ws():
+        nonlocal pos
+        while True:
+            while pos < len(decoder_buf) and decoder_buf[pos] in _WHITESPACE:
+                pos += 1
+            if pos < len(decoder_buf) or eof:
+                return
+            fill()
+
+    while True:
+        skip_ws()
+        if pos >= len(decoder_buf):
+            if state != 'end':
+                raise StreamError(*here(), 'fim inesperado do arquivo')
+            return
+        ch = decoder_buf[pos]
+        if state == 'start':
+            if ch != '[':
+                raise StreamError(*here(), "o arquivo deve ser uma lista JSON ('[')")
+            pos += 1
+            skip_ws()
+            if pos < len(decoder_buf) and decoder_buf[pos] == ']':
+                pos += 1
+                state = 'end'
+            else:
+                state = 'item'
+        elif state == 'item':
+            while True:
+                try:
+                    item, end = decoder.raw_decode(decoder_buf, pos)
+                    # Um número pode estar cortado no fim do bloco: exige um caractere depois
+                    if end < len(decoder_buf) or eof:
+                        break
+                except json.JSONDecodeError as e:
+                    if eof:
+                        raise StreamError(*here(), f'JSON inválido: {e.msg}')
+                fill()
+            item_line, item_offset = here()
+            yield item, item_line, item_offset
+            pos = end
+            state = 'separator'
+        elif state == 'separator':
+            if ch == ',':
+                pos += 1
+                state = 'item'
+            elif ch == ']':
+                pos += 1
+                state = 'end'
+            else:
+                raise StreamError(*here(), "esperado ',' ou ']'")
+        else:
+            raise StreamError(*here(), 'conteúdo depois do fim da lista')
+
+
+def iter_jsonl_items(f):
+    """Mesmo contrato de iter_items para arquivos JSONL (segmentos do store)"""
+    offset = 0
+    for line_number, raw in enumerate(f, 1):
+        if raw.strip():
+            try:
+                item = json.loads(raw)
+            except json.JSONDecodeError as e:
+                raise StreamError(line_number, offset, f'JSON inválido: {e.msg}')
+            yield item, line_number, offset
+        offset += len(raw)
+
+
+def compile_schema(interest_names):
+    """
+    Pré-compila as regras de uma questão válida. Retorna uma função
+    item -> lista de mensagens de erro (vazia se o item é válido).
+    """
+    known_interests = frozenset(interest_names)
+    labels = LABELS
+    label_set = frozenset(LABELS)
+
+    def check(item):
+        if type(item) is not dict:
+            return ['o item não é um objeto']
+        errors = []
+
+        question = item.get('question')
+        if type(question) is not str or not question.strip():
+            errors.append("'question' ausente ou vazio")
+
+        options = item.get('options')
+        if type(options) is not list or len(options) != 4:
+            errors.append("'options' deve ter exatamente 4 opções")
+        else:
+            for i, option in enumerate(options):
+                if type(option) is not dict:
+                    errors.append(f'opção {i} não é um objeto')
+                    continue
+                if option.get('label') != labels[i]:
+                    errors.append(f"opção {i} deveria ter label {labels[i]!r}, tem {option.get('label')!r}")
+                text = option.get('text')
+                if type(text) is not str or not text.strip():
+                    errors.append(f'opção {labels[i]} sem texto')
+
+        if item.get('correct') not in label_set:
+            errors.append(f"'correct' inválido: {item.get('correct')!r}")
+
+        tip = item.get('tip')
+        if type(tip) is not str or not tip.strip():
+            errors.append("'tip' ausente ou vazio")
+
+        interests = item.get('interests')
+        if type(interests) is not list or not interests:
+            errors.append("'interests' ausente ou vazio")
+        else:
+            unknown = [i for i in interests if i not in known_interests]
+            if unknown:
+                errors.append(f'interesses fora de interests.ts: {unknown}')
+        return errors
+
+    return check
+
+
+@instrument.span('validate')
+def validate_file(path, check, max_errors=None):
+    """
+    Valida o arquivo em streaming. Retorna (total de itens, lista de ValidationError).
+    StreamError é levantado se o JSON estiver malformado.
+    """
+    errors = []
+    total = 0
+    with open(path, 'rb') as f:
+        items = iter_jsonl_items(f) if path.endswith('.jsonl') else iter_items(f)
+        for index, (item, line, offset) in enumerate(items):
+            total += 1
+            for message in check(item):
+                errors.append(ValidationError(index, line, offset, message))
+            if max_errors is not None and len(errors) >= max_errors:
+                break
+    instrument.count('validate.items', total)
+    instrument.count('validate.errors', len(errors))
+    return total, errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Valida o banco de questões em streaming')
+    parser.add_argument('paths', nargs='*', default=[QUESTIONS_PATH])
+    parser.add_argument('--interests', default=INTERESTS_PATH)
+    parser.add_argument('--max-errors', type=int, default=None,
+                        help='para depois de N erros')
+    args = parser.parse_args(argv)
+
+    check = compile_schema(load_interest_names(args.interests))
+    failed = False
+    for path in args.paths:
+        try:
+            total, errors = validate_file(path, check, args.max_errors)
+        except StreamError as e:
+            print(f"❌ {path}: {e}")
+            failed = True
+            continue
+        for error in errors:
+            print(f"{path}: {error}")
+        if errors:
+            print(f"❌ {path}: {len(errors)} problemas em {total} questões")
+            failed = True
+        else:
+            print(f"✅ {path}: {total} questões válidas")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
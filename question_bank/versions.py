@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Versões do banco endereçadas por conteúdo e deltas para clientes e espelhos.
+
+Uma versão é o questions.json em forma canônica: uma questão por linha
+(json.dumps sem espaços, chaves na ordem do arquivo), na ordem do banco. O hash
+da versão é o SHA-256 desses bytes, e o snapshot gravado é exatamente esse
+conteúdo comprimido com gzip — o nome do arquivo sai do hash, então pode ser
+servido com cache permanente, como os shards de question_bank.bundles.
+
+A cada build (o modo watch também faz isso) são mantidas as últimas --keep
+versões e gerado um delta de cada uma delas para a mais recente:
+
+    removed   IDs (question_bank.ids) que saíram
+    changed   IDs que continuam mas com outro conteúdo (dica, interesses,
+              ordem das opções), com a questão nova
+    added     IDs novos com a questão, acrescentados no fim
+    order     só quando a ordem resultante não é a do banco (reordenação)
+
+Questões repetidas no banco recebem o sufixo ~1, ~2... pela ordem de
+aparição. Quem já tem uma versão baixa só o delta até a mais recente
+(acrescentar uma questão vira um delta de ~1 KB) e confere o hash do
+resultado; `apply` faz isso para uma cadeia de deltas.
+
+Uso:
+    python3 -m question_bank.versions build [--keep 20]
+    python3 -m question_bank.versions status
+    python3 -m question_bank.versions apply BASE DELTA [DELTA ...] [--out questions.json]
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import sys
+import time
+
+from question_bank import instrument
+from question_bank.ids import question_id
+from question_bank.store import QUESTIONS_PATH, format_item, write_atomic
+from question_bank.validate import iter_items
+
+VERSIONS_DIR = 'Scam/public/question-versions'
+MANIFEST_NAME = 'versions.json'
+KEEP = 20
+SHORT_HASH = 16
+
+
+class DeltaError(Exception):
+    """Delta que não se aplica à versão recebida ou cujo resultado não confere com o hash"""
+
+
+def canonical(item):
+    return json.dumps(item, ensure_ascii=False, separators=(',', ':'))
+
+
+def _keys(ids):
+    """ID de cada questão, com sufixo ~k na k-ésima repetição do mesmo ID"""
+    seen = {}
+    keys = []
+    for qid in ids:
+        k = seen.get(qid, 0)
+        seen[qid] = k + 1
+        keys.append(f'{qid}~{k}' if k else qid)
+    return keys
+
+
+class Version:
+    """Questões de uma versão em forma canônica: chaves e linhas, na ordem do banco"""
+
+    def __init__(self, keys, lines):
+        self.keys = keys
+        self.lines = lines
+        self._hash = None
+
+    @classmethod
+    def from_lines(cls, lines, known=None):
+        """`known` (linha → ID) evita recalcular o ID das linhas já vistas em outra versão"""
+        known = known or {}
+        ids = []
+        for line in lines:
+            qid = known.get(line)
+            ids.append(qid if qid is not None else question_id(json.loads(line)))
+        return cls(_keys(ids), lines)
+
+    @classmethod
+    def load(cls, path, known=None):
+        """Lê um snapshot .jsonl.gz ou um questions.json (lista JSON, em streaming; `known` não se aplica)"""
+        if path.endswith('.gz'):
+            with gzip.open(path, 'rt', encoding='utf-8', newline='') as f:
+                # split('\n') e não splitlines: o JSON pode ter U+2028 sem escape
+                lines = f.read().split('\n')
+            return cls.from_lines(lines[:-1] if lines and not lines[-1] else lines, known)
+        ids = []
+        lines = []
+        with open(path, 'rb') as f:
+            for item, _, _ in iter_items(f):
+                ids.append(question_id(item))
+                lines.append(canonical(item))
+        return cls(_keys(ids), lines)
+
+    def __len__(self):
+        return len(self.lines)
+
+    def data(self):
+        return ''.join(line + '\n' for line in self.lines).encode('utf-8')
+
+    @property
+    def hash(self):
+        if self._hash is None:
+            self._hash = hashlib.sha256(self.data()).hexdigest()
+        return self._hash
+
+    def ids(self):
+        """linha → ID sem sufixo, para reaproveitar em `from_lines`"""
+        return {line: key.split('~', 1)[0] for key, line in zip(self.keys, self.lines)}
+
+    def questions_json(self):
+        """Bytes no mesmo formato do questions.json (json.dump com indent=2)"""
+        body = ',\n'.join(format_item(json.loads(line)) for line in self.lines)
+        return (f'[\n{body}\n]' if body else '[]').encode('utf-8')
+
+
+def diff(base, target):
+    """Delta que transforma `base` em `target`"""
+    base_lines = dict(zip(base.keys, base.lines))
+    target_keys = set(target.keys)
+    removed = [key for key in base.keys if key not in target_keys]
+    changed = []
+    added = []
+    for key, line in zip(target.keys, target.lines):
+        old = base_lines.get(key)
+        if old is None:
+            added.append({'id': key, 'item': json.loads(line)})
+        elif old != line:
+            changed.append({'id': key, 'item': json.loads(line)})
+    delta = {
+        'version': 1,
+        'from': base.hash,
+        'to': target.hash,
+        'count': len(target),
+        'removed': removed,
+        'changed': changed,
+        'added': added,
+    }
+    # Sem reordenação, a ordem sai do próprio delta: a da base, sem as removidas, e as novas no fim
+    expected = [key for key in base.keys if key in target_keys] + [entry['id'] for entry in added]
+    if expected != target.keys:
+        delta['order'] = target.keys
+    return delta
+
+
+def apply_delta(version, delta):
+    """Aplica `delta` a `version` e confere o hash do resultado; retorna a nova Version"""
+    if delta.get('from') != version.hash:
+        raise DeltaError(f"delta parte de {str(delta.get('from'))[:SHORT_HASH]}, "
+                         f"mas a versão é {version.hash[:SHORT_HASH]}")
+    lines = dict(zip(version.keys, version.lines))
+    for key in delta['removed']:
+        if lines.pop(key, None) is None:
+            raise DeltaError(f'questão removida {key} não existe na base')
+    for entry in delta['changed']:
+        if entry['id'] not in lines:
+            raise DeltaError(f"questão alterada {entry['id']} não existe na base")
+        lines[entry['id']] = canonical(entry['item'])
+    for entry in delta['added']:
+        if entry['id'] in lines:
+            raise DeltaError(f"questão acrescentada {entry['id']} já existe na base")
+        lines[entry['id']] = canonical(entry['item'])
+    # Dicionários mantêm a ordem de inserção: alteradas no lugar, acrescentadas no fim
+    keys = delta.get('order') or list(lines)
+    if len(keys) != len(lines) or any(key not in lines for key in keys):
+        raise DeltaError('ordem do delta não corresponde às questões')
+    result = Version(list(keys), [lines[key] for key in keys])
+    if result.hash != delta['to']:
+        raise DeltaError(f"hash do resultado {result.hash[:SHORT_HASH]} não confere com "
+                         f"{delta['to'][:SHORT_HASH]}")
+    return result
+
+
+def snapshot_name(digest):
+    return f'bank-{digest[:SHORT_HASH]}.jsonl.gz'
+
+
+def delta_name(source, target):
+    return f'delta-{source[:SHORT_HASH]}-{target[:SHORT_HASH]}.json'
+
+
+def read_manifest(out_dir=VERSIONS_DIR):
+    try:
+        with open(os.path.join(out_dir, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {'version': 1, 'latest': None, 'history': [], 'deltas': {}}
+
+
+@instrument.span('versions')
+def build_versions(questions_path=QUESTIONS_PATH, out_dir=VERSIONS_DIR, keep=KEEP):
+    """
+    Registra a versão atual do banco, grava o snapshot e os deltas das versões
+    anteriores mantidas para ela. Retorna (manifesto, mudou).
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = read_manifest(out_dir)
+    current = Version.load(questions_path)
+    if manifest['latest'] == current.hash:
+        return manifest, False
+
+    snapshot = snapshot_name(current.hash)
+    snapshot_path = os.path.join(out_dir, snapshot)
+    if not os.path.exists(snapshot_path):
+        write_atomic(snapshot_path, gzip.compress(current.data(), compresslevel=9, mtime=0))
+    # Voltar a uma versão antiga a traz para o topo, com a data original
+    previous = {entry['hash']: entry for entry in manifest['history']}
+    entry = previous.get(current.hash) or {
+        'hash': current.hash,
+        'count': len(current),
+        'created': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'snapshot': snapshot,
+    }
+    entry['bytes'] = os.path.getsize(snapshot_path)
+    history = [entry] + [old for old in manifest['history']
+                         if old['hash'] != current.hash
+                         and os.path.exists(os.path.join(out_dir, old['snapshot']))][:max(keep - 1, 0)]
+
+    deltas = {}
+    known = current.ids()
+    with instrument.span('versions.deltas'):
+        for old in history[1:]:
+            base = Version.load(os.path.join(out_dir, old['snapshot']), known)
+            delta = diff(base, current)
+            data = json.dumps(delta, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+            name = delta_name(old['hash'], current.hash)
+            write_atomic(os.path.join(out_dir, name), data)
+            deltas[old['hash']] = {
+                'file': name,
+                'bytes': len(data),
+                'sha256': hashlib.sha256(data).hexdigest(),
+                'removed': len(delta['removed']),
+                'changed': len(delta['changed']),
+                'added': len(delta['added']),
+            }
+    instrument.count('versions.deltas', len(deltas))
+
+    manifest = {
+        'version': 1,
+        'latest': current.hash,
+        'count': len(current),
+        'snapshot': snapshot,
+        'history': history,
+        'deltas': deltas,
+    }
+    write_atomic(os.path.join(out_dir, MANIFEST_NAME),
+                 json.dumps(manifest, ensure_ascii=False, indent=2).encode('utf-8'))
+
+    # Remove snapshots e deltas que saíram do histórico
+    referenced = {old['snapshot'] for old in history} | {d['file'] for d in deltas.values()}
+    for file_name in os.listdir(out_dir):
+        if file_name.startswith(('bank-', 'delta-')) and file_name not in referenced:
+            os.remove(os.path.join(out_dir, file_name))
+    return manifest, True
+
+
+def load_delta(path):
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Versões do banco por hash de conteúdo e deltas entre elas')
+    sub = parser.add_subparsers(dest='command', required=True)
+    build = sub.add_parser('build', help='registra a versão atual e gera os deltas')
+    build.add_argument('--questions', default=QUESTIONS_PATH)
+    build.add_argument('--out', default=VERSIONS_DIR)
+    build.add_argument('--keep', type=int, default=KEEP, help='versões mantidas no histórico')
+    status = sub.add_parser('status', help='mostra o histórico e o tamanho dos deltas')
+    status.add_argument('--out', default=VERSIONS_DIR)
+    apply = sub.add_parser('apply', help='aplica uma cadeia de deltas e confere o hash')
+    apply.add_argument('base', help='snapshot .jsonl.gz ou questions.json da versão de partida')
+    apply.add_argument('deltas', nargs='+', help='deltas na ordem de aplicação')
+    apply.add_argument('--out', help='grava o resultado (.jsonl.gz como snapshot; senão como questions.json)')
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        start = time.perf_counter()
+        manifest, changed = build_versions(args.questions, args.out, args.keep)
+        elapsed = time.perf_counter() - start
+        if not changed:
+            print(f"✅ Banco inalterado (versão {manifest['latest'][:SHORT_HASH]}, {manifest['count']} questões)")
+            return 0
+        total = sum(d['bytes'] for d in manifest['deltas'].values())
+        print(f"✅ Versão {manifest['latest'][:SHORT_HASH]} ({manifest['count']} questões) em {elapsed:.2f}s; "
+              f"{len(manifest['deltas'])} deltas ({total / 1024:.1f} KB) em {args.out}")
+        return 0
+
+    if args.command == 'status':
+        manifest = read_manifest(args.out)
+        if not manifest['latest']:
+            print(f"⚠️  Nenhuma versão em {args.out}; execute `build`")
+            return 1
+        for entry in manifest['history']:
+            delta = manifest['deltas'].get(entry['hash'])
+            detail = ('atual' if delta is None else
+                      f"delta {delta['bytes'] / 1024:.1f} KB (+{delta['added']} ~{delta['changed']} "
+                      f"-{delta['removed']}) vs. snapshot {entry['bytes'] / 1024:.1f} KB")
+            print(f"- {entry['hash'][:SHORT_HASH]}  {entry['created']}  {entry['count']:>7} questões  {detail}")
+        return 0
+
+    version = Version.load(args.base)
+    print(f"📄 Base {version.hash[:SHORT_HASH]} ({len(version)} questões)")
+    for path in args.deltas:
+        try:
+            version = apply_delta(version, load_delta(path))
+        except DeltaError as error:
+            print(f"❌ {path}: {error}")
+            return 1
+        print(f"✅ {path} → {version.hash[:SHORT_HASH]} ({len(version)} questões, hash conferido)")
+    if args.out:
+        if args.out.endswith('.gz'):
+            data = gzip.compress(version.data(), compresslevel=9, mtime=0)
+        else:
+            data = version.questions_json()
+        write_atomic(args.out, data)
+        print(f"📝 Resultado em {args.out}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Modo watch: refaz os artefatos do banco de questões quando os arquivos mudam.
+
+Observa os scripts geradores na raiz do repositório e o questions.json. Uma
+rajada de salvamentos vira um único ciclo (debounce). Em cada ciclo:
+
+    1. só os scripts alterados são executados de novo (cada um em um processo
+       próprio, então um script com erro não derruba o watch);
+    2. se sobraram questões nos segmentos, o questions.json é compactado,
+       descartando as quase duplicatas (como `store compact`);
+    3. se o questions.json mudou, índice de interesses, índice de IDs,
+       bundles e .qbank são refeitos, o índice de busca recebe só as
+       questões acrescentadas e uma nova versão do banco (com os deltas das
+       anteriores) é registrada.
+
+Todos os arquivos são gravados em um temporário e trocados com os.replace, então
+o servidor do Vite nunca lê um arquivo pela metade. Cada ciclo mostra o tempo de
+cada etapa.
+
+Usa inotify (via ctypes) no Linux; em outros sistemas, ou com --poll, compara o
+mtime dos arquivos a cada --interval segundos.
+
+Uso:
+    python3 -m question_bank.watch [--debounce 0.3] [--poll] [--interval 1]
+"""
+import argparse
+import ctypes
+import ctypes.util
+import json
+import os
+import select
+import struct
+import subprocess
+import sys
+import time
+
+from question_bank import instrument
+from question_bank.bank import QuestionBank
+from question_bank.binary import BINARY_PATH, write_binary
+from question_bank.bundles import BUNDLES_DIR, build_bundles
+from question_bank.dedupe import DEFAULT_THRESHOLD, dedupe_transform
+from question_bank.ids import ID_INDEX_PATH, build_id_index
+from question_bank.inverted_index import INDEX_PATH, build_index
+from question_bank.search import SEARCH_DIR, update_index
+from question_bank.store import QUESTIONS_PATH, QuestionStore, write_atomic
+from question_bank.versions import VERSIONS_DIR, build_versions
+
+GENERATORS = ('add_questions.py', 'generate_questions.py',
+              'generate_all_questions.py', 'generate_all_new_questions.py')
+DEBOUNCE = 0.3
+POLL_INTERVAL = 1.0
+
+IN_MODIFY = 0x002
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+_EVENT = struct.Struct('iIII')  # wd, mask, cookie, tamanho do nome
+
+
+class Inotify:
+    """Observa diretórios com inotify; `changes` devolve os caminhos alterados"""
+
+    MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+
+    def __init__(self, paths):
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 falhou')
+        # Editores costumam salvar com rename, então observamos o diretório, não o arquivo
+        self.paths = {os.path.normpath(p) for p in paths}
+        self.dirs = {}
+        for directory in {os.path.dirname(p) or '.' for p in self.paths}:
+            wd = libc.inotify_add_watch(self.fd, os.fsencode(directory), self.MASK)
+            if wd < 0:
+                raise OSError(ctypes.get_errno(), f'inotify_add_watch falhou em {directory}')
+            self.dirs[wd] = directory
+
+    def changes(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        changed = set()
+        # Eventos de outros arquivos dos diretórios (temporários, caches) são ignorados
+        while not changed:
+            wait = None if deadline is None else max(deadline - time.monotonic(), 0)
+            ready, _, _ = select.select([self.fd], [], [], wait)
+            if not ready:
+                break
+            while True:
+                try:
+                    data = os.read(self.fd, 64 * 1024)
+                except BlockingIOError:
+                    break
+                pos = 0
+                while pos < len(data):
+                    wd, _, _, length = _EVENT.unpack_from(data, pos)
+                    pos += _EVENT.size
+                    name = data[pos:pos + length].rstrip(b'\0').decode('utf-8', errors='replace')
+                    pos += length
+                    path = os.path.normpath(os.path.join(self.dirs[wd], name))
+                    if path in self.paths:
+                        changed.add(path)
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+class Poller:
+    """Alternativa portátil ao inotify: compara (mtime, tamanho) periodicamente"""
+
+    def __init__(self, paths, interval=POLL_INTERVAL):
+        self.paths = [os.path.normpath(p) for p in paths]
+        self.interval = interval
+        self.seen = {p: self._signature(p) for p in self.paths}
+
+    @staticmethod
+    def _signature(path):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def changes(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            changed = set()
+            for path in self.paths:
+                signature = self._signature(path)
+                if signature != self.seen[path]:
+                    self.seen[path] = signature
+                    changed.add(path)
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            wait = self.interval if deadline is None else min(self.interval, max(deadline - time.monotonic(), 0))
+            time.sleep(wait)
+
+    def close(self):
+        pass
+
+
+def wait_for_burst(watcher, debounce=DEBOUNCE):
+    """Bloqueia até a primeira mudança e junta as seguintes até `debounce` segundos sem eventos"""
+    changed = watcher.changes()
+    while True:
+        more = watcher.changes(debounce)
+        if not more:
+            return changed
+        changed |= more
+
+
+def _signature(path):
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+class Builder:
+    """Executa os ciclos de rebuild e guarda o tempo de cada etapa"""
+
+    def __init__(self, questions_path=QUESTIONS_PATH, index_path=INDEX_PATH, id_index_path=ID_INDEX_PATH,
+                 bundles_dir=BUNDLES_DIR, binary_path=BINARY_PATH, search_dir=SEARCH_DIR,
+                 versions_dir=VERSIONS_DIR, threshold=DEFAULT_THRESHOLD):
+        self.questions_path = questions_path
+        self.index_path = index_path
+        self.id_index_path = id_index_path
+        self.bundles_dir = bundles_dir
+        self.binary_path = binary_path
+        self.search_dir = search_dir
+        self.versions_dir = versions_dir
+        self.threshold = threshold
+        self.store = QuestionStore(questions_path)
+        self.built = None
+        self.timings = []
+
+    def _stage(self, name, func, *args):
+        start = time.perf_counter()
+        try:
+            with instrument.span(f'watch.{name}'):
+                return func(*args)
+        finally:
+            self.timings.append((name, time.perf_counter() - start))
+
+    def _run_generator(self, script):
+        result = subprocess.run([sys.executable, script], capture_output=True, text=True)
+        if result.returncode != 0:
+            tail = (result.stderr or result.stdout).strip().splitlines()[-1:] or ['']
+            print(f"⚠️  {script} terminou com erro ({result.returncode}): {tail[0]}")
+        return result.returncode == 0
+
+    def _load(self):
+        with open(self.questions_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _compact(self):
+        # Rodar add_questions.py de novo anexa as mesmas questões; só as novas entram no banco
+        existing = self._load() if os.path.exists(self.questions_path) else []
+        return self.store.compact(transform=dedupe_transform(existing, self.threshold))
+
+    def _write_index(self, questions):
+        index = build_index(questions)
+        write_atomic(self.index_path, json.dumps(index, ensure_ascii=False, indent=2).encode('utf-8'))
+
+    def build_artifacts(self):
+        questions = self._stage('leitura', self._load)
+        self._stage('índice', self._write_index, questions)
+        self._stage('ids', build_id_index, self.questions_path, self.id_index_path)
+        self._stage('bundles', build_bundles, questions, self.bundles_dir)
+        bank = QuestionBank.from_questions(questions)
+        self._stage('qbank', write_binary, bank, self.binary_path)
+        self._stage('busca', update_index, self.questions_path, self.search_dir)
+        self._stage('versões', build_versions, self.questions_path, self.versions_dir)
+        return len(questions)
+
+    def cycle(self, changed):
+        """Refaz só o que depende dos arquivos alterados; retorna o número de questões no banco ou None"""
+        self.timings = []
+        for script in GENERATORS:
+            if script in changed:
+                self._stage(script, self._run_generator, script)
+        if self.store.pending_count():
+            self._stage('compact', self._compact)
+        # As gravações do próprio watch também geram eventos; só refaz se o conteúdo mudou
+        if _signature(self.questions_path) == self.built:
+            return None
+        total = self.build_artifacts()
+        self.built = _signature(self.questions_path)
+        return total
+
+    def report(self, total):
+        spent = sum(seconds for _, seconds in self.timings)
+        stages = ', '.join(f'{name} {seconds * 1000:.0f} ms' for name, seconds in self.timings)
+        suffix = f' — {total} questões' if total is not None else ''
+        print(f"✅ Ciclo em {spent * 1000:.0f} ms ({stages or 'nada a refazer'}){suffix}", flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Refaz os artefatos do banco quando os arquivos mudam')
+    parser.add_argument('--debounce', type=float, default=DEBOUNCE,
+                        help='segundos sem eventos para encerrar uma rajada')
+    parser.add_argument('--poll', action='store_true', help='usa polling em vez de inotify')
+    parser.add_argument('--interval', type=float, default=POLL_INTERVAL, help='intervalo do polling')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='similaridade mínima para descartar uma questão nova como duplicata')
+    args = parser.parse_args(argv)
+
+    paths = list(GENERATORS) + [QUESTIONS_PATH]
+    watcher = None
+    if not args.poll and sys.platform.startswith('linux'):
+        try:
+            watcher = Inotify(paths)
+        except (OSError, AttributeError) as error:
+            print(f"⚠️  inotify indisponível ({error}); usando polling")
+    if watcher is None:
+        watcher = Poller(paths, args.interval)
+
+    builder = Builder(threshold=args.threshold)
+    builder.report(builder.cycle(set()))
+    print(f"👀 Observando {', '.join(paths)} (Ctrl+C para sair)", flush=True)
+    try:
+        while True:
+            changed = wait_for_burst(watcher, args.debounce)
+            print(f"🔄 Alterados: {', '.join(sorted(changed))}", flush=True)
+            builder.report(builder.cycle(changed))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+"""
+Carga do question_bank.db_loader em um SQLite descartável (mesmas tabelas e
+mesmo SQL de upsert do PostgreSQL; só o staging muda de COPY para executemany).
+
+Uso (a partir da raiz do repositório):
+    python3 -m unittest discover tests
+"""
+import csv
+import io
+import json
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from question_bank.db_loader import CsvStream, SqliteDialect, load
+from question_bank.ids import question_id
+
+
+def make_question(text, tip='Desconfie.', interests=('Tecnologia',)):
+    return {
+        'question': text,
+        'options': [{'label': label, 'text': f'{text} opção {label}'} for label in 'ABCD'],
+        'correct': 'B',
+        'tip': tip,
+        'interests': list(interests),
+    }
+
+
+class SqliteLoadTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.questions_path = os.path.join(self.tmp.name, 'questions.json')
+        self.connection = sqlite3.connect(os.path.join(self.tmp.name, 'questions.db'))
+        self.questions = [
+            make_question('Qual é o golpe do Pix agendado?', interests=('Finanças', 'Tecnologia')),
+            make_question('O que é phishing por SMS?', tip=''),
+            make_question('Como reconhecer um falso suporte técnico?', interests=()),
+        ]
+        # A mesma questão repetida no banco conta uma vez só
+        self.questions.append(dict(self.questions[0]))
+
+    def tearDown(self):
+        self.connection.close()
+        self.tmp.cleanup()
+
+    def write(self, questions):
+        with open(self.questions_path, 'w', encoding='utf-8') as f:
+            json.dump(questions, f, ensure_ascii=False, indent=2)
+
+    def load(self, prune=False):
+        return load(self.connection, SqliteDialect, self.questions_path, prune)
+
+    def rows(self, sql):
+        return self.connection.execute(sql).fetchall()
+
+    def test_reload_is_idempotent(self):
+        self.write(self.questions)
+        first = self.load()
+        self.assertEqual(first['staged'], 4)
+        self.assertEqual(first['changed'], 3)
+        self.assertEqual(first['total'], 3)
+        tables = [self.rows(f'SELECT * FROM {table} ORDER BY 1, 2')
+                  for table in ('questions', 'question_options', 'question_interests')]
+
+        second = self.load()
+        self.assertEqual(second['changed'], 0)
+        self.assertEqual(second['total'], 3)
+        self.assertEqual(tables, [self.rows(f'SELECT * FROM {table} ORDER BY 1, 2')
+                                  for table in ('questions', 'question_options', 'question_interests')])
+
+    def test_reload_does_not_rewrite_links(self):
+        self.write(self.questions)
+        self.assertEqual(self.load()['links'], 3)
+        before = self.rows('SELECT rowid, * FROM question_options ORDER BY 1')
+        stats = self.load()
+        self.assertEqual(stats['links'], 0)
+        # Mesmo rowid: as linhas não foram apagadas e inseridas de novo
+        self.assertEqual(self.rows('SELECT rowid, * FROM question_options ORDER BY 1'), before)
+
+    def test_changed_interests_rewrite_only_that_question(self):
+        self.write(self.questions)
+        self.load()
+        self.questions[2]['interests'] = ['Compras', 'Tecnologia']
+        self.write(self.questions)
+        stats = self.load()
+        self.assertEqual(stats['links'], 1)
+        self.assertEqual(stats['changed'], 1)
+        qid = question_id(self.questions[2])
+        self.assertEqual(self.rows(f"SELECT interest FROM question_interests "
+                                   f"WHERE question_hash = '{qid}' ORDER BY position"),
+                         [('Compras',), ('Tecnologia',)])
+
+    def test_table_without_links_hash_is_migrated(self):
+        self.connection.execute("""CREATE TABLE questions (
+            content_hash VARCHAR(16) PRIMARY KEY, position INTEGER NOT NULL, question TEXT NOT NULL,
+            correct VARCHAR(1) NOT NULL, tip TEXT NOT NULL)""")
+        self.write(self.questions)
+        self.assertEqual(self.load()['links'], 3)
+        self.assertEqual(self.load()['links'], 0)
+
+    def test_empty_tip_is_stored_as_empty_string(self):
+        self.write(self.questions)
+        self.load()
+        qid = question_id(self.questions[1])
+        self.assertEqual(self.rows(f"SELECT tip FROM questions WHERE content_hash = '{qid}'"), [('',)])
+
+    def test_changed_tip_updates_the_row(self):
+        self.write(self.questions)
+        self.load()
+        self.questions[1]['tip'] = 'Bancos não pedem senha por SMS.'
+        self.write(self.questions)
+        stats = self.load()
+        self.assertEqual(stats['changed'], 1)
+        qid = question_id(self.questions[1])
+        self.assertEqual(self.rows(f"SELECT tip FROM questions WHERE content_hash = '{qid}'"),
+                         [('Bancos não pedem senha por SMS.',)])
+
+    def test_option_and_interest_rows(self):
+        self.write(self.questions)
+        self.load()
+        qid = question_id(self.questions[0])
+        options = self.rows(f"SELECT position, label, text FROM question_options "
+                            f"WHERE question_hash = '{qid}' ORDER BY position")
+        self.assertEqual(options, [(k, o['label'], o['text']) for k, o in enumerate(self.questions[0]['options'])])
+        interests = self.rows(f"SELECT position, interest FROM question_interests "
+                              f"WHERE question_hash = '{qid}' ORDER BY position")
+        self.assertEqual(interests, [(0, 'Finanças'), (1, 'Tecnologia')])
+        self.assertEqual(self.rows('SELECT COUNT(*) FROM question_options'), [(12,)])
+        self.assertEqual(self.rows('SELECT COUNT(*) FROM question_interests'), [(3,)])
+
+    def test_prune_removes_questions_and_links(self):
+        self.write(self.questions)
+        self.load()
+        removed = question_id(self.questions[0])
+        self.write(self.questions[1:3])
+
+        stats = self.load()
+        self.assertEqual(stats['total'], 3)
+        self.assertEqual(self.rows(f"SELECT COUNT(*) FROM questions WHERE content_hash = '{removed}'"), [(1,)])
+
+        stats = self.load(prune=True)
+        self.assertEqual(stats['pruned'], 1)
+        self.assertEqual(stats['total'], 2)
+        for table, column in (('questions', 'content_hash'), ('question_options', 'question_hash'),
+                              ('question_interests', 'question_hash')):
+            self.assertEqual(self.rows(f"SELECT COUNT(*) FROM {table} WHERE {column} = '{removed}'"), [(0,)])
+        self.assertEqual(self.rows('SELECT COUNT(*) FROM question_options'), [(8,)])
+
+
+class CsvStreamTest(unittest.TestCase):
+
+    def test_empty_fields_are_quoted(self):
+        # No COPY em CSV do PostgreSQL só um campo vazio sem aspas vira NULL
+        data = CsvStream([('abc', 1, '', 'B', '', '[]', '[]')]).read()
+        self.assertEqual(data, '"abc","1","","B","","[]","[]"\n')
+        self.assertEqual(next(csv.reader(io.StringIO(data))), ['abc', '1', '', 'B', '', '[]', '[]'])
+
+
+if __name__ == '__main__':
+    unittest.main()
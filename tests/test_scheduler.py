@@ -0,0 +1,37 @@
+"""
+Agendador SM-2 do question_bank.scheduler.
+
+Uso (a partir da raiz do repositório):
+    python3 -m unittest discover tests
+"""
+import unittest
+
+from question_bank.scheduler import DAY, MAX_INTERVAL, Scheduler
+
+
+class SchedulerTest(unittest.TestCase):
+
+    def test_long_correct_streak_is_capped(self):
+        scheduler = Scheduler(3)
+        now = 1_700_000_000
+        answers = [(7, 1, True, now + k * DAY) for k in range(60)]
+        self.assertEqual(scheduler.replay(answers), 60)
+        sid = scheduler.states[7][1]
+        self.assertEqual(scheduler.interval[sid], MAX_INTERVAL)
+        self.assertEqual(scheduler.due[sid], now + 59 * DAY + MAX_INTERVAL * DAY)
+        # Revisões ao vivo depois da sequência também não estouram
+        scheduler.review(7, 1, True, now + 60 * DAY)
+        self.assertEqual(scheduler.interval[sid], MAX_INTERVAL)
+        self.assertEqual(scheduler.next_questions(7, 3, now + 61 * DAY), [q for q in scheduler.new_order if q != 1])
+
+    def test_wrong_answer_resets_interval(self):
+        scheduler = Scheduler(1)
+        now = 1_700_000_000
+        scheduler.replay([(1, 0, True, now), (1, 0, True, now + DAY), (1, 0, False, now + 7 * DAY)])
+        sid = scheduler.states[1][0]
+        self.assertEqual(scheduler.interval[sid], 1)
+        self.assertEqual(scheduler.due_questions(1, 5, now + 8 * DAY), [0])
+
+
+if __name__ == '__main__':
+    unittest.main()